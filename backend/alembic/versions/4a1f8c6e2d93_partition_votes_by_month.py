@@ -0,0 +1,144 @@
+"""partition votes by month
+
+Revision ID: 4a1f8c6e2d93
+Revises: 9e4a7c1d3f58
+Create Date: 2026-10-19 17:20:44.118502
+
+Rebuilds votes as a table range-partitioned on voted_at, one partition per
+month (votes_pYYYY_MM, bounds in UTC) plus a default partition, and copies
+existing rows over. Takes an exclusive lock on votes for the duration of
+the copy: run during a maintenance window on large installations.
+
+PostgreSQL requires unique constraints of a partitioned table to include
+the partition key, so the primary key becomes (id, voted_at) and the
+vote_id / battle_id unique indexes become (vote_id, voted_at) /
+(battle_id, voted_at). ids still come from votes_id_seq; one vote per battle
+is enforced when voting by a conditional update of battles.status
+(ongoing -> voted).
+
+The low-cardinality processing_status index and the
+(processing_status, voted_at, id) index are replaced by partial indexes that
+only contain unprocessed votes, so worker scans stay small however much
+history is kept. The worker creates future partitions and archives old ones
+(llmbattler_worker.partitions).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4a1f8c6e2d93'
+down_revision: Union[str, Sequence[str], None] = '9e4a7c1d3f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months of empty partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, vote_id, battle_id, session_id, vote, left_model_id, right_model_id, "
+    "processing_status, processed_at, error_message, voted_at, retry_count, next_attempt_at"
+)
+
+TABLE_BODY = """(
+    id INTEGER NOT NULL DEFAULT nextval('votes_id_seq'::regclass),
+    vote_id VARCHAR(50) NOT NULL,
+    battle_id VARCHAR(50) NOT NULL,
+    session_id VARCHAR(50) NOT NULL,
+    vote VARCHAR(20) NOT NULL,
+    left_model_id VARCHAR(255) NOT NULL,
+    right_model_id VARCHAR(255) NOT NULL,
+    processing_status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    processed_at TIMESTAMP WITH TIME ZONE,
+    error_message TEXT,
+    voted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT votes_vote_check
+        CHECK (vote IN ('left_better', 'right_better', 'tie', 'both_bad')),
+    CONSTRAINT votes_processing_status_check
+        CHECK (processing_status IN ('pending', 'processed', 'failed', 'dead_letter'))
+)"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE votes_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE votes RENAME TO votes_unpartitioned")
+    op.execute("ALTER TABLE votes_unpartitioned RENAME CONSTRAINT votes_vote_check TO votes_unpartitioned_vote_check")
+    op.execute("ALTER TABLE votes_unpartitioned RENAME CONSTRAINT votes_processing_status_check TO votes_unpartitioned_processing_status_check")
+
+    op.execute(f"CREATE TABLE votes {TABLE_BODY} PARTITION BY RANGE (voted_at)")
+    op.execute("ALTER TABLE votes ADD CONSTRAINT votes_pkey_partitioned PRIMARY KEY (id, voted_at)")
+
+    # Monthly partitions from the oldest vote to MONTHS_AHEAD months from now
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month DATE := date_trunc(
+                'month', COALESCE((SELECT min(voted_at) FROM votes_unpartitioned), now()) AT TIME ZONE 'UTC'
+            )::DATE;
+            last_month DATE := (
+                date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '{MONTHS_AHEAD} months'
+            )::DATE;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF votes FOR VALUES FROM (%L) TO (%L)',
+                    'votes_p' || to_char(month, 'YYYY_MM'),
+                    month::TIMESTAMP AT TIME ZONE 'UTC',
+                    (month + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC'
+                );
+                month := (month + INTERVAL '1 month')::DATE;
+            END LOOP;
+        END $$;
+    """)
+    # Catches rows outside every monthly range (inserts never fail)
+    op.execute("CREATE TABLE votes_default PARTITION OF votes DEFAULT")
+
+    op.execute(f"INSERT INTO votes ({COLUMNS}) SELECT {COLUMNS} FROM votes_unpartitioned")
+    op.execute("DROP TABLE votes_unpartitioned")
+    op.execute("ALTER TABLE votes RENAME CONSTRAINT votes_pkey_partitioned TO votes_pkey")
+    op.execute("ALTER SEQUENCE votes_id_seq OWNED BY votes.id")
+
+    # Indexes on the parent are created on every partition (after the copy: one build each)
+    op.create_index('ix_votes_vote_id', 'votes', ['vote_id', 'voted_at'], unique=True)
+    op.create_index('ix_votes_battle_id', 'votes', ['battle_id', 'voted_at'], unique=True)
+    op.create_index('ix_votes_session_id', 'votes', ['session_id'], unique=False)
+    op.create_index('ix_votes_voted_at', 'votes', ['voted_at'], unique=False)
+    op.create_index(
+        'ix_votes_pending_voted_at_id', 'votes', ['voted_at', 'id'], unique=False,
+        postgresql_where="processing_status = 'pending'",
+    )
+    op.create_index(
+        'ix_votes_failed_voted_at_id', 'votes', ['voted_at', 'id'], unique=False,
+        postgresql_where="processing_status IN ('failed', 'dead_letter')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER SEQUENCE votes_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE votes RENAME TO votes_partitioned")
+    op.execute("ALTER TABLE votes_partitioned RENAME CONSTRAINT votes_vote_check TO votes_partitioned_vote_check")
+    op.execute("ALTER TABLE votes_partitioned RENAME CONSTRAINT votes_processing_status_check TO votes_partitioned_processing_status_check")
+    op.execute("ALTER TABLE votes_partitioned RENAME CONSTRAINT votes_pkey TO votes_partitioned_pkey")
+    op.execute("ALTER INDEX ix_votes_vote_id RENAME TO ix_votes_partitioned_vote_id")
+    op.execute("ALTER INDEX ix_votes_battle_id RENAME TO ix_votes_partitioned_battle_id")
+    op.execute("ALTER INDEX ix_votes_session_id RENAME TO ix_votes_partitioned_session_id")
+    op.execute("ALTER INDEX ix_votes_voted_at RENAME TO ix_votes_partitioned_voted_at")
+
+    op.execute(f"CREATE TABLE votes {TABLE_BODY}")
+    op.execute("ALTER TABLE votes ADD PRIMARY KEY (id)")
+    # Detached (archived) partitions are not copied back
+    op.execute(f"INSERT INTO votes ({COLUMNS}) SELECT {COLUMNS} FROM votes_partitioned")
+    op.execute("DROP TABLE votes_partitioned")
+    op.execute("ALTER SEQUENCE votes_id_seq OWNED BY votes.id")
+
+    op.create_index('ix_votes_vote_id', 'votes', ['vote_id'], unique=True)
+    op.create_index('ix_votes_battle_id', 'votes', ['battle_id'], unique=True)
+    op.create_index('ix_votes_session_id', 'votes', ['session_id'], unique=False)
+    op.create_index('ix_votes_voted_at', 'votes', ['voted_at'], unique=False)
+    op.create_index('ix_votes_processing_status', 'votes', ['processing_status'], unique=False)
+    op.create_index('ix_votes_processing_status_voted_at_id', 'votes', ['processing_status', 'voted_at', 'id'], unique=False)
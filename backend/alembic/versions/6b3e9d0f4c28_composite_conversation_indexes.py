@@ -0,0 +1,70 @@
+"""replace single-column battles/turns/messages indexes with composite ones
+
+Revision ID: 6b3e9d0f4c28
+Revises: 4a1f8c6e2d93
+Create Date: 2026-10-19 18:42:07.331905
+
+Every column of messages and turns had its own index: each message insert
+maintained nine B-trees, yet session history still needed a sort. They are
+replaced by indexes matching the queries that actually run:
+
+- messages: WHERE session_id ORDER BY battle_seq_in_session, turn_seq,
+  seq_in_turn (session history, next session_seq)
+- turns: WHERE session_id ORDER BY battle_seq_in_session, seq (session
+  history); WHERE battle_id (follow-up turn numbering)
+- battles: WHERE session_id ORDER BY seq_in_session (session battles, next
+  battle number); WHERE status ORDER BY created_at (ongoing battles)
+
+The unique message_id / turn_id / battle_id indexes are kept. Index builds
+lock writes to the table: run during a quiet period on large installations.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6b3e9d0f4c28'
+down_revision: Union[str, Sequence[str], None] = '4a1f8c6e2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, single-column indexes replaced)
+REPLACED_INDEXES = [
+    ('messages', ['session_id', 'battle_id', 'turn_id', 'battle_seq_in_session', 'turn_seq',
+                  'seq_in_turn', 'session_seq', 'created_at']),
+    ('turns', ['session_id', 'battle_id', 'battle_seq_in_session', 'seq', 'created_at']),
+    ('battles', ['session_id', 'seq_in_session', 'status', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite indexes first, so queries never lose their index midway
+    op.create_index('ix_messages_session_order', 'messages',
+                    ['session_id', 'battle_seq_in_session', 'turn_seq', 'seq_in_turn'],
+                    unique=False)
+    op.create_index('ix_turns_session_order', 'turns',
+                    ['session_id', 'battle_seq_in_session', 'seq'], unique=False)
+    op.create_index('ix_turns_battle_id_seq', 'turns', ['battle_id', 'seq'], unique=False)
+    op.create_index('ix_battles_session_id_seq', 'battles', ['session_id', 'seq_in_session'],
+                    unique=False)
+    op.create_index('ix_battles_status_created_at', 'battles', ['status', 'created_at'],
+                    unique=False)
+
+    for table, columns in REPLACED_INDEXES:
+        for column in columns:
+            op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in REPLACED_INDEXES:
+        for column in columns:
+            op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+    op.drop_index('ix_battles_status_created_at', table_name='battles')
+    op.drop_index('ix_battles_session_id_seq', table_name='battles')
+    op.drop_index('ix_turns_battle_id_seq', table_name='turns')
+    op.drop_index('ix_turns_session_order', table_name='turns')
+    op.drop_index('ix_messages_session_order', table_name='messages')
@@ -0,0 +1,48 @@
+"""add content_blobs table and body hash columns
+
+Revision ID: 8f1d6c3a9b52
+Revises: 6b3e9d0f4c28
+Create Date: 2026-10-19 21:17:45.208316
+
+Prompt/response bodies can be stored once in content_blobs (keyed by
+SHA-256, zlib-compressed) instead of inline in turns/messages, which then
+keep only turns.user_input_hash / messages.content_hash (CONTENT_OFFLOAD,
+see llmbattler_shared.content). Existing rows stay inline.
+
+content_blobs.body is already compressed: PostgreSQL stores it out of line
+without compressing it again (STORAGE EXTERNAL).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8f1d6c3a9b52'
+down_revision: Union[str, Sequence[str], None] = '6b3e9d0f4c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('content_blobs',
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('compression', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE content_blobs ALTER COLUMN body SET STORAGE EXTERNAL')
+    op.add_column('turns', sa.Column('user_input_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.add_column('messages', sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('messages', 'content_hash')
+    op.drop_column('turns', 'user_input_hash')
+    op.drop_table('content_blobs')
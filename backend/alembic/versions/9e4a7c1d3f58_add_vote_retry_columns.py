@@ -0,0 +1,54 @@
+"""add vote retry columns
+
+Revision ID: 9e4a7c1d3f58
+Revises: 5c9d2e7a4b10
+Create Date: 2026-10-19 16:48:09.731245
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a7c1d3f58'
+down_revision: Union[str, Sequence[str], None] = '5c9d2e7a4b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('votes', sa.Column('retry_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('votes', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('worker_runs', sa.Column('votes_retried', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('worker_runs', sa.Column('votes_dead_lettered', sa.Integer(), nullable=False, server_default='0'))
+
+    # 'dead_letter' joins the statuses allowed by the initial schema's check constraint
+    op.drop_constraint('votes_processing_status_check', 'votes', type_='check')
+    op.create_check_constraint(
+        'votes_processing_status_check',
+        'votes',
+        "processing_status IN ('pending', 'processed', 'failed', 'dead_letter')",
+    )
+
+    # Votes failed before retries existed get one more attempt
+    op.execute(
+        "UPDATE votes SET retry_count = 1, next_attempt_at = now() "
+        "WHERE processing_status = 'failed'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE votes SET processing_status = 'failed' WHERE processing_status = 'dead_letter'")
+    op.drop_constraint('votes_processing_status_check', 'votes', type_='check')
+    op.create_check_constraint(
+        'votes_processing_status_check',
+        'votes',
+        "processing_status IN ('pending', 'processed', 'failed')",
+    )
+    op.drop_column('worker_runs', 'votes_dead_lettered')
+    op.drop_column('worker_runs', 'votes_retried')
+    op.drop_column('votes', 'next_attempt_at')
+    op.drop_column('votes', 'retry_count')
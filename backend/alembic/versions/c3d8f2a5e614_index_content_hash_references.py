@@ -0,0 +1,32 @@
+"""index turns.user_input_hash and messages.content_hash
+
+Revision ID: c3d8f2a5e614
+Revises: 8f1d6c3a9b52
+Create Date: 2026-10-19 23:41:09.537214
+
+The worker's orphan sweep deletes content_blobs rows no turn or message
+references any more; these partial indexes (offloaded rows only) keep its
+NOT EXISTS checks to index probes.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f2a5e614'
+down_revision: Union[str, Sequence[str], None] = '8f1d6c3a9b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_turns_user_input_hash', 'turns', ['user_input_hash'], unique=False, postgresql_where=sa.text('user_input_hash IS NOT NULL'), sqlite_where=sa.text('user_input_hash IS NOT NULL'))
+    op.create_index('ix_messages_content_hash', 'messages', ['content_hash'], unique=False, postgresql_where=sa.text('content_hash IS NOT NULL'), sqlite_where=sa.text('content_hash IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_content_hash', table_name='messages')
+    op.drop_index('ix_turns_user_input_hash', table_name='turns')
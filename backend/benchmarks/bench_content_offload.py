@@ -0,0 +1,237 @@
+"""
+Benchmark: inline vs offloaded message bodies (CONTENT_OFFLOAD)
+
+Writes the same arena-like conversations twice, once with bodies inline in
+turns/messages and once offloaded to content_blobs (deduplicated, zlib),
+then reports:
+
+- storage: turns + messages (+ content_blobs) size
+- metadata scan: a full pass over messages that needs no bodies
+  (messages and latest message per side), as analytics and maintenance
+  queries do
+- history: get_battles_by_session, which has to resolve every body
+
+Prompts are drawn from a small pool (arenas see the same prompts over and
+over); responses are long and mostly distinct.
+
+Usage (from backend/):
+    uv run python benchmarks/bench_content_offload.py
+    uv run python benchmarks/bench_content_offload.py --sessions 5000
+    BENCH_DATABASE_URL=postgresql+asyncpg://... \\
+        uv run python benchmarks/bench_content_offload.py
+
+Defaults to a temporary SQLite file. Point BENCH_DATABASE_URL at a scratch
+PostgreSQL database to measure the production path (tables are dropped!).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from llmbattler_backend.services.session_service import get_battles_by_session
+from llmbattler_shared.content import store_contents
+from llmbattler_shared.models import Battle, Message, Session, Turn
+
+
+BATTLES_PER_SESSION = 2
+TURNS_PER_BATTLE = 2
+PROMPT_POOL = 200
+HISTORY_SAMPLE = 200
+SENTENCES = [
+    "Recursion solves a problem by reducing it to a smaller instance of itself.",
+    "A base case stops the recursion once the input is small enough.",
+    "Each call gets its own frame on the stack with its own local variables.",
+    "Memoization caches results so overlapping subproblems are solved once.",
+    "Tail calls can be optimized into loops by some compilers.",
+    "Deep recursion may overflow the stack on large inputs.",
+]
+
+
+def _response(rng: random.Random) -> str:
+    """A mostly distinct, answer-like body (~1-2 KB)"""
+    sentences = [rng.choice(SENTENCES) for _ in range(rng.randint(15, 30))]
+    return f"Answer #{rng.getrandbits(32)}: " + " ".join(sentences)
+
+
+def _conversation(index: int, rng: random.Random, prompts, started: datetime):
+    """Session, battle, turn and message rows of one session (bodies inline)"""
+    session_id = f"session_{index}"
+    session = {
+        "session_id": session_id,
+        "title": "bench",
+        "created_at": started,
+        "last_active_at": started,
+    }
+    battles, turns, messages = [], [], []
+    for battle_seq in range(BATTLES_PER_SESSION):
+        battle_id = f"battle_{index}_{battle_seq}"
+        battles.append(
+            {
+                "battle_id": battle_id,
+                "session_id": session_id,
+                "left_model_id": "model-a",
+                "right_model_id": "model-b",
+                "seq_in_session": battle_seq,
+                "status": "ongoing",
+                "created_at": started,
+                "updated_at": started,
+            }
+        )
+        for seq in range(TURNS_PER_BATTLE):
+            turn_id = f"turn_{index}_{battle_seq}_{seq}"
+            turns.append(
+                {
+                    "turn_id": turn_id,
+                    "session_id": session_id,
+                    "battle_id": battle_id,
+                    "battle_seq_in_session": battle_seq,
+                    "seq": seq,
+                    "user_input": rng.choice(prompts),
+                    "user_input_hash": None,
+                    "created_at": started,
+                }
+            )
+            for seq_in_turn, side in enumerate(("left", "right")):
+                messages.append(
+                    {
+                        "message_id": f"msg_{turn_id}_{side}",
+                        "session_id": session_id,
+                        "battle_id": battle_id,
+                        "turn_id": turn_id,
+                        "battle_seq_in_session": battle_seq,
+                        "turn_seq": seq,
+                        "seq_in_turn": seq_in_turn,
+                        "side": side,
+                        "content": _response(rng),
+                        "content_hash": None,
+                        "created_at": started,
+                    }
+                )
+    return session, battles, turns, messages
+
+
+async def _write(session_maker, session_count: int, offload: bool) -> None:
+    """Insert conversations, bodies inline or in content_blobs"""
+    rng = random.Random(7)
+    prompts = [f"Prompt {i}: explain recursion with an example." for i in range(PROMPT_POOL)]
+    started = datetime(2026, 1, 1, tzinfo=UTC)
+    async with session_maker() as db:
+        for index in range(session_count):
+            session, battles, turns, messages = _conversation(index, rng, prompts, started)
+            if offload:
+                # What the session service does per turn with CONTENT_OFFLOAD
+                columns = (
+                    (turns, "user_input", "user_input_hash"),
+                    (messages, "content", "content_hash"),
+                )
+                for rows, body, key in columns:
+                    hashes = await store_contents(db, [row[body] for row in rows])
+                    for row, content_hash in zip(rows, hashes):
+                        row[body], row[key] = None, content_hash
+            await db.execute(insert(Session.__table__), [session])
+            await db.execute(insert(Battle.__table__), battles)
+            await db.execute(insert(Turn.__table__), turns)
+            await db.execute(insert(Message.__table__), messages)
+            if index % 100 == 99:
+                await db.commit()
+        await db.commit()
+
+
+async def _table_bytes(engine: AsyncEngine, table: str) -> int:
+    """On-disk size of a table (with indexes and, on PostgreSQL, TOAST)"""
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            result = await conn.execute(
+                text("SELECT pg_total_relation_size(CAST(:table AS regclass))"),
+                {"table": table},
+            )
+            return result.scalar_one()
+        result = await conn.execute(
+            # Table and index pages (dbstat virtual table)
+            text(
+                "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat "
+                "WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = :table)"
+            ),
+            {"table": table},
+        )
+        return result.scalar_one()
+
+
+async def run_benchmark(database_url: str, session_count: int, offload: bool):
+    """
+    Write conversations, then measure storage, a metadata scan and history reads
+
+    Returns:
+        Tuple[float, float, float, float]: (conversation MiB, blob MiB, scan ms,
+        history ms per session)
+    """
+    engine = create_async_engine(database_url, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await _write(session_maker, session_count, offload)
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE"))
+
+    conversation_bytes = await _table_bytes(engine, "turns") + await _table_bytes(
+        engine, "messages"
+    )
+    blob_bytes = await _table_bytes(engine, "content_blobs")
+
+    scan_started = time.perf_counter()
+    for _ in range(5):
+        async with engine.connect() as conn:
+            await conn.execute(
+                select(Message.side, func.count(), func.max(Message.created_at)).group_by(
+                    Message.side
+                )
+            )
+    scan_ms = (time.perf_counter() - scan_started) * 1000 / 5
+
+    rng = random.Random(42)
+    sample = [f"session_{rng.randrange(session_count)}" for _ in range(HISTORY_SAMPLE)]
+    history_started = time.perf_counter()
+    for session_id in sample:
+        async with session_maker() as db:
+            await get_battles_by_session(session_id, db)
+    history_ms = (time.perf_counter() - history_started) * 1000 / len(sample)
+
+    await engine.dispose()
+    return conversation_bytes / 2**20, blob_bytes / 2**20, scan_ms, history_ms
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=2_000)
+    args = parser.parse_args()
+
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        turns = args.sessions * BATTLES_PER_SESSION * TURNS_PER_BATTLE
+        print(f"Database: {url.split('@')[-1]}  turns: {turns:,}  distinct prompts: {PROMPT_POOL}")
+        for label, offload in (("inline", False), ("offloaded", True)):
+            conversation_mib, blob_mib, scan_ms, history_ms = await run_benchmark(
+                url, args.sessions, offload
+            )
+            print(
+                f"{label:<10} turns+messages {conversation_mib:>7.1f} MiB  "
+                f"content_blobs {blob_mib:>7.1f} MiB  "
+                f"metadata scan {scan_ms:>8.1f} ms  history {history_ms:>6.2f} ms/session"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
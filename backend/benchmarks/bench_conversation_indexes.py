@@ -0,0 +1,209 @@
+"""
+Benchmark: conversation table indexes, before/after migration 6b3e9d0f4c28
+
+Builds battles/turns/messages twice, once with the former single-column
+indexes ("before") and once with the composite ones from the models
+("after"), and times:
+
+- insert: writing conversations (battles, then a turn and two messages per
+  turn), COMMIT_EVERY sessions per transaction so commit overhead does not
+  hide index maintenance
+- read: session history queries (messages and turns of a session in
+  conversation order, battles of a session)
+
+Usage (from backend/):
+    uv run python benchmarks/bench_conversation_indexes.py
+    uv run python benchmarks/bench_conversation_indexes.py --sessions 20000
+    BENCH_DATABASE_URL=postgresql+asyncpg://... \
+        uv run python benchmarks/bench_conversation_indexes.py
+
+Defaults to a temporary SQLite file. Point BENCH_DATABASE_URL at a scratch
+PostgreSQL database to measure the production path (tables are dropped!).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import SQLModel
+
+from llmbattler_shared.models import Battle, Message, Turn
+
+
+# Single-column indexes dropped by migration 6b3e9d0f4c28
+LEGACY_INDEXES = {
+    Message.__table__: [
+        "session_id",
+        "battle_id",
+        "turn_id",
+        "battle_seq_in_session",
+        "turn_seq",
+        "seq_in_turn",
+        "session_seq",
+        "created_at",
+    ],
+    Turn.__table__: ["session_id", "battle_id", "battle_seq_in_session", "seq", "created_at"],
+    Battle.__table__: ["session_id", "seq_in_session", "status", "created_at"],
+}
+
+BATTLES_PER_SESSION = 3
+TURNS_PER_BATTLE = 2
+READ_SAMPLE = 500
+COMMIT_EVERY = 100
+
+
+def _conversation(session_index: int, started: datetime):
+    """Battle, turn and message rows of one session"""
+    session_id = f"session_{session_index}"
+    battles, turns, messages = [], [], []
+    session_seq = 0
+    for battle_seq in range(BATTLES_PER_SESSION):
+        battle_id = f"battle_{session_index}_{battle_seq}"
+        battles.append(
+            {
+                "battle_id": battle_id,
+                "session_id": session_id,
+                "left_model_id": "model-a",
+                "right_model_id": "model-b",
+                "seq_in_session": battle_seq,
+                "status": "ongoing",
+                "created_at": started,
+                "updated_at": started,
+            }
+        )
+        for turn_seq in range(TURNS_PER_BATTLE):
+            turn_id = f"turn_{session_index}_{battle_seq}_{turn_seq}"
+            turns.append(
+                {
+                    "turn_id": turn_id,
+                    "session_id": session_id,
+                    "battle_id": battle_id,
+                    "battle_seq_in_session": battle_seq,
+                    "seq": turn_seq,
+                    "user_input": "Explain B-trees in one paragraph.",
+                    "created_at": started,
+                }
+            )
+            for seq_in_turn, side in enumerate(("left", "right")):
+                messages.append(
+                    {
+                        "message_id": f"msg_{turn_id}_{side}",
+                        "session_id": session_id,
+                        "battle_id": battle_id,
+                        "turn_id": turn_id,
+                        "battle_seq_in_session": battle_seq,
+                        "turn_seq": turn_seq,
+                        "seq_in_turn": seq_in_turn,
+                        "session_seq": session_seq,
+                        "side": side,
+                        "content": "A B-tree keeps keys sorted in wide nodes. " * 8,
+                        "created_at": started,
+                    }
+                )
+                session_seq += 1
+    return battles, turns, messages
+
+
+async def _create_schema(engine: AsyncEngine, legacy: bool) -> None:
+    """Create the tables with the current (composite) or legacy (single-column) indexes"""
+
+    def create(connection):
+        SQLModel.metadata.drop_all(connection)
+        SQLModel.metadata.create_all(connection)
+        if not legacy:
+            return
+        for table, columns in LEGACY_INDEXES.items():
+            for index in table.indexes:
+                if not index.unique:
+                    index.drop(connection)
+            for column in columns:
+                # Raw DDL: an Index() object would attach to the shared metadata
+                connection.execute(
+                    text(f"CREATE INDEX ix_{table.name}_{column} ON {table.name} ({column})")
+                )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(create)
+
+
+async def run_benchmark(database_url: str, session_count: int, legacy: bool):
+    """
+    Insert conversations and time inserts and session history reads
+
+    Returns:
+        Tuple[float, float]: (messages inserted per second, ms per session history read)
+    """
+    engine = create_async_engine(database_url, echo=False)
+    await _create_schema(engine, legacy)
+
+    started = datetime(2026, 1, 1, tzinfo=UTC)
+    insert_started = time.perf_counter()
+    message_count = 0
+    for first in range(0, session_count, COMMIT_EVERY):
+        battles, turns, messages = [], [], []
+        for index in range(first, min(first + COMMIT_EVERY, session_count)):
+            rows = _conversation(index, started + timedelta(seconds=index))
+            battles += rows[0]
+            turns += rows[1]
+            messages += rows[2]
+        async with engine.begin() as conn:
+            await conn.execute(insert(Battle.__table__), battles)
+            await conn.execute(insert(Turn.__table__), turns)
+            await conn.execute(insert(Message.__table__), messages)
+        message_count += len(messages)
+    insert_seconds = time.perf_counter() - insert_started
+
+    rng = random.Random(42)
+    sample = [f"session_{rng.randrange(session_count)}" for _ in range(READ_SAMPLE)]
+    read_started = time.perf_counter()
+    async with engine.connect() as conn:
+        for session_id in sample:
+            await conn.execute(
+                select(Message.__table__)
+                .where(Message.session_id == session_id)
+                .order_by(Message.battle_seq_in_session, Message.turn_seq, Message.seq_in_turn)
+            )
+            await conn.execute(
+                select(Turn.__table__)
+                .where(Turn.session_id == session_id)
+                .order_by(Turn.battle_seq_in_session, Turn.seq)
+            )
+            await conn.execute(
+                select(Battle.__table__)
+                .where(Battle.session_id == session_id)
+                .order_by(Battle.seq_in_session)
+            )
+    read_ms = (time.perf_counter() - read_started) * 1000 / len(sample)
+
+    await engine.dispose()
+    return message_count / insert_seconds, read_ms
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=5_000)
+    args = parser.parse_args()
+
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        messages = args.sessions * BATTLES_PER_SESSION * TURNS_PER_BATTLE * 2
+        print(
+            f"Database: {url.split('@')[-1]}  sessions: {args.sessions:,}  messages: {messages:,}"
+        )
+        for label, legacy in (("before (single-column)", True), ("after (composite)", False)):
+            throughput, read_ms = await run_benchmark(url, args.sessions, legacy)
+            print(
+                f"{label:<24} insert: {throughput:>10,.0f} messages/sec   "
+                f"read: {read_ms:>7.3f} ms/session"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
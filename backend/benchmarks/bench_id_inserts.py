@@ -0,0 +1,104 @@
+"""
+Benchmark: unique ID index insert throughput, random vs time-ordered IDs
+
+Inserts rows keyed by a unique VARCHAR id (like messages.message_id) into a
+growing table, with the former random IDs (prefix + 12 hex characters) and
+with time-ordered IDs (llmbattler_shared.ids.new_id), and reports insert
+throughput per chunk. Random keys land on random leaves of the B-tree, so
+throughput drops once the index outgrows the cache; time-ordered keys
+append to the right edge and stay flat.
+
+Usage (from backend/):
+    uv run python benchmarks/bench_id_inserts.py                  # 2M rows
+    uv run python benchmarks/bench_id_inserts.py --rows 500000
+    BENCH_DATABASE_URL=postgresql+asyncpg://... \\
+        uv run python benchmarks/bench_id_inserts.py
+
+Defaults to a temporary SQLite file with a small page cache (--cache-mb), so
+the index outgrows memory at benchmark sizes. Point BENCH_DATABASE_URL at a
+scratch PostgreSQL database to measure the production path (the bench_ids
+table is dropped!).
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from llmbattler_shared.ids import new_id
+
+
+INSERT_BATCH_SIZE = 5_000
+
+metadata = MetaData()
+bench_ids = Table(
+    "bench_ids",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("message_id", String(50), nullable=False, unique=True),
+)
+
+
+def legacy_id(prefix: str) -> str:
+    """Former random ID"""
+    return f"{prefix}_{uuid.uuid4().hex[:12]}"
+
+
+async def run_benchmark(database_url: str, rows: int, chunks: int, cache_mb: int, make_id):
+    """
+    Insert rows in chunks and time each chunk
+
+    Returns:
+        List[float]: Rows/sec of each chunk, in insert order
+    """
+    engine = create_async_engine(database_url, echo=False)
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _limit_cache(dbapi_connection, connection_record):
+            dbapi_connection.execute(f"PRAGMA cache_size = -{cache_mb * 1024}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+
+    chunk_size = rows // chunks
+    throughput = []
+    for _ in range(chunks):
+        started = time.perf_counter()
+        for _ in range(0, chunk_size, INSERT_BATCH_SIZE):
+            batch = [{"message_id": make_id("msg")} for _ in range(INSERT_BATCH_SIZE)]
+            async with engine.begin() as conn:
+                await conn.execute(insert(bench_ids), batch)
+        throughput.append(chunk_size / (time.perf_counter() - started))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    await engine.dispose()
+    return throughput
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunks", type=int, default=4)
+    parser.add_argument("--cache-mb", type=int, default=8, help="SQLite page cache")
+    args = parser.parse_args()
+
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        print(f"Database: {url.split('@')[-1]}  rows: {args.rows:,}")
+        for label, make_id in (("random (uuid4 hex)", legacy_id), ("time-ordered", new_id)):
+            throughput = await run_benchmark(url, args.rows, args.chunks, args.cache_mb, make_id)
+            chunks = "  ".join(f"{value:>9,.0f}" for value in throughput)
+            print(f"{label:<20} rows/sec per chunk: {chunks}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,294 @@
+"""
+Benchmark: session history reads, ORM objects vs column-projected rows
+
+Seeds one session with hundreds of messages, then measures CPU time and peak
+Python memory per call of:
+
+- get_session_messages (LLM context, built on every new battle / follow-up)
+- get_battles_by_session (session history endpoint)
+
+against the former implementations, which loaded full Message/Turn/Battle
+ORM objects (all columns, identity map) and matched messages to turns with
+a nested scan.
+
+Usage (from backend/):
+    uv run python benchmarks/bench_session_reads.py
+    uv run python benchmarks/bench_session_reads.py --battles 50 --turns 5
+    BENCH_DATABASE_URL=postgresql+asyncpg://... \\
+        uv run python benchmarks/bench_session_reads.py
+
+Defaults to a temporary SQLite file. Point BENCH_DATABASE_URL at a scratch
+PostgreSQL database to measure the production path (tables are dropped!).
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from llmbattler_backend.repositories import VoteRepository
+from llmbattler_backend.services.session_service import (
+    get_battles_by_session,
+    get_session_messages,
+)
+from llmbattler_shared.config import MULTI_ASSISTANT_SYSTEM_PROMPT
+from llmbattler_shared.ids import new_id
+from llmbattler_shared.models import Battle, Message, Session, Turn, Vote
+
+
+SESSION_ID = "session_bench"
+CONTENT = "Here is a detailed answer with a few paragraphs of explanation. " * 16
+
+
+async def _seed(session_maker, battles: int, turns: int) -> int:
+    """One session with battles x turns x 2 messages, every other battle voted"""
+    started = datetime(2026, 1, 1, tzinfo=UTC)
+    battle_rows, turn_rows, message_rows, vote_rows = [], [], [], []
+    session_seq = 0
+    for battle_seq in range(battles):
+        battle_id = new_id("battle")
+        voted = battle_seq % 2 == 0
+        battle_rows.append(
+            {
+                "battle_id": battle_id,
+                "session_id": SESSION_ID,
+                "left_model_id": "model-a",
+                "right_model_id": "model-b",
+                "seq_in_session": battle_seq,
+                "status": "voted" if voted else "ongoing",
+                "created_at": started,
+                "updated_at": started,
+            }
+        )
+        if voted:
+            vote_rows.append(
+                {
+                    "vote_id": new_id("vote"),
+                    "battle_id": battle_id,
+                    "session_id": SESSION_ID,
+                    "vote": "left_better",
+                    "left_model_id": "model-a",
+                    "right_model_id": "model-b",
+                    "processing_status": "processed",
+                    "voted_at": started,
+                }
+            )
+        for turn_seq in range(turns):
+            turn_id = new_id("turn")
+            turn_rows.append(
+                {
+                    "turn_id": turn_id,
+                    "session_id": SESSION_ID,
+                    "battle_id": battle_id,
+                    "battle_seq_in_session": battle_seq,
+                    "seq": turn_seq,
+                    "user_input": "Compare these two approaches in detail.",
+                    "user_input_json": {"text": "Compare these two approaches in detail."},
+                    "created_at": started + timedelta(seconds=session_seq),
+                }
+            )
+            for seq_in_turn, side in enumerate(("left", "right")):
+                message_rows.append(
+                    {
+                        "message_id": new_id("msg"),
+                        "session_id": SESSION_ID,
+                        "battle_id": battle_id,
+                        "turn_id": turn_id,
+                        "battle_seq_in_session": battle_seq,
+                        "turn_seq": turn_seq,
+                        "seq_in_turn": seq_in_turn,
+                        "session_seq": session_seq,
+                        "side": side,
+                        "content": CONTENT,
+                        "content_json": {"text": CONTENT},
+                        "token_count": 256,
+                        "created_at": started + timedelta(seconds=session_seq),
+                    }
+                )
+                session_seq += 1
+
+    async with session_maker() as db:
+        db.add(Session(session_id=SESSION_ID, title="bench", created_at=started))
+        await db.execute(insert(Battle.__table__), battle_rows)
+        await db.execute(insert(Turn.__table__), turn_rows)
+        await db.execute(insert(Message.__table__), message_rows)
+        if vote_rows:
+            await db.execute(insert(Vote.__table__), vote_rows)
+        await db.commit()
+    return len(message_rows)
+
+
+async def orm_session_messages(db: AsyncSession, session_id: str) -> List[Dict[str, str]]:
+    """Former get_session_messages (full ORM objects)"""
+    messages = [{"role": "system", "content": MULTI_ASSISTANT_SYSTEM_PROMPT}]
+    result = await db.execute(
+        select(Message)
+        .filter(Message.session_id == session_id)
+        .order_by(Message.battle_seq_in_session, Message.turn_seq, Message.seq_in_turn)
+    )
+    all_messages = result.scalars().all()
+    result = await db.execute(
+        select(Turn)
+        .filter(Turn.session_id == session_id)
+        .order_by(Turn.battle_seq_in_session, Turn.seq)
+    )
+    turn_map = {turn.turn_id: turn.user_input for turn in result.scalars().all()}
+    current_turn_id = None
+    for message in all_messages:
+        if message.turn_id != current_turn_id:
+            current_turn_id = message.turn_id
+            user_input = turn_map.get(current_turn_id)
+            if user_input:
+                messages.append({"role": "user", "content": user_input})
+        messages.append({"role": "assistant", "content": message.content})
+    return messages
+
+
+async def orm_battles_by_session(session_id: str, db: AsyncSession) -> Dict:
+    """Former get_battles_by_session (full ORM objects, nested scan, vote per battle)"""
+    vote_repo = VoteRepository(db)
+    battles = (
+        (
+            await db.execute(
+                select(Battle)
+                .filter(Battle.session_id == session_id)
+                .order_by(Battle.seq_in_session)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    turns = (
+        (
+            await db.execute(
+                select(Turn)
+                .filter(Turn.session_id == session_id)
+                .order_by(Turn.battle_seq_in_session, Turn.seq)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    messages = (
+        (
+            await db.execute(
+                select(Message)
+                .filter(Message.session_id == session_id)
+                .order_by(Message.battle_seq_in_session, Message.turn_seq, Message.seq_in_turn)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    battle_conversations: Dict[str, List[Dict]] = {}
+    for turn in turns:
+        battle_conversations.setdefault(turn.battle_id, []).append(
+            {"role": "user", "content": turn.user_input, "timestamp": turn.created_at.isoformat()}
+        )
+        turn_messages = [m for m in messages if m.turn_id == turn.turn_id]
+        for msg in sorted(turn_messages, key=lambda m: m.seq_in_turn):
+            battle_conversations[turn.battle_id].append(
+                {
+                    "role": "assistant",
+                    "content": msg.content,
+                    "position": msg.side,
+                    "timestamp": msg.created_at.isoformat(),
+                }
+            )
+
+    battle_items = []
+    for battle in battles:
+        item = {
+            "battle_id": battle.battle_id,
+            "left_model_id": battle.left_model_id,
+            "right_model_id": battle.right_model_id,
+            "conversation": battle_conversations.get(battle.battle_id, []),
+            "status": battle.status,
+            "vote": None,
+            "created_at": battle.created_at,
+        }
+        if battle.status == "voted":
+            vote = await vote_repo.get_by_battle_id(battle.battle_id)
+            if vote:
+                item["vote"] = vote.vote
+        battle_items.append(item)
+    return {"session_id": session_id, "battles": battle_items}
+
+
+async def measure(session_maker, call, repeats: int):
+    """
+    Mean CPU time and peak traced memory of one call (fresh session per call)
+
+    Returns:
+        Tuple[float, float, object]: (CPU ms per call, peak KiB per call, last result)
+    """
+    result = None
+    cpu_started = time.process_time()
+    for _ in range(repeats):
+        async with session_maker() as db:
+            result = await call(db)
+    cpu_ms = (time.process_time() - cpu_started) * 1000 / repeats
+
+    async with session_maker() as db:
+        tracemalloc.start()
+        await call(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return cpu_ms, peak / 1024, result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--battles", type=int, default=40)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        engine = create_async_engine(url, echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        message_count = await _seed(session_maker, args.battles, args.turns)
+        print(f"Database: {url.split('@')[-1]}  messages in session: {message_count:,}")
+
+        cases = [
+            (
+                "get_session_messages",
+                lambda db: orm_session_messages(db, SESSION_ID),
+                lambda db: get_session_messages(db, SESSION_ID),
+            ),
+            (
+                "get_battles_by_session",
+                lambda db: orm_battles_by_session(SESSION_ID, db),
+                lambda db: get_battles_by_session(SESSION_ID, db),
+            ),
+        ]
+        for name, before, after in cases:
+            cpu_before, mem_before, result_before = await measure(
+                session_maker, before, args.repeats
+            )
+            cpu_after, mem_after, result_after = await measure(session_maker, after, args.repeats)
+            assert result_before == result_after, f"{name}: results differ"
+            print(
+                f"{name:<24} CPU {cpu_before:>7.2f} -> {cpu_after:>6.2f} ms/request   "
+                f"peak memory {mem_before:>8,.0f} -> {mem_after:>7,.0f} KiB"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
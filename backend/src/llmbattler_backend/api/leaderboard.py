@@ -3,14 +3,20 @@ Leaderboard API endpoints
 """
 
 import logging
+from datetime import UTC, datetime, timedelta
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from llmbattler_backend.database import get_db
+from llmbattler_backend.database import get_read_db
 from llmbattler_backend.services.leaderboard_service import LeaderboardService
 from llmbattler_shared.config import settings
-from llmbattler_shared.schemas import LeaderboardResponse
+from llmbattler_shared.schemas import (
+    LeaderboardResponse,
+    PairwiseMatrixResponse,
+    RatingHistoryResponse,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -20,25 +26,38 @@ router = APIRouter()
 
 @router.get("/leaderboard", response_model=LeaderboardResponse, status_code=status.HTTP_200_OK)
 async def get_leaderboard(
-    db: AsyncSession = Depends(get_db),
+    organization: Optional[str] = Query(None, description="Rank within an organization segment"),
+    license: Optional[str] = Query(None, description="Rank within a license segment"),
+    min_votes: Optional[int] = Query(
+        None, ge=0, description="Minimum votes (default: MIN_VOTES_FOR_LEADERBOARD)"
+    ),
+    sort_by: Literal["elo_score", "vote_count", "win_rate"] = Query(
+        "elo_score", description="Sort key (descending)"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get leaderboard with ELO-based rankings
 
     Flow:
-    1. Query model_stats table from PostgreSQL
-    2. Filter models with vote_count >= 5 (minimum threshold)
-    3. Sort by elo_score descending (fixed rank: 1 = highest ELO)
+    1. Query model_stats (or model_segment_stats when a segment filter is given)
+    2. Filter models with vote_count >= min_votes (default 5)
+    3. Sort by sort_by descending (fixed rank: 1 = highest ELO)
     4. Assign ranks (1, 2, 3, ...)
     5. Calculate metadata (total models, total votes, last updated)
 
-    Note: Sorting/filtering is handled client-side for better performance
+    Note: Segment ratings are computed by the worker from in-segment battles,
+    so filtering by organization/license re-ranks rather than filtering the global list
 
     Args:
-        db: Database session
+        organization: Optional organization segment (e.g., "Meta")
+        license: Optional license segment (e.g., "open-source")
+        min_votes: Optional minimum vote threshold
+        sort_by: Sort key (elo_score, vote_count, win_rate)
+        db: Read-only database session (replica when available)
 
     Returns:
-        LeaderboardResponse with ranked models and metadata (sorted by ELO score)
+        LeaderboardResponse with ranked models and metadata (sorted by sort_by)
 
     Raises:
         HTTPException 500: If database query fails
@@ -46,7 +65,12 @@ async def get_leaderboard(
     try:
         service = LeaderboardService(db)
         leaderboard = await service.get_leaderboard(
-            min_vote_count=settings.min_votes_for_leaderboard
+            min_vote_count=(
+                min_votes if min_votes is not None else settings.min_votes_for_leaderboard
+            ),
+            organization=organization,
+            license=license,
+            sort_by=sort_by,
         )
         return leaderboard
 
@@ -56,3 +80,112 @@ async def get_leaderboard(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get leaderboard: {str(e)}",
         )
+
+
+@router.get(
+    "/leaderboard/history",
+    response_model=RatingHistoryResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_leaderboard_history(
+    start: Optional[datetime] = Query(
+        None, description="Start of time range (ISO 8601, default: 30 days before end)"
+    ),
+    end: Optional[datetime] = Query(None, description="End of time range (ISO 8601, default: now)"),
+    points: int = Query(200, ge=2, le=2000, description="Maximum number of points per model"),
+    model_id: Optional[List[str]] = Query(None, description="Model IDs to include (default: all)"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get rating time series per model for trend charts
+
+    Flow:
+    1. Query model_rating_history snapshots in [start, end]
+    2. Group snapshots by model
+    3. Downsample each series to at most `points` points (LTTB)
+
+    Args:
+        start: Start of time range (default: end - 30 days)
+        end: End of time range (default: now)
+        points: Maximum points per series (2-2000, default 200)
+        model_id: Optional repeated query param to restrict models
+        db: Read-only database session (replica when available)
+
+    Returns:
+        RatingHistoryResponse with one series per model
+
+    Raises:
+        HTTPException 400: If start is after end
+        HTTPException 500: If database query fails
+    """
+    end = end or datetime.now(UTC)
+    start = start or end - timedelta(days=30)
+
+    # Treat naive timestamps as UTC
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=UTC)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=UTC)
+
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end",
+        )
+
+    try:
+        service = LeaderboardService(db)
+        return await service.get_rating_history(
+            start=start,
+            end=end,
+            max_points=points,
+            model_ids=model_id,
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to get rating history: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get rating history: {str(e)}",
+        )
+
+
+@router.get(
+    "/leaderboard/matrix",
+    response_model=PairwiseMatrixResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_leaderboard_matrix(
+    model_id: Optional[List[str]] = Query(None, description="Model IDs to include (default: all)"),
+    min_battles: int = Query(0, ge=0, description="Minimum battles for a model to be included"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get head-to-head win-rate and battle-count matrix
+
+    Flow:
+    1. Read pairwise counts from model_pairwise_stats (maintained by worker)
+    2. Build dense model x model matrices
+    3. Drop models with fewer than min_battles battles
+
+    Args:
+        model_id: Optional repeated query param to restrict models
+        min_battles: Minimum total battles within the selection (default 0)
+        db: Read-only database session (replica when available)
+
+    Returns:
+        PairwiseMatrixResponse with models, win_count, battle_count, win_rate
+
+    Raises:
+        HTTPException 500: If database query fails
+    """
+    try:
+        service = LeaderboardService(db)
+        return await service.get_pairwise_matrix(model_ids=model_id, min_battles=min_battles)
+
+    except Exception as e:
+        logger.error(f"Failed to get pairwise matrix: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get pairwise matrix: {str(e)}",
+        )
@@ -7,7 +7,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from llmbattler_backend.database import get_db
+from llmbattler_backend.database import get_db, get_read_db
 from llmbattler_backend.services.session_service import (
     create_battle_in_session,
     create_session_with_battle,
@@ -34,7 +34,7 @@ async def get_sessions(
     user_id: str = Query(..., description="User ID (UUID string for anonymous users)"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of sessions to return"),
     offset: int = Query(0, ge=0, description="Number of sessions to skip"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get session list for a user with pagination
@@ -48,7 +48,7 @@ async def get_sessions(
         user_id: User ID (UUID string for anonymous users)
         limit: Maximum number of sessions to return (1-100, default 50)
         offset: Number of sessions to skip (default 0)
-        db: Database session
+        db: Read-only database session (replica when available)
 
     Returns:
         SessionListResponse with sessions list and total count
@@ -71,7 +71,7 @@ async def get_sessions(
 @router.get("/sessions/{session_id}/battles", response_model=BattleListResponse)
 async def get_session_battles(
     session_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get all battles for a specific session
@@ -84,7 +84,7 @@ async def get_session_battles(
 
     Args:
         session_id: Session ID
-        db: Database session
+        db: Read-only database session (replica when available)
 
     Returns:
         BattleListResponse with session_id and battles list
@@ -1,11 +1,33 @@
 """
 Database connection and session management
 
-Re-exports shared database functions for backend use.
+Re-exports shared database functions for backend use. The backend engine is
+created on first use (or by init() in the app lifespan); `engine` is
+resolved lazily.
+
+Read-only endpoints depend on get_read_db: an AUTOCOMMIT session that is
+never committed (no BEGIN/COMMIT round trips), routed to the replica
+(postgres_replica_uri) when one is configured, reachable and within
+replica_max_lag_seconds of the primary (checked in the background every
+replica_check_seconds), and to the primary otherwise. A replica connection
+that fails when a request opens it sends that request (and later ones, until
+the next check) to the primary.
+Read-your-writes: after a successful write the client gets a short-lived
+cookie (READ_PRIMARY_COOKIE) and its reads go to the primary until it
+expires; clients without cookies can send the READ_PRIMARY_HEADER header.
 """
 
-from llmbattler_shared.database import backend_engine as engine
-from llmbattler_shared.database import backend_session_maker as async_session_maker
+import asyncio
+import logging
+import time
+from typing import Any, AsyncGenerator, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from llmbattler_shared import database as _shared
+from llmbattler_shared.config import settings
 from llmbattler_shared.database import (
     create_db_and_tables,
     drop_db_and_tables,
@@ -13,10 +35,249 @@ from llmbattler_shared.database import (
 from llmbattler_shared.database import get_backend_db as get_db
 
 
+logger = logging.getLogger(__name__)
+
+ROLE = "backend"
+REPLICA_ROLE = "replica"
+
+READ_PRIMARY_COOKIE = "llmbattler_read_primary"
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+# Seconds a replica lag check may take before the replica counts as down
+REPLICA_CHECK_TIMEOUT_SECONDS = 2.0
+
+# 0 on a caught-up standby (also when idle), replay delay otherwise, NULL on a primary
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def init() -> AsyncEngine:
+    """Create the backend engine (idempotent)"""
+    return _shared.init(ROLE)
+
+
+async def warm_up() -> int:
+    """Open the backend pool's connections (and the replica's, if configured)"""
+    opened = await _shared.warm_up(ROLE)
+    if settings.postgres_replica_uri:
+        opened += await _shared.warm_up(REPLICA_ROLE)
+    return opened
+
+
+async def dispose() -> None:
+    """Drain and close the backend (and replica) engines' connections"""
+    await _shared.dispose(ROLE, drain_seconds=settings.postgres_pool_drain_seconds)
+    await _shared.dispose(REPLICA_ROLE, drain_seconds=settings.postgres_pool_drain_seconds)
+
+
+def get_engine() -> AsyncEngine:
+    """Backend engine (created on first use)"""
+    return _shared.get_engine(ROLE)
+
+
+def async_session_maker(**kwargs: Any) -> AsyncSession:
+    """Open a backend session (same call signature as a sessionmaker)"""
+    return _shared.get_session_maker(ROLE)(**kwargs)
+
+
+class ReplicaRouter:
+    """Decide whether reads may use the replica (health and lag checked in the background)"""
+
+    def __init__(self, max_lag_seconds: float, check_seconds: float):
+        """
+        Initialize router
+
+        Args:
+            max_lag_seconds: Replay lag above which reads go to the primary
+            check_seconds: Minimum seconds between checks (results are cached)
+        """
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.healthy = False
+        self._checked_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a replica is configured"""
+        return bool(settings.postgres_replica_uri)
+
+    async def use_replica(self) -> bool:
+        """
+        Whether the replica is usable (cached result, never waits for a check)
+
+        A result older than check_seconds schedules a background refresh;
+        requests keep the previous result meanwhile (the primary until the
+        first check has completed).
+
+        Returns:
+            bool: True if reads should go to the replica
+        """
+        if not self.enabled:
+            return False
+
+        now = time.monotonic()
+        stale = self._checked_at is None or now - self._checked_at >= self.check_seconds
+        if stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self.healthy
+
+    async def refresh(self) -> bool:
+        """
+        Check replica health and lag now (at startup, then in the background)
+
+        Returns:
+            bool: True if the replica is usable
+        """
+        self._checked_at = time.monotonic()
+        try:
+            lag = await asyncio.wait_for(self.measure_lag(), REPLICA_CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            self._set_healthy(False, f"unreachable ({e})")
+        else:
+            if lag <= self.max_lag_seconds:
+                self._set_healthy(True, f"lag {lag:.1f}s")
+            else:
+                self._set_healthy(False, f"lag {lag:.1f}s > {self.max_lag_seconds}s")
+        return self.healthy
+
+    async def measure_lag(self) -> float:
+        """
+        Replay lag of the replica
+
+        Returns:
+            float: Seconds behind the primary (0 if caught up)
+        """
+        async with _shared.get_engine(REPLICA_ROLE).connect() as connection:
+            lag = await connection.scalar(REPLICA_LAG_QUERY)
+        return float(lag or 0.0)
+
+    def mark_unhealthy(self, reason: str) -> None:
+        """Route reads to the primary until the next check"""
+        self._checked_at = time.monotonic()
+        self._set_healthy(False, reason)
+
+    def _set_healthy(self, healthy: bool, reason: str) -> None:
+        """Record check result, logging state changes"""
+        if healthy != self.healthy:
+            if healthy:
+                logger.info(f"Read replica in use ({reason})")
+            else:
+                logger.warning(f"Read replica bypassed, reading from primary: {reason}")
+        self.healthy = healthy
+
+
+replica_router = ReplicaRouter(
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    check_seconds=settings.replica_check_seconds,
+)
+
+
+def wants_primary(request: Request) -> bool:
+    """
+    Whether the client asked to read its own writes
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        bool: True if the read-primary cookie is unexpired or the header is set
+    """
+    if request.headers.get(READ_PRIMARY_HEADER):
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def mark_read_primary(response: Response) -> None:
+    """
+    Send the read-your-writes cookie (reads go to the primary for a while)
+
+    Args:
+        response: Response of a successful write
+    """
+    seconds = settings.read_your_writes_seconds
+    if not replica_router.enabled or seconds <= 0:
+        return
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        str(int(time.time()) + seconds),
+        max_age=seconds,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get database session for read-only endpoints
+
+    Uses the replica when usable and the client did not just write,
+    the primary otherwise. A replica session is pinged before it is handed
+    out; if the ping fails the replica is bypassed until the next check and
+    the request reads from the primary. The session runs on an AUTOCOMMIT
+    connection and is closed, not committed, after the handler: do not
+    write through it.
+
+    Usage:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncSession = Depends(get_read_db)):
+            ...
+
+    Args:
+        request: Incoming request (read-your-writes cookie/header)
+
+    Yields:
+        AsyncSession: Read-only database session instance
+    """
+    session = None
+    if not wants_primary(request) and await replica_router.use_replica():
+        session = await _open_replica_session()
+    if session is None:
+        session = _shared.get_session_maker(ROLE, readonly=True)()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def _open_replica_session() -> Optional[AsyncSession]:
+    """
+    Open a read-only replica session and check it answers
+
+    Returns:
+        Optional[AsyncSession]: The session, or None if the replica is down
+                                (it is then marked unhealthy)
+    """
+    session = _shared.get_session_maker(REPLICA_ROLE, readonly=True)()
+    try:
+        await asyncio.wait_for(session.execute(text("SELECT 1")), REPLICA_CHECK_TIMEOUT_SECONDS)
+    except Exception as e:
+        await session.close()
+        replica_router.mark_unhealthy(f"connection failed ({e})")
+        return None
+    return session
+
+
+def __getattr__(name: str) -> Any:
+    """Lazy `engine` attribute (kept for old imports; use get_engine())"""
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
-    "engine",
     "async_session_maker",
     "get_db",
+    "get_read_db",
+    "get_engine",
+    "init",
+    "dispose",
     "create_db_and_tables",
     "drop_db_and_tables",
 ]
@@ -4,15 +4,18 @@ FastAPI application entry point
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from llmbattler_backend import database
 from llmbattler_backend.api import battles, leaderboard, models, sessions
 from llmbattler_backend.services.llm_client import (
     MockLLMClient,
     OpenAILLMClient,
     set_llm_client,
 )
+from llmbattler_shared import pool_metrics
 from llmbattler_shared.config import settings
 from llmbattler_shared.logging_config import setup_logging
 
@@ -34,10 +37,15 @@ async def lifespan(app: FastAPI):
         logger.info("🚀 Using OpenAI-compatible LLM client (production mode)")
         set_llm_client(OpenAILLMClient())
 
-    # TODO: Initialize database connections
-    # - MongoDB (Motor)
-    # - PostgreSQL (SQLAlchemy async)
-    # - Create MongoDB indexes
+    # PostgreSQL engine (backend pool only), pre-connected so the first
+    # requests don't pay for connection setup
+    database.init()
+    if settings.postgres_pool_warm_up:
+        opened = await database.warm_up()
+        logger.info(f"Database pool warmed up ({opened} connections)")
+    if database.replica_router.enabled:
+        # First replica check up front; later ones run in the background
+        await database.replica_router.refresh()
 
     logger.info("Backend startup complete")
 
@@ -45,7 +53,7 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down llmbattler-backend...")
 
-    # TODO: Close database connections
+    await database.dispose()
 
     logger.info("Backend shutdown complete")
 
@@ -68,12 +76,27 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Send successful writers to the primary for their next reads (see database.py)"""
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        database.mark_read_primary(response)
+    return response
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "llmbattler-backend"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Database pool metrics (Prometheus text format)"""
+    return pool_metrics.render()
+
+
 # Include API routers
 app.include_router(models.router, prefix="/api", tags=["models"])
 app.include_router(sessions.router, prefix="/api", tags=["sessions"])
@@ -2,9 +2,10 @@
 Battle repository for database operations
 """
 
+from datetime import UTC, datetime
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from llmbattler_shared.models import Battle
@@ -30,6 +31,28 @@ class BattleRepository(BaseRepository[Battle]):
         """
         return await self.get_by_field("battle_id", battle_id)
 
+    async def mark_voted(self, battle_id: str) -> bool:
+        """
+        Move an ongoing battle to 'voted' (conditional UPDATE, caller commits)
+
+        Exactly one of several concurrent callers succeeds: the UPDATE only
+        matches while the status is still 'ongoing', and PostgreSQL re-checks
+        that condition after waiting for a concurrent update of the row.
+
+        Args:
+            battle_id: Unique battle identifier
+
+        Returns:
+            bool: True if this call moved the battle to 'voted'
+        """
+        stmt = (
+            update(Battle)
+            .where(Battle.battle_id == battle_id, Battle.status == "ongoing")
+            .values(status="voted", updated_at=datetime.now(UTC))
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount == 1
+
     async def get_by_session_id(self, session_id: str, limit: Optional[int] = None) -> list[Battle]:
         """
         Get all battles for a session
@@ -39,10 +62,12 @@ class BattleRepository(BaseRepository[Battle]):
             limit: Optional limit on number of battles
 
         Returns:
-            List of battle instances ordered by creation time
+            List of battle instances, newest first
         """
         stmt = (
-            select(Battle).where(Battle.session_id == session_id).order_by(Battle.created_at.desc())
+            select(Battle)
+            .where(Battle.session_id == session_id)
+            .order_by(Battle.seq_in_session.desc())
         )
         if limit:
             stmt = stmt.limit(limit)
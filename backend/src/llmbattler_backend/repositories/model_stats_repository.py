@@ -21,21 +21,20 @@ class ModelStatsRepository(BaseRepository[ModelStats]):
     async def get_leaderboard(
         self,
         min_vote_count: int = 5,
+        sort_by: str = "elo_score",
     ) -> List[ModelStats]:
         """
-        Get leaderboard models sorted by ELO score
+        Get leaderboard models sorted by sort key
 
         Args:
             min_vote_count: Minimum number of votes required to appear on leaderboard
+            sort_by: Column to sort by descending (elo_score, vote_count, win_rate)
 
         Returns:
-            List of ModelStats instances sorted by elo_score descending
+            List of ModelStats instances sorted by sort_by descending (ties by elo_score)
         """
-        stmt = (
-            select(ModelStats)
-            .where(ModelStats.vote_count >= min_vote_count)
-            .order_by(ModelStats.elo_score.desc())
-        )
+        stmt = select(ModelStats).where(ModelStats.vote_count >= min_vote_count)
+        stmt = stmt.order_by(getattr(ModelStats, sort_by).desc(), ModelStats.elo_score.desc())
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
@@ -0,0 +1,39 @@
+"""
+ModelPairwiseStats repository for head-to-head data access
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from llmbattler_shared.models import ModelPairwiseStats
+
+from .base import BaseRepository
+
+
+class PairwiseStatsRepository(BaseRepository[ModelPairwiseStats]):
+    """Repository for ModelPairwiseStats model operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ModelPairwiseStats, db)
+
+    async def get_pairs(self, model_ids: Optional[List[str]] = None) -> List[ModelPairwiseStats]:
+        """
+        Get head-to-head counts for all model pairs
+
+        Args:
+            model_ids: Optional list of model IDs; only pairs where both
+                       models are in the list are returned
+
+        Returns:
+            List of ModelPairwiseStats (canonical order: model_a_id < model_b_id)
+        """
+        stmt = select(ModelPairwiseStats)
+        if model_ids:
+            stmt = stmt.where(
+                ModelPairwiseStats.model_a_id.in_(model_ids),
+                ModelPairwiseStats.model_b_id.in_(model_ids),
+            )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
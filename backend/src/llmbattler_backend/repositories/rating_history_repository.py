@@ -0,0 +1,48 @@
+"""
+ModelRatingHistory repository for rating-trend data access
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from llmbattler_shared.models import ModelRatingHistory
+
+from .base import BaseRepository
+
+
+class RatingHistoryRepository(BaseRepository[ModelRatingHistory]):
+    """Repository for ModelRatingHistory model operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ModelRatingHistory, db)
+
+    async def get_history(
+        self,
+        start: datetime,
+        end: datetime,
+        model_ids: Optional[List[str]] = None,
+    ) -> List[ModelRatingHistory]:
+        """
+        Get rating snapshots within a time range
+
+        Args:
+            start: Inclusive lower bound on recorded_at
+            end: Inclusive upper bound on recorded_at
+            model_ids: Optional list of model IDs to restrict to
+
+        Returns:
+            List of ModelRatingHistory ordered by model_id, recorded_at
+            (matches the (model_id, recorded_at) index)
+        """
+        stmt = select(ModelRatingHistory).where(
+            ModelRatingHistory.recorded_at >= start,
+            ModelRatingHistory.recorded_at <= end,
+        )
+        if model_ids:
+            stmt = stmt.where(ModelRatingHistory.model_id.in_(model_ids))
+        stmt = stmt.order_by(ModelRatingHistory.model_id, ModelRatingHistory.recorded_at)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
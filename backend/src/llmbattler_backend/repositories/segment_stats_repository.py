@@ -0,0 +1,97 @@
+"""
+ModelSegmentStats repository for segmented leaderboard data access
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from llmbattler_shared.models import ModelSegmentStats
+
+from .base import BaseRepository
+
+
+class SegmentStatsRepository(BaseRepository[ModelSegmentStats]):
+    """Repository for ModelSegmentStats model operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ModelSegmentStats, db)
+
+    def _segment_filter(
+        self,
+        stmt,
+        segment_type: str,
+        segment_value: str,
+        min_vote_count: int,
+        license: Optional[str],
+    ):
+        """Apply segment, vote threshold and optional license filters to a statement"""
+        stmt = stmt.where(
+            ModelSegmentStats.segment_type == segment_type,
+            ModelSegmentStats.segment_value == segment_value,
+            ModelSegmentStats.vote_count >= min_vote_count,
+        )
+        if license is not None:
+            stmt = stmt.where(ModelSegmentStats.license == license)
+        return stmt
+
+    async def get_segment_leaderboard(
+        self,
+        segment_type: str,
+        segment_value: str,
+        min_vote_count: int = 5,
+        license: Optional[str] = None,
+        sort_by: str = "elo_score",
+    ) -> List[ModelSegmentStats]:
+        """
+        Get leaderboard models of one segment sorted by sort key
+
+        Args:
+            segment_type: Segment dimension (e.g., "organization")
+            segment_value: Segment value (e.g., "Meta")
+            min_vote_count: Minimum number of in-segment votes
+            license: Optional additional license filter
+            sort_by: Column to sort by descending (elo_score, vote_count, win_rate)
+
+        Returns:
+            List of ModelSegmentStats sorted by sort_by descending (ties by elo_score)
+        """
+        stmt = self._segment_filter(
+            select(ModelSegmentStats), segment_type, segment_value, min_vote_count, license
+        )
+        stmt = stmt.order_by(
+            getattr(ModelSegmentStats, sort_by).desc(), ModelSegmentStats.elo_score.desc()
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_total_votes(
+        self,
+        segment_type: str,
+        segment_value: str,
+        min_vote_count: int = 5,
+        license: Optional[str] = None,
+    ) -> int:
+        """
+        Get total number of in-segment votes across models meeting minimum threshold
+
+        Args:
+            segment_type: Segment dimension
+            segment_value: Segment value
+            min_vote_count: Minimum number of in-segment votes
+            license: Optional additional license filter
+
+        Returns:
+            Sum of vote_count for matching segment rows
+        """
+        stmt = self._segment_filter(
+            select(func.sum(ModelSegmentStats.vote_count)),
+            segment_type,
+            segment_value,
+            min_vote_count,
+            license,
+        )
+        result = await self.db.execute(stmt)
+        total = result.scalar()
+        return total if total is not None else 0
@@ -4,9 +4,10 @@ Vote repository for database operations
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from llmbattler_shared.config import settings
 from llmbattler_shared.models import Vote
 
 from .base import BaseRepository
@@ -57,3 +58,20 @@ class VoteRepository(BaseRepository[Vote]):
             stmt = stmt.limit(limit)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
+
+    async def notify_pending(self, vote_id: str) -> None:
+        """
+        Tell the worker a vote is waiting for aggregation (PostgreSQL NOTIFY)
+
+        pg_notify is transactional: the notification is delivered when the
+        request transaction commits and dropped if it rolls back, so the
+        worker never sees a vote it cannot read yet. No-op on other dialects
+        (the worker polls instead).
+
+        Args:
+            vote_id: Vote identifier, sent as the notification payload
+        """
+        connection = await self.db.connection()
+        if connection.dialect.name != "postgresql":
+            return
+        await self.db.execute(select(func.pg_notify(settings.vote_notify_channel, vote_id)))
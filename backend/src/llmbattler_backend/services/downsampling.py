@@ -0,0 +1,69 @@
+"""
+Time-series downsampling helpers
+
+Used to cap the number of points shipped to the browser for rating-trend charts.
+"""
+
+from typing import List, Sequence
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Select point indices using Largest-Triangle-Three-Buckets (LTTB)
+
+    LTTB keeps the first and last points and, for every bucket in between,
+    the point forming the largest triangle with the previously selected point
+    and the average of the next bucket. This preserves the visual shape
+    (peaks and drops) far better than fixed-interval sampling.
+
+    Args:
+        xs: X values (e.g., epoch seconds), sorted ascending
+        ys: Y values (e.g., ELO score), same length as xs
+        threshold: Maximum number of points to keep (>= 2)
+
+    Returns:
+        List of selected indices in ascending order
+
+    Example:
+        >>> lttb_indices([0, 1, 2, 3, 4], [0, 5, 0, 5, 0], 3)
+        [0, 1, 4]
+    """
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+    if threshold <= 2:
+        return [0, n - 1]
+
+    selected = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # Previously selected point
+
+    for i in range(threshold - 2):
+        # Current bucket range
+        bucket_start = int(i * bucket_size) + 1
+        bucket_end = int((i + 1) * bucket_size) + 1
+
+        # Average of next bucket (last bucket averages the final point)
+        next_start = bucket_end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        # Point in current bucket with the largest triangle area
+        max_area = -1.0
+        max_index = bucket_start
+        ax, ay = xs[a], ys[a]
+        for j in range(bucket_start, bucket_end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                max_index = j
+
+        selected.append(max_index)
+        a = max_index
+
+    selected.append(n - 1)
+    return selected
@@ -3,19 +3,35 @@ Leaderboard business logic service
 """
 
 from datetime import UTC, datetime
-from typing import List
+from itertools import groupby
+from typing import List, Optional
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from llmbattler_shared.models import ModelStats, WorkerStatus
+from llmbattler_shared.models import (
+    ModelPairwiseStats,
+    ModelRatingHistory,
+    ModelSegmentStats,
+    ModelStats,
+    WorkerStatus,
+)
 from llmbattler_shared.schemas import (
     LeaderboardMetadata,
     LeaderboardResponse,
+    ModelRatingSeries,
     ModelStatsResponse,
+    PairwiseMatrixResponse,
+    RatingHistoryPoint,
+    RatingHistoryResponse,
 )
 
 from ..repositories.model_stats_repository import ModelStatsRepository
+from ..repositories.pairwise_stats_repository import PairwiseStatsRepository
+from ..repositories.rating_history_repository import RatingHistoryRepository
+from ..repositories.segment_stats_repository import SegmentStatsRepository
+from .downsampling import lttb_indices
 
 
 class LeaderboardService:
@@ -24,22 +40,51 @@ class LeaderboardService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.model_stats_repo = ModelStatsRepository(db)
+        self.rating_history_repo = RatingHistoryRepository(db)
+        self.pairwise_stats_repo = PairwiseStatsRepository(db)
+        self.segment_stats_repo = SegmentStatsRepository(db)
 
-    async def get_leaderboard(self, min_vote_count: int = 5) -> LeaderboardResponse:
+    async def get_leaderboard(
+        self,
+        min_vote_count: int = 5,
+        organization: Optional[str] = None,
+        license: Optional[str] = None,
+        sort_by: str = "elo_score",
+    ) -> LeaderboardResponse:
         """
         Get leaderboard with model rankings
 
+        Without filters, ratings come from model_stats. With an organization or
+        license filter, ratings come from model_stats segment rows computed by
+        the worker (in-segment battles only), not from the global ranking.
+        If both are given, the organization segment is further filtered by license.
+
         Args:
             min_vote_count: Minimum number of votes required to appear on leaderboard
+            organization: Optional organization segment
+            license: Optional license segment (or filter within organization segment)
+            sort_by: Sort key (elo_score, vote_count, win_rate), always descending
 
         Returns:
-            LeaderboardResponse with ranked models sorted by ELO score descending
+            LeaderboardResponse with models sorted by sort_by (rank always by ELO)
         """
-        # Get models from repository (sorted by elo_score desc)
-        models = await self.model_stats_repo.get_leaderboard(min_vote_count)
-
-        # Get total votes
-        total_votes = await self.model_stats_repo.get_total_votes(min_vote_count)
+        if organization is not None:
+            models = await self.segment_stats_repo.get_segment_leaderboard(
+                "organization", organization, min_vote_count, license=license, sort_by=sort_by
+            )
+            total_votes = await self.segment_stats_repo.get_total_votes(
+                "organization", organization, min_vote_count, license=license
+            )
+        elif license is not None:
+            models = await self.segment_stats_repo.get_segment_leaderboard(
+                "license", license, min_vote_count, sort_by=sort_by
+            )
+            total_votes = await self.segment_stats_repo.get_total_votes(
+                "license", license, min_vote_count
+            )
+        else:
+            models = await self.model_stats_repo.get_leaderboard(min_vote_count, sort_by=sort_by)
+            total_votes = await self.model_stats_repo.get_total_votes(min_vote_count)
 
         # Get last update time from worker_status table
         # This shows when worker last ran, even if no votes were processed
@@ -66,21 +111,26 @@ class LeaderboardService:
 
     def _build_leaderboard_entries(
         self,
-        models: List[ModelStats],
+        models: List[ModelStats] | List[ModelSegmentStats],
     ) -> List[ModelStatsResponse]:
         """
         Build leaderboard entries with ranks
 
+        Rank is fixed by ELO (1 = highest) regardless of the order of models.
+
         Args:
-            models: List of ModelStats sorted by elo_score descending
+            models: List of ModelStats or ModelSegmentStats in display order
 
         Returns:
-            List of ModelStatsResponse with ranks assigned (1 = highest ELO)
+            List of ModelStatsResponse in input order with ELO ranks assigned
         """
+        by_elo = sorted(models, key=lambda model: model.elo_score, reverse=True)
+        ranks = {model.model_id: rank for rank, model in enumerate(by_elo, start=1)}
+
         entries = []
-        for rank, model in enumerate(models, start=1):
+        for model in models:
             entry = ModelStatsResponse(
-                rank=rank,
+                rank=ranks[model.model_id],
                 model_id=model.model_id,
                 model_name=model.model_id,  # For MVP, model_name = model_id
                 elo_score=model.elo_score,
@@ -93,3 +143,154 @@ class LeaderboardService:
             entries.append(entry)
 
         return entries
+
+    async def get_rating_history(
+        self,
+        start: datetime,
+        end: datetime,
+        max_points: int,
+        model_ids: Optional[List[str]] = None,
+    ) -> RatingHistoryResponse:
+        """
+        Get per-model rating time series, downsampled server-side
+
+        Each series is reduced to at most max_points with LTTB, so months of
+        hourly snapshots are not shipped to the browser.
+
+        Args:
+            start: Start of time range (inclusive)
+            end: End of time range (inclusive)
+            max_points: Maximum number of points per series (>= 2)
+            model_ids: Optional list of model IDs (all models if None)
+
+        Returns:
+            RatingHistoryResponse with one series per model
+        """
+        rows = await self.rating_history_repo.get_history(start, end, model_ids)
+
+        series = [
+            ModelRatingSeries(
+                model_id=model_id,
+                points=self._downsample_series(list(snapshots), max_points),
+            )
+            for model_id, snapshots in groupby(rows, key=lambda row: row.model_id)
+        ]
+
+        return RatingHistoryResponse(
+            series=series,
+            start=start,
+            end=end,
+            max_points=max_points,
+        )
+
+    def _downsample_series(
+        self,
+        snapshots: List[ModelRatingHistory],
+        max_points: int,
+    ) -> List[RatingHistoryPoint]:
+        """
+        Downsample one model's snapshots (sorted by recorded_at) to max_points
+
+        Args:
+            snapshots: Rating snapshots of a single model, oldest first
+            max_points: Maximum number of points to keep
+
+        Returns:
+            List of RatingHistoryPoint
+        """
+        xs = [snapshot.recorded_at.timestamp() for snapshot in snapshots]
+        ys = [float(snapshot.elo_score) for snapshot in snapshots]
+
+        return [
+            RatingHistoryPoint(
+                recorded_at=snapshots[i].recorded_at,
+                elo_score=snapshots[i].elo_score,
+                elo_ci=snapshots[i].elo_ci,
+                vote_count=snapshots[i].vote_count,
+            )
+            for i in lttb_indices(xs, ys, max_points)
+        ]
+
+    async def get_pairwise_matrix(
+        self,
+        model_ids: Optional[List[str]] = None,
+        min_battles: int = 0,
+    ) -> PairwiseMatrixResponse:
+        """
+        Get dense head-to-head win/battle matrices
+
+        Counts come from model_pairwise_stats (maintained by worker), so this
+        never scans the votes table.
+
+        Args:
+            model_ids: Optional list of model IDs to include
+            min_battles: Drop models with fewer total battles (within the selection)
+
+        Returns:
+            PairwiseMatrixResponse with models sorted by model_id
+        """
+        pairs = await self.pairwise_stats_repo.get_pairs(model_ids)
+        models, win_count, battle_count = self._build_pairwise_matrices(pairs)
+
+        # Drop models below the battle threshold (row sums = total battles)
+        if min_battles > 0 and models:
+            keep = battle_count.sum(axis=1) >= min_battles
+            models = [model for model, kept in zip(models, keep) if kept]
+            win_count = win_count[np.ix_(keep, keep)]
+            battle_count = battle_count[np.ix_(keep, keep)]
+
+        win_rate = np.divide(
+            win_count,
+            battle_count,
+            out=np.full(battle_count.shape, np.nan),
+            where=battle_count > 0,
+        )
+
+        return PairwiseMatrixResponse(
+            models=models,
+            win_count=win_count.tolist(),
+            battle_count=battle_count.tolist(),
+            win_rate=[
+                [None if np.isnan(rate) else round(float(rate), 4) for rate in row]
+                for row in win_rate
+            ],
+        )
+
+    def _build_pairwise_matrices(
+        self,
+        pairs: List[ModelPairwiseStats],
+    ) -> tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Scatter canonical pair counts into dense square matrices
+
+        Args:
+            pairs: Pair rows (model_a_id < model_b_id)
+
+        Returns:
+            Tuple of (sorted model IDs, win_count matrix, battle_count matrix)
+            where win_count[i, j] = wins of model i over model j
+        """
+        model_a = np.array([pair.model_a_id for pair in pairs], dtype=object)
+        model_b = np.array([pair.model_b_id for pair in pairs], dtype=object)
+        models, inverse = np.unique(np.concatenate([model_a, model_b]), return_inverse=True)
+        idx_a, idx_b = inverse[: len(pairs)], inverse[len(pairs) :]
+
+        counts = np.array(
+            [
+                (pair.a_win_count, pair.b_win_count, pair.tie_count, pair.both_bad_count)
+                for pair in pairs
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        a_wins, b_wins = counts[:, 0], counts[:, 1]
+        totals = counts.sum(axis=1)
+
+        size = len(models)
+        win_count = np.zeros((size, size), dtype=np.int64)
+        battle_count = np.zeros((size, size), dtype=np.int64)
+        np.add.at(win_count, (idx_a, idx_b), a_wins)
+        np.add.at(win_count, (idx_b, idx_a), b_wins)
+        np.add.at(battle_count, (idx_a, idx_b), totals)
+        np.add.at(battle_count, (idx_b, idx_a), totals)
+
+        return [str(model) for model in models], win_count, battle_count
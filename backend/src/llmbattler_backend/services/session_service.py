@@ -5,15 +5,16 @@ Session and battle business logic service
 import asyncio
 import logging
 import random
-import uuid
 from datetime import UTC, datetime
 from typing import Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from llmbattler_shared.config import MULTI_ASSISTANT_SYSTEM_PROMPT
-from llmbattler_shared.models import Battle, Message, Session, Turn
+from llmbattler_shared.config import MULTI_ASSISTANT_SYSTEM_PROMPT, settings
+from llmbattler_shared.content import load_contents, store_contents
+from llmbattler_shared.ids import new_id
+from llmbattler_shared.models import Battle, Message, Session, Turn, Vote
 
 from ..repositories import BattleRepository, SessionRepository, VoteRepository
 from .llm_client import get_llm_client
@@ -23,6 +24,47 @@ from .model_service import get_model_service
 logger = logging.getLogger(__name__)
 
 
+async def _next_session_seq(db: AsyncSession, session_id: str) -> int:
+    """
+    First free session_seq of a session
+
+    Continues after the highest existing seq rather than counting messages:
+    retention may have purged an abandoned battle's messages from the middle
+    of the session.
+
+    Args:
+        db: Database session
+        session_id: Session ID
+
+    Returns:
+        int: max(session_seq) + 1, 0 for a session without messages
+    """
+    result = await db.execute(
+        select(func.coalesce(func.max(Message.session_seq) + 1, 0)).where(
+            Message.session_id == session_id
+        )
+    )
+    return result.scalar_one()
+
+
+async def _offload_bodies(db: AsyncSession, turn: Turn, messages: List[Message]) -> None:
+    """
+    Move a turn's prompt and responses to content_blobs (settings.content_offload)
+
+    Args:
+        db: Database session (caller commits)
+        turn: New turn (user_input is replaced by user_input_hash)
+        messages: Its new messages (content is replaced by content_hash)
+    """
+    if not settings.content_offload:
+        return
+    bodies = [message for message in messages if message.content is not None]
+    hashes = await store_contents(db, [turn.user_input] + [m.content for m in bodies])
+    turn.user_input_hash, turn.user_input = hashes[0], None
+    for message, key in zip(bodies, hashes[1:]):
+        message.content_hash, message.content = key, None
+
+
 async def get_session_messages(
     db: AsyncSession,
     session_id: str,
@@ -58,37 +100,52 @@ async def get_session_messages(
     # Start with system prompt
     messages = [{"role": "system", "content": MULTI_ASSISTANT_SYSTEM_PROMPT}]
 
-    # Fetch all messages for the session, sorted by ordering fields
+    # Runs on every new battle and follow-up: select only the columns used and
+    # read plain rows (no ORM objects, identity map or JSON columns)
     result = await db.execute(
-        select(Message)
-        .filter(Message.session_id == session_id)
+        select(Message.turn_id, Message.content, Message.content_hash)
+        .where(Message.session_id == session_id)
         .order_by(
             Message.battle_seq_in_session,
             Message.turn_seq,
             Message.seq_in_turn,
         )
     )
-    all_messages = result.scalars().all()
+    message_rows = result.all()
 
-    # Fetch all turns for the session to get user inputs
-    result = await db.execute(select(Turn).filter(Turn.session_id == session_id).order_by(Turn.seq))
-    turns = result.scalars().all()
+    # turn_id -> user_input mapping
+    result = await db.execute(
+        select(Turn.turn_id, Turn.user_input, Turn.user_input_hash).where(
+            Turn.session_id == session_id
+        )
+    )
+    turn_rows = result.all()
 
-    # Create turn_id -> user_input mapping
-    turn_map = {turn.turn_id: turn.user_input for turn in turns}
+    # Offloaded bodies (content_offload): one lookup for the whole session
+    bodies = await load_contents(
+        db,
+        [row.content_hash for row in message_rows if row.content is None]
+        + [row.user_input_hash for row in turn_rows if row.user_input is None],
+    )
+    turn_map = {
+        turn_id: user_input if user_input is not None else bodies.get(user_input_hash)
+        for turn_id, user_input, user_input_hash in turn_rows
+    }
 
     # Assemble conversation
     current_turn_id = None
-    for message in all_messages:
+    for turn_id, content, content_hash in message_rows:
+        if content is None:
+            content = bodies.get(content_hash)
         # Add user message when turn changes
-        if message.turn_id != current_turn_id:
-            current_turn_id = message.turn_id
-            user_input = turn_map.get(current_turn_id)
+        if turn_id != current_turn_id:
+            current_turn_id = turn_id
+            user_input = turn_map.get(turn_id)
             if user_input:
                 messages.append({"role": "user", "content": user_input})
 
         # Add assistant message
-        messages.append({"role": "assistant", "content": message.content})
+        messages.append({"role": "assistant", "content": content})
 
     return messages
 
@@ -126,7 +183,7 @@ async def create_session_with_battle(
     battle_repo = BattleRepository(db)
 
     # 1. Create session
-    session_id = f"session_{uuid.uuid4().hex[:12]}"
+    session_id = new_id("session")
     session = Session(
         session_id=session_id,
         title=prompt[:200],  # Use first 200 chars as title
@@ -175,7 +232,7 @@ async def create_session_with_battle(
         raise Exception(f"Failed to get LLM responses: {str(e)}")
 
     # 5. Create battle
-    battle_id = f"battle_{uuid.uuid4().hex[:12]}"
+    battle_id = new_id("battle")
 
     battle = Battle(
         battle_id=battle_id,
@@ -190,7 +247,7 @@ async def create_session_with_battle(
     battle = await battle_repo.create(battle)
 
     # 6. Create Turn record
-    turn_id = f"turn_{uuid.uuid4().hex[:12]}"
+    turn_id = new_id("turn")
     turn = Turn(
         turn_id=turn_id,
         session_id=session_id,
@@ -204,7 +261,7 @@ async def create_session_with_battle(
 
     # 7. Create Message records
     left_message = Message(
-        message_id=f"msg_{uuid.uuid4().hex[:12]}",
+        message_id=new_id("msg"),
         turn_id=turn_id,
         session_id=session_id,
         battle_id=battle_id,
@@ -219,7 +276,7 @@ async def create_session_with_battle(
     db.add(left_message)
 
     right_message = Message(
-        message_id=f"msg_{uuid.uuid4().hex[:12]}",
+        message_id=new_id("msg"),
         turn_id=turn_id,
         session_id=session_id,
         battle_id=battle_id,
@@ -232,6 +289,7 @@ async def create_session_with_battle(
         created_at=datetime.now(UTC),
     )
     db.add(right_message)
+    await _offload_bodies(db, turn, [left_message, right_message])
 
     # Commit session, battle, turn, and messages
     await db.commit()
@@ -306,11 +364,12 @@ async def create_battle_in_session(
     # 3. Get session-wide history and determine seq_in_session
     session_history = await get_session_messages(db, session_id)
 
-    # Count existing battles to determine seq_in_session
-    existing_battles = await battle_repo.get_by_session_id(session_id)
-    battle_seq = len(existing_battles)
+    # Next seq_in_session after the newest battle (not a count: the worker's
+    # retention job may have purged abandoned battles)
+    latest_battles = await battle_repo.get_by_session_id(session_id, limit=1)
+    battle_seq = latest_battles[0].seq_in_session + 1 if latest_battles else 0
 
-    logger.info(f"Session has {battle_seq} existing battles, new battle will be #{battle_seq}")
+    logger.info(f"New battle in session {session_id} will be #{battle_seq}")
 
     # 4. Select 2 NEW random models
     model_service = get_model_service()
@@ -352,7 +411,7 @@ async def create_battle_in_session(
         raise Exception(f"Failed to get LLM responses: {str(e)}")
 
     # 6. Create battle
-    battle_id = f"battle_{uuid.uuid4().hex[:12]}"
+    battle_id = new_id("battle")
 
     battle = Battle(
         battle_id=battle_id,
@@ -367,15 +426,10 @@ async def create_battle_in_session(
     battle = await battle_repo.create(battle)
 
     # 7. Calculate session_seq for new messages
-    # Count existing messages in the session
-    existing_message_count_result = await db.execute(
-        select(Message).filter(Message.session_id == session_id)
-    )
-    existing_messages = existing_message_count_result.scalars().all()
-    session_seq_start = len(existing_messages)
+    session_seq_start = await _next_session_seq(db, session_id)
 
     # 8. Create Turn record
-    turn_id = f"turn_{uuid.uuid4().hex[:12]}"
+    turn_id = new_id("turn")
     turn = Turn(
         turn_id=turn_id,
         session_id=session_id,
@@ -389,7 +443,7 @@ async def create_battle_in_session(
 
     # 9. Create Message records
     left_message = Message(
-        message_id=f"msg_{uuid.uuid4().hex[:12]}",
+        message_id=new_id("msg"),
         turn_id=turn_id,
         session_id=session_id,
         battle_id=battle_id,
@@ -404,7 +458,7 @@ async def create_battle_in_session(
     db.add(left_message)
 
     right_message = Message(
-        message_id=f"msg_{uuid.uuid4().hex[:12]}",
+        message_id=new_id("msg"),
         turn_id=turn_id,
         session_id=session_id,
         battle_id=battle_id,
@@ -417,6 +471,7 @@ async def create_battle_in_session(
         created_at=datetime.now(UTC),
     )
     db.add(right_message)
+    await _offload_bodies(db, turn, [left_message, right_message])
 
     # Commit session update, battle, turn, and messages
     await db.commit()
@@ -487,8 +542,10 @@ async def add_follow_up_message(
         raise ValueError(f"Cannot add message to battle with status: {battle.status}")
 
     # Count turns in this battle
-    turn_count_result = await db.execute(select(Turn).filter(Turn.battle_id == battle_id))
-    turn_count = len(turn_count_result.scalars().all())
+    turn_count_result = await db.execute(
+        select(func.count()).select_from(Turn).where(Turn.battle_id == battle_id)
+    )
+    turn_count = turn_count_result.scalar_one()
 
     logger.info(f"Battle found: {battle_id}, current turns: {turn_count}")
 
@@ -527,14 +584,10 @@ async def add_follow_up_message(
         raise Exception(f"Failed to get LLM responses: {str(e)}")
 
     # 6. Calculate session_seq for new messages
-    existing_message_count_result = await db.execute(
-        select(Message).filter(Message.session_id == battle.session_id)
-    )
-    existing_messages = existing_message_count_result.scalars().all()
-    session_seq_start = len(existing_messages)
+    session_seq_start = await _next_session_seq(db, battle.session_id)
 
     # 7. Create Turn record
-    turn_id = f"turn_{uuid.uuid4().hex[:12]}"
+    turn_id = new_id("turn")
     turn = Turn(
         turn_id=turn_id,
         session_id=battle.session_id,
@@ -548,7 +601,7 @@ async def add_follow_up_message(
 
     # 8. Create Message records
     left_message = Message(
-        message_id=f"msg_{uuid.uuid4().hex[:12]}",
+        message_id=new_id("msg"),
         turn_id=turn_id,
         session_id=battle.session_id,
         battle_id=battle_id,
@@ -563,7 +616,7 @@ async def add_follow_up_message(
     db.add(left_message)
 
     right_message = Message(
-        message_id=f"msg_{uuid.uuid4().hex[:12]}",
+        message_id=new_id("msg"),
         turn_id=turn_id,
         session_id=battle.session_id,
         battle_id=battle_id,
@@ -576,6 +629,7 @@ async def add_follow_up_message(
         created_at=datetime.now(UTC),
     )
     db.add(right_message)
+    await _offload_bodies(db, turn, [left_message, right_message])
 
     # 9. Update battle updated_at
     battle.updated_at = datetime.now(UTC)
@@ -622,8 +676,9 @@ async def vote_on_battle(
 
     Transaction:
     1. Get battle (check exists and ongoing)
-    2. Create vote record with denormalized model IDs
-    3. Update battle status to 'voted'
+    2. Update battle status to 'voted' (conditional UPDATE: one vote per battle)
+    3. Create vote record with denormalized model IDs (and NOTIFY the worker,
+       delivered on commit)
     4. Update session last_active_at timestamp
     5. Return vote confirmation with revealed models
 
@@ -653,8 +708,15 @@ async def vote_on_battle(
     if battle.status != "ongoing":
         raise ValueError(f"Battle has already been voted: {battle_id}")
 
-    # 2. Create vote record with denormalized model IDs
-    vote_id = f"vote_{uuid.uuid4().hex[:12]}"
+    # 2. Claim the battle before writing the vote: votes.battle_id is only unique
+    # together with voted_at (partitioned table), so this UPDATE is the guard
+    # against a concurrent vote (the status read above may already be stale)
+    if not await battle_repo.mark_voted(battle_id):
+        raise ValueError(f"Battle has already been voted: {battle_id}")
+    logger.info(f"Battle status updated to 'voted': {battle_id}")
+
+    # 3. Create vote record with denormalized model IDs
+    vote_id = new_id("vote")
     from llmbattler_shared.models import Vote
 
     vote_record = Vote(
@@ -669,13 +731,9 @@ async def vote_on_battle(
     )
 
     await vote_repo.create(vote_record)
+    await vote_repo.notify_pending(vote_id)
     logger.info(f"Vote record created: {vote_id}")
 
-    # 3. Update battle status to 'voted'
-    battle.status = "voted"
-    await battle_repo.update(battle)
-    logger.info(f"Battle status updated to 'voted': {battle_id}")
-
     # 4. Update session last_active_at
     session = await session_repo.get_by_session_id(battle.session_id)
     if session:
@@ -765,86 +823,120 @@ async def get_battles_by_session(
 
     # Initialize repositories
     session_repo = SessionRepository(db)
-    BattleRepository(db)
-    vote_repo = VoteRepository(db)
 
     # Verify session exists
     session = await session_repo.get_by_session_id(session_id)
     if not session:
         raise ValueError(f"Session not found: {session_id}")
 
-    # Fetch all battles, turns and messages for the session (efficient: 3 queries)
+    # Fetch battles, turns, messages and votes for the session (4 queries), selecting
+    # only the columns the response uses as plain rows (no ORM objects)
     battles_result = await db.execute(
-        select(Battle).filter(Battle.session_id == session_id).order_by(Battle.seq_in_session)
+        select(
+            Battle.battle_id,
+            Battle.left_model_id,
+            Battle.right_model_id,
+            Battle.status,
+            Battle.created_at,
+        )
+        .where(Battle.session_id == session_id)
+        .order_by(Battle.seq_in_session)
     )
-    battles = battles_result.scalars().all()
+    battles = battles_result.all()
 
     logger.info(f"Found {len(battles)} battles for session {session_id}")
 
     turns_result = await db.execute(
-        select(Turn).filter(Turn.session_id == session_id).order_by(Turn.seq)
+        select(
+            Turn.turn_id,
+            Turn.battle_id,
+            Turn.user_input,
+            Turn.user_input_hash,
+            Turn.created_at,
+        )
+        .where(Turn.session_id == session_id)
+        .order_by(Turn.battle_seq_in_session, Turn.seq)
     )
-    turns = turns_result.scalars().all()
+    turns = turns_result.all()
 
+    # Messages come back in seq_in_turn order within each turn
     messages_result = await db.execute(
-        select(Message)
-        .filter(Message.session_id == session_id)
+        select(
+            Message.turn_id,
+            Message.content,
+            Message.content_hash,
+            Message.side,
+            Message.created_at,
+        )
+        .where(Message.session_id == session_id)
         .order_by(
             Message.battle_seq_in_session,
             Message.turn_seq,
             Message.seq_in_turn,
         )
     )
-    messages = messages_result.scalars().all()
+    message_rows = messages_result.all()
+
+    # Offloaded bodies (content_offload): one lookup for the whole session
+    bodies = await load_contents(
+        db,
+        [row.content_hash for row in message_rows if row.content is None]
+        + [row.user_input_hash for row in turns if row.user_input is None],
+    )
+
+    messages_by_turn: Dict[str, List[Dict]] = {}
+    for turn_id, content, content_hash, side, created_at in message_rows:
+        messages_by_turn.setdefault(turn_id, []).append(
+            {
+                "role": "assistant",
+                "content": content if content is not None else bodies.get(content_hash),
+                "position": side,
+                "timestamp": created_at.isoformat(),
+            }
+        )
+
+    voted_battle_ids = [battle.battle_id for battle in battles if battle.status == "voted"]
+    votes: Dict[str, str] = {}
+    if voted_battle_ids:
+        votes_result = await db.execute(
+            select(Vote.battle_id, Vote.vote).where(Vote.battle_id.in_(voted_battle_ids))
+        )
+        votes = dict(votes_result.all())
 
     # Group conversations by battle_id
     battle_conversations: Dict[str, List[Dict]] = {}
 
-    for turn in turns:
-        if turn.battle_id not in battle_conversations:
-            battle_conversations[turn.battle_id] = []
+    for turn_id, battle_id, user_input, user_input_hash, created_at in turns:
+        conversation = battle_conversations.setdefault(battle_id, [])
+        if user_input is None:
+            user_input = bodies.get(user_input_hash)
 
         # Add user message
-        battle_conversations[turn.battle_id].append(
+        conversation.append(
             {
                 "role": "user",
-                "content": turn.user_input,
-                "timestamp": turn.created_at.isoformat(),
+                "content": user_input,
+                "timestamp": created_at.isoformat(),
             }
         )
 
         # Add assistant messages for this turn
-        turn_messages = [m for m in messages if m.turn_id == turn.turn_id]
-        for msg in sorted(turn_messages, key=lambda m: m.seq_in_turn):
-            battle_conversations[turn.battle_id].append(
-                {
-                    "role": "assistant",
-                    "content": msg.content,
-                    "position": msg.side,
-                    "timestamp": msg.created_at.isoformat(),
-                }
-            )
+        conversation.extend(messages_by_turn.get(turn_id, []))
 
     # Convert to response format with vote information
     battle_items = []
     for battle in battles:
-        battle_item = {
-            "battle_id": battle.battle_id,
-            "left_model_id": battle.left_model_id,
-            "right_model_id": battle.right_model_id,
-            "conversation": battle_conversations.get(battle.battle_id, []),
-            "status": battle.status,
-            "vote": None,
-            "created_at": battle.created_at,
-        }
-
-        # If battle is voted, get vote information
-        if battle.status == "voted":
-            vote = await vote_repo.get_by_battle_id(battle.battle_id)
-            if vote:
-                battle_item["vote"] = vote.vote
-
-        battle_items.append(battle_item)
+        battle_items.append(
+            {
+                "battle_id": battle.battle_id,
+                "left_model_id": battle.left_model_id,
+                "right_model_id": battle.right_model_id,
+                "conversation": battle_conversations.get(battle.battle_id, []),
+                "status": battle.status,
+                "vote": votes.get(battle.battle_id),
+                "created_at": battle.created_at,
+            }
+        )
 
     return {
         "session_id": session_id,
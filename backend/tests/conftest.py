@@ -110,9 +110,10 @@ async def client():
             finally:
                 await session.close()
 
-    from llmbattler_backend.database import get_db
+    from llmbattler_backend.database import get_db, get_read_db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     # Create test client
     with TestClient(app) as test_client:
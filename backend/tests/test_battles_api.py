@@ -5,9 +5,17 @@ Tests for battle API endpoints
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, patch
 
+import pytest
+from conftest import test_async_session_maker as async_session_maker
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 
-from llmbattler_shared.models import Battle
+from llmbattler_backend.repositories.battle_repository import BattleRepository
+from llmbattler_backend.services.session_service import (
+    create_session_with_battle,
+    vote_on_battle,
+)
+from llmbattler_shared.models import Battle, Vote
 
 
 def test_add_follow_up_message_success(client: TestClient):
@@ -301,3 +309,34 @@ def test_vote_on_battle_already_voted(client: TestClient):
     assert response.status_code == 400
     detail = response.json()["detail"].lower()
     assert ("already" in detail and "voted" in detail) or "been voted" in detail
+
+
+@pytest.mark.asyncio
+async def test_vote_on_battle_concurrent_votes_record_one(db):
+    """
+    Test two votes racing on the same battle record exactly one vote
+
+    Scenario:
+    1. Two requests both read the battle while it is still ongoing
+    2. The first vote commits
+    3. The second request, acting on its stale read, is rejected
+    """
+    # Arrange: A second request has already read the battle as ongoing
+    created = await create_session_with_battle("Who wins the race?", db)
+    await db.commit()
+    battle_id = created["battle_id"]
+
+    async with async_session_maker() as other:
+        stale_battle = await BattleRepository(other).get_by_battle_id(battle_id)
+        assert stale_battle.status == "ongoing"
+
+        # Act
+        await vote_on_battle(battle_id, "left_better", db)
+        await db.commit()
+        with pytest.raises(ValueError, match="already been voted"):
+            await vote_on_battle(battle_id, "right_better", other)
+        await other.rollback()
+
+    # Assert
+    votes = (await db.execute(select(Vote.vote).where(Vote.battle_id == battle_id))).all()
+    assert votes == [("left_better",)]
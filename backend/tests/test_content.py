@@ -0,0 +1,134 @@
+"""
+Tests for offloaded message bodies (content_blobs)
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from llmbattler_backend.services.session_service import (
+    create_session_with_battle,
+    get_battles_by_session,
+    get_session_messages,
+)
+from llmbattler_shared import content
+from llmbattler_shared.config import settings
+from llmbattler_shared.content import (
+    content_hash,
+    decode_body,
+    encode_body,
+    load_contents,
+    store_contents,
+)
+from llmbattler_shared.models import ContentBlob, Message, Turn
+
+
+def test_long_bodies_are_compressed():
+    """Test bodies above the threshold are zlib-compressed and round-trip"""
+    # Arrange
+    text = "An arena answer that repeats itself. " * 50
+
+    # Act
+    body, compression = encode_body(text)
+
+    # Assert
+    assert compression == "zlib"
+    assert len(body) < len(text)
+    assert decode_body(body, compression) == text
+
+
+def test_short_bodies_are_stored_as_is():
+    """Test short bodies skip compression (no gain below the threshold)"""
+    # Arrange
+    text = "Hi! 👋"
+
+    # Act
+    body, compression = encode_body(text)
+
+    # Assert
+    assert len(text.encode("utf-8")) < content.COMPRESS_MIN_BYTES
+    assert (body, compression) == (text.encode("utf-8"), "none")
+    assert decode_body(body, compression) == text
+    with pytest.raises(ValueError):
+        decode_body(body, "lz4")
+
+
+@pytest.mark.asyncio
+async def test_store_deduplicates_by_hash(db):
+    """Test identical texts are stored once, within a call and across calls"""
+    # Arrange
+    prompt = "What is the capital of France?"
+
+    # Act
+    first = await store_contents(db, [prompt, prompt, "Paris."])
+    second = await store_contents(db, [prompt])
+    await db.commit()
+
+    # Assert
+    assert first == [content_hash(prompt), content_hash(prompt), content_hash("Paris.")]
+    assert second == [content_hash(prompt)]
+    count = (await db.execute(select(func.count()).select_from(ContentBlob))).scalar_one()
+    assert count == 2
+    texts = await load_contents(db, first + [None, "missing"])
+    assert texts == {content_hash(prompt): prompt, content_hash("Paris."): "Paris."}
+
+
+@pytest.mark.asyncio
+async def test_reusing_old_blob_refreshes_created_at(db):
+    """Test a writer reusing an old blob renews it (keeps it out of the orphan sweep)"""
+    # Arrange: One blob stored long ago, one just stored
+    [old_hash, fresh_hash] = await store_contents(db, ["old prompt", "fresh prompt"])
+    long_ago = datetime.now(UTC) - timedelta(days=30)
+    await db.execute(
+        update(ContentBlob).where(ContentBlob.content_hash == old_hash).values(created_at=long_ago)
+    )
+    await db.commit()
+    fresh_at = (
+        await db.execute(
+            select(ContentBlob.created_at).where(ContentBlob.content_hash == fresh_hash)
+        )
+    ).scalar_one()
+
+    # Act
+    await store_contents(db, ["old prompt", "fresh prompt"])
+    await db.commit()
+
+    # Assert: Old blob renewed (body untouched), recent blob left alone
+    rows = dict((await db.execute(select(ContentBlob.content_hash, ContentBlob.created_at))).all())
+    assert rows[old_hash].replace(tzinfo=UTC) > datetime.now(UTC) - content.REUSE_REFRESH
+    assert rows[fresh_hash] == fresh_at
+    assert (await load_contents(db, [old_hash])) == {old_hash: "old prompt"}
+
+
+@pytest.mark.asyncio
+async def test_offloaded_conversations_read_back(db, monkeypatch):
+    """Test offloaded turns/messages keep only hashes and read back in full"""
+    # Arrange
+    monkeypatch.setattr(settings, "content_offload", True)
+    prompt = "Explain recursion."
+
+    # Act
+    first = await create_session_with_battle(prompt, db)
+    await create_session_with_battle(prompt, db)
+
+    # Assert: bodies moved out of turns/messages, the shared prompt stored once
+    turns = (await db.execute(select(Turn.user_input, Turn.user_input_hash))).all()
+    assert turns == [(None, content_hash(prompt))] * 2
+    messages = (await db.execute(select(Message.content, Message.content_hash))).all()
+    assert all(text is None and key is not None for text, key in messages)
+    prompt_blobs = await db.execute(
+        select(func.count())
+        .select_from(ContentBlob)
+        .where(ContentBlob.content_hash == content_hash(prompt))
+    )
+    assert prompt_blobs.scalar_one() == 1
+
+    history = await get_battles_by_session(first["session_id"], db)
+    conversation = history["battles"][0]["conversation"]
+    assert conversation[0]["content"] == prompt
+    assert [m["content"] for m in conversation[1:]] == [
+        response["text"] for response in first["responses"]
+    ]
+    context = await get_session_messages(db, first["session_id"])
+    assert [m["content"] for m in context[1:]] == [m["content"] for m in conversation]
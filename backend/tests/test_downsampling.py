@@ -0,0 +1,53 @@
+"""
+Tests for time-series downsampling helpers
+"""
+
+from llmbattler_backend.services.downsampling import lttb_indices
+
+
+def test_lttb_keeps_all_points_below_threshold():
+    """Test series shorter than threshold is returned unchanged"""
+    # Act
+    indices = lttb_indices([0, 1, 2], [1500, 1510, 1505], 10)
+
+    # Assert
+    assert indices == [0, 1, 2]
+
+
+def test_lttb_reduces_to_threshold_and_keeps_endpoints():
+    """Test long series is reduced to exactly threshold points"""
+    # Arrange
+    xs = list(range(1000))
+    ys = [1500 + (x % 13) for x in xs]
+
+    # Act
+    indices = lttb_indices(xs, ys, 50)
+
+    # Assert
+    assert len(indices) == 50
+    assert indices[0] == 0
+    assert indices[-1] == 999
+    assert indices == sorted(indices)
+
+
+def test_lttb_preserves_spike():
+    """Test a single spike survives downsampling"""
+    # Arrange
+    xs = list(range(100))
+    ys = [1500.0] * 100
+    ys[42] = 1800.0
+
+    # Act
+    indices = lttb_indices(xs, ys, 10)
+
+    # Assert
+    assert 42 in indices
+
+
+def test_lttb_two_points():
+    """Test threshold of 2 keeps only first and last points"""
+    # Act
+    indices = lttb_indices([0, 1, 2, 3], [1, 2, 3, 4], 2)
+
+    # Assert
+    assert indices == [0, 3]
@@ -0,0 +1,67 @@
+"""
+Tests for time-ordered identifiers
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from llmbattler_shared import ids
+from llmbattler_shared.ids import ULID_LENGTH, id_timestamp, new_id
+
+
+def test_new_id_keeps_prefix_and_fits_columns():
+    """Test IDs are prefix + ULID and fit the 50-character *_id columns"""
+    # Act
+    session_id = new_id("session")
+
+    # Assert
+    prefix, value = session_id.split("_")
+    assert prefix == "session"
+    assert len(value) == ULID_LENGTH
+    assert set(value) <= set(ids.ALPHABET)
+    assert len(session_id) <= 50
+
+
+def test_ids_sort_by_creation_time():
+    """Test string order matches creation order, within and across milliseconds"""
+    # Act
+    created = [new_id("msg") for _ in range(5000)]
+
+    # Assert
+    assert created == sorted(created)
+    assert len(set(created)) == len(created)
+
+
+def test_same_millisecond_increments(monkeypatch):
+    """Test IDs from a frozen (or stepped back) clock stay strictly increasing"""
+    # Arrange
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    first = new_id("vote")
+
+    # Act
+    second = new_id("vote")
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_600_000_000_000_000_000)
+    third = new_id("vote")
+
+    # Assert
+    assert first < second < third
+
+
+def test_id_timestamp_decodes_creation_time():
+    """Test the creation time can be read back from an ID"""
+    # Arrange
+    before = datetime.now(UTC) - timedelta(milliseconds=1)
+
+    # Act
+    created_at = id_timestamp(new_id("battle"))
+
+    # Assert
+    assert before <= created_at <= datetime.now(UTC) + timedelta(seconds=1)
+
+
+def test_id_timestamp_rejects_legacy_ids():
+    """Test legacy random IDs are reported as carrying no timestamp"""
+    # Act & Assert
+    with pytest.raises(ValueError, match="Not a time-ordered ID"):
+        id_timestamp("battle_3f9a0c1b2d4e")
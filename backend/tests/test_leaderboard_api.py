@@ -2,15 +2,25 @@
 Tests for leaderboard API endpoints
 """
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
+from llmbattler_backend.services.leaderboard_service import LeaderboardService
+from llmbattler_shared.models import (
+    ModelPairwiseStats,
+    ModelRatingHistory,
+    ModelSegmentStats,
+    ModelStats,
+)
 from llmbattler_shared.schemas import (
     LeaderboardMetadata,
     LeaderboardResponse,
+    ModelRatingSeries,
     ModelStatsResponse,
+    RatingHistoryPoint,
+    RatingHistoryResponse,
 )
 
 
@@ -355,3 +365,313 @@ def test_get_leaderboard_metadata_accuracy(client: TestClient):
     assert "last_updated" in metadata
     # Verify last_updated is a valid datetime string
     datetime.fromisoformat(metadata["last_updated"].replace("Z", "+00:00"))
+
+
+def test_get_leaderboard_history_success(client: TestClient):
+    """
+    Test rating history retrieval
+
+    Scenario:
+    1. User requests rating history with points=50
+    2. Service returns downsampled series
+    3. Response contains one series per model
+    """
+    # Arrange
+    now = datetime.now(UTC)
+    mock_history = RatingHistoryResponse(
+        series=[
+            ModelRatingSeries(
+                model_id="gpt-4o",
+                points=[
+                    RatingHistoryPoint(
+                        recorded_at=now - timedelta(hours=1),
+                        elo_score=1510,
+                        elo_ci=40.0,
+                        vote_count=10,
+                    ),
+                    RatingHistoryPoint(recorded_at=now, elo_score=1525, elo_ci=35.0, vote_count=14),
+                ],
+            )
+        ],
+        start=now - timedelta(days=30),
+        end=now,
+        max_points=50,
+    )
+
+    with patch(
+        "llmbattler_backend.services.leaderboard_service.LeaderboardService.get_rating_history"
+    ) as mock_get_history:
+        mock_get_history.return_value = mock_history
+
+        # Act
+        response = client.get("/api/leaderboard/history?points=50&model_id=gpt-4o")
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["series"]) == 1
+    assert data["series"][0]["model_id"] == "gpt-4o"
+    assert [p["elo_score"] for p in data["series"][0]["points"]] == [1510, 1525]
+    assert mock_get_history.call_args.kwargs["max_points"] == 50
+    assert mock_get_history.call_args.kwargs["model_ids"] == ["gpt-4o"]
+
+
+def test_get_leaderboard_history_invalid_range(client: TestClient):
+    """Test rating history with start after end returns 400"""
+    # Act
+    response = client.get(
+        "/api/leaderboard/history?start=2025-02-01T00:00:00Z&end=2025-01-01T00:00:00Z"
+    )
+
+    # Assert
+    assert response.status_code == 400
+
+
+def test_get_leaderboard_history_invalid_points(client: TestClient):
+    """Test rating history with fewer than 2 points returns 422"""
+    # Act
+    response = client.get("/api/leaderboard/history?points=1")
+
+    # Assert
+    assert response.status_code == 422
+
+
+async def test_get_rating_history_downsamples_each_series(db):
+    """
+    Test service downsamples each model series independently
+
+    Scenario:
+    1. Two models have 100 hourly snapshots each
+    2. Service is asked for at most 10 points
+    3. Each series has 10 points, keeping the first and last snapshot
+    """
+    # Arrange
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for model_id in ["model-a", "model-b"]:
+        for hour in range(100):
+            db.add(
+                ModelRatingHistory(
+                    model_id=model_id,
+                    elo_score=1500 + (hour % 7) * 10,
+                    elo_ci=50.0,
+                    vote_count=hour,
+                    recorded_at=start + timedelta(hours=hour),
+                )
+            )
+    await db.commit()
+
+    # Act
+    service = LeaderboardService(db)
+    history = await service.get_rating_history(
+        start=start,
+        end=start + timedelta(days=30),
+        max_points=10,
+    )
+
+    # Assert
+    assert [s.model_id for s in history.series] == ["model-a", "model-b"]
+    for series in history.series:
+        assert len(series.points) == 10
+        assert series.points[0].vote_count == 0
+        assert series.points[-1].vote_count == 99
+
+
+async def test_get_rating_history_filters_models(db):
+    """Test service only returns requested models"""
+    # Arrange
+    recorded_at = datetime(2025, 1, 1, tzinfo=UTC)
+    for model_id in ["model-a", "model-b"]:
+        db.add(
+            ModelRatingHistory(
+                model_id=model_id,
+                elo_score=1500,
+                elo_ci=50.0,
+                vote_count=1,
+                recorded_at=recorded_at,
+            )
+        )
+    await db.commit()
+
+    # Act
+    service = LeaderboardService(db)
+    history = await service.get_rating_history(
+        start=recorded_at - timedelta(days=1),
+        end=recorded_at + timedelta(days=1),
+        max_points=10,
+        model_ids=["model-b"],
+    )
+
+    # Assert
+    assert [s.model_id for s in history.series] == ["model-b"]
+
+
+async def test_get_pairwise_matrix(db):
+    """
+    Test dense head-to-head matrix is built from canonical pair rows
+
+    Scenario:
+    1. model-a vs model-b: a won 3, b won 1, 1 tie
+    2. model-b vs model-c: b won 2
+    3. Matrix is symmetric in battle counts and mirrored in wins
+    """
+    # Arrange
+    db.add(
+        ModelPairwiseStats(
+            model_a_id="model-a", model_b_id="model-b", a_win_count=3, b_win_count=1, tie_count=1
+        )
+    )
+    db.add(ModelPairwiseStats(model_a_id="model-b", model_b_id="model-c", a_win_count=2))
+    await db.commit()
+
+    # Act
+    service = LeaderboardService(db)
+    matrix = await service.get_pairwise_matrix()
+
+    # Assert
+    assert matrix.models == ["model-a", "model-b", "model-c"]
+    assert matrix.battle_count == [[0, 5, 0], [5, 0, 2], [0, 2, 0]]
+    assert matrix.win_count == [[0, 3, 0], [1, 0, 2], [0, 0, 0]]
+    assert matrix.win_rate[0][1] == 0.6
+    assert matrix.win_rate[1][0] == 0.2
+    assert matrix.win_rate[1][2] == 1.0
+    assert matrix.win_rate[0][2] is None
+
+
+async def test_get_pairwise_matrix_filters(db):
+    """Test model_ids and min_battles filters"""
+    # Arrange
+    db.add(ModelPairwiseStats(model_a_id="model-a", model_b_id="model-b", a_win_count=10))
+    db.add(ModelPairwiseStats(model_a_id="model-a", model_b_id="model-c", a_win_count=1))
+    await db.commit()
+    service = LeaderboardService(db)
+
+    # Act
+    by_model = await service.get_pairwise_matrix(model_ids=["model-a", "model-c"])
+    by_battles = await service.get_pairwise_matrix(min_battles=5)
+
+    # Assert
+    assert by_model.models == ["model-a", "model-c"]
+    assert by_model.battle_count == [[0, 1], [1, 0]]
+    assert by_battles.models == ["model-a", "model-b"]
+    assert by_battles.battle_count == [[0, 10], [10, 0]]
+
+
+def test_get_leaderboard_matrix_empty(client: TestClient):
+    """Test matrix endpoint with no pairwise data returns empty matrices"""
+    # Act
+    response = client.get("/api/leaderboard/matrix")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"models": [], "win_count": [], "battle_count": [], "win_rate": []}
+
+
+def _model_stats(model_id: str, elo_score: int, vote_count: int, **kwargs) -> ModelStats:
+    """Build ModelStats row for leaderboard service tests"""
+    return ModelStats(
+        model_id=model_id,
+        elo_score=elo_score,
+        vote_count=vote_count,
+        win_rate=kwargs.get("win_rate", 0.5),
+        organization=kwargs.get("organization", "OpenAI"),
+        license=kwargs.get("license", "proprietary"),
+    )
+
+
+def test_get_leaderboard_passes_filters(client: TestClient):
+    """Test query parameters are forwarded to the service"""
+    # Arrange
+    mock_leaderboard = LeaderboardResponse(
+        leaderboard=[],
+        metadata=LeaderboardMetadata(
+            total_models=0,
+            total_votes=0,
+            last_updated=datetime.now(UTC),
+        ),
+    )
+
+    with patch(
+        "llmbattler_backend.services.leaderboard_service.LeaderboardService.get_leaderboard"
+    ) as mock_get_leaderboard:
+        mock_get_leaderboard.return_value = mock_leaderboard
+
+        # Act
+        response = client.get(
+            "/api/leaderboard?organization=Meta&license=open-source&min_votes=10&sort_by=win_rate"
+        )
+
+    # Assert
+    assert response.status_code == 200
+    assert mock_get_leaderboard.call_args.kwargs == {
+        "min_vote_count": 10,
+        "organization": "Meta",
+        "license": "open-source",
+        "sort_by": "win_rate",
+    }
+
+
+def test_get_leaderboard_invalid_sort_key(client: TestClient):
+    """Test unknown sort key returns 422"""
+    # Act
+    response = client.get("/api/leaderboard?sort_by=model_id")
+
+    # Assert
+    assert response.status_code == 422
+
+
+async def test_get_leaderboard_sort_keeps_elo_rank(db):
+    """Test sorting by vote_count keeps ranks fixed by ELO"""
+    # Arrange
+    db.add(_model_stats("model-a", elo_score=1600, vote_count=10))
+    db.add(_model_stats("model-b", elo_score=1500, vote_count=50))
+    db.add(_model_stats("model-c", elo_score=1550, vote_count=2))  # Below threshold
+    await db.commit()
+
+    # Act
+    service = LeaderboardService(db)
+    leaderboard = await service.get_leaderboard(min_vote_count=5, sort_by="vote_count")
+
+    # Assert
+    entries = leaderboard.leaderboard
+    assert [e.model_id for e in entries] == ["model-b", "model-a"]
+    assert [e.rank for e in entries] == [2, 1]
+    assert leaderboard.metadata.total_votes == 60
+
+
+async def test_get_leaderboard_segment_uses_segment_ratings(db):
+    """
+    Test segment filter ranks by segment ratings, not the global ranking
+
+    Scenario:
+    1. Globally model-a is ahead of model-b
+    2. Within the open-source segment model-b is ahead
+    3. license=open-source returns segment ratings and ranks
+    """
+    # Arrange
+    db.add(_model_stats("model-a", elo_score=1700, vote_count=100, license="open-source"))
+    db.add(_model_stats("model-b", elo_score=1600, vote_count=100, license="open-source"))
+    for model_id, elo_score in [("model-a", 1480), ("model-b", 1520)]:
+        db.add(
+            ModelSegmentStats(
+                segment_type="license",
+                segment_value="open-source",
+                model_id=model_id,
+                elo_score=elo_score,
+                vote_count=20,
+                organization="Meta",
+                license="open-source",
+            )
+        )
+    await db.commit()
+
+    # Act
+    service = LeaderboardService(db)
+    leaderboard = await service.get_leaderboard(min_vote_count=5, license="open-source")
+
+    # Assert
+    entries = leaderboard.leaderboard
+    assert [(e.model_id, e.elo_score, e.rank) for e in entries] == [
+        ("model-b", 1520, 1),
+        ("model-a", 1480, 2),
+    ]
+    assert leaderboard.metadata.total_votes == 40
@@ -10,3 +10,18 @@ def test_health_check(client):
     data = response.json()
     assert data["status"] == "healthy"
     assert data["service"] == "llmbattler-backend"
+
+
+def test_metrics_exposes_pool_metrics(client, monkeypatch):
+    """Test /metrics serves the database pool metrics as Prometheus text"""
+    from llmbattler_shared import pool_metrics
+
+    metrics = pool_metrics.PoolMetrics("backend")
+    metrics.observe_checkout(0.002, overflow=False)
+    monkeypatch.setitem(pool_metrics._metrics, "backend", metrics)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'llmbattler_db_pool_checkout_seconds_count{role="backend"} 1' in response.text
@@ -5,9 +5,17 @@ Tests for session and battle API endpoints
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, Mock, patch
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
 
 from llmbattler_backend.services.llm_client import LLMResponse
+from llmbattler_backend.services.session_service import (
+    add_follow_up_message,
+    create_battle_in_session,
+    create_session_with_battle,
+)
+from llmbattler_shared.models import Battle, Message, Turn
 
 
 def test_create_session_success(client: TestClient):
@@ -523,3 +531,41 @@ def test_get_session_battles_session_not_found(client: TestClient):
     # Assert
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_session_continues_after_battle_purge(db):
+    """
+    Test new messages get fresh session_seq values after retention purged a battle
+
+    Scenario:
+    1. Session has two battles (session_seq 0-1 and 2-3)
+    2. Retention purges the first battle (messages, turns, battle row)
+    3. Follow-up and new battle continue after the highest session_seq
+    """
+    # Arrange
+    created = await create_session_with_battle("First question", db)
+    session_id, purged_battle_id = created["session_id"], created["battle_id"]
+    second = await create_battle_in_session(session_id, "Second question", db)
+    for model, column in ((Message, Message.battle_id), (Turn, Turn.battle_id)):
+        await db.execute(delete(model).where(column == purged_battle_id))
+    await db.execute(delete(Battle).where(Battle.battle_id == purged_battle_id))
+    await db.commit()
+
+    # Act
+    await add_follow_up_message(second["battle_id"], "Follow-up", db)
+    await create_battle_in_session(session_id, "Third question", db)
+
+    # Assert: No session_seq reused
+    seqs = (
+        (
+            await db.execute(
+                select(Message.session_seq)
+                .where(Message.session_id == session_id)
+                .order_by(Message.session_seq)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert seqs == [2, 3, 4, 5, 6, 7]
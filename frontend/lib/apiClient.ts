@@ -2,6 +2,10 @@
  * API Client for llmbattler backend
  *
  * Provides a centralized HTTP client with error handling
+ *
+ * Requests include credentials: the backend answers writes with a short-lived
+ * read-your-writes cookie that pins the following reads to the primary
+ * database (see backend database.py).
  */
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
@@ -37,6 +41,7 @@ export const apiClient = {
       headers: {
         "Content-Type": "application/json",
       },
+      credentials: "include",
     });
 
     return await handleResponse<T>(response);
@@ -48,6 +53,7 @@ export const apiClient = {
       headers: {
         "Content-Type": "application/json",
       },
+      credentials: "include",
       body: data ? JSON.stringify(data) : undefined,
     });
 
@@ -60,6 +66,7 @@ export const apiClient = {
       headers: {
         "Content-Type": "application/json",
       },
+      credentials: "include",
       body: data ? JSON.stringify(data) : undefined,
     });
 
@@ -72,6 +79,7 @@ export const apiClient = {
       headers: {
         "Content-Type": "application/json",
       },
+      credentials: "include",
     });
 
     return await handleResponse<T>(response);
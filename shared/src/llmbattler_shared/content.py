@@ -0,0 +1,168 @@
+"""
+Offloaded message bodies (content_blobs)
+
+With settings.content_offload, prompts (Turn.user_input) and responses
+(Message.content) are stored once in content_blobs, keyed by the SHA-256 of
+their text, and turns/messages only keep the hash (user_input_hash,
+content_hash; the inline column stays NULL):
+
+- Rows of turns and messages stay small, so scans that only need ordering,
+  counts or ids never read through bodies.
+- Identical texts (the same prompt sent by many users, canned responses)
+  are stored once.
+- Bodies of COMPRESS_MIN_BYTES or more are zlib-compressed.
+
+Readers resolve both layouts: rows written inline (before offloading, or
+with it disabled) keep their text, offloaded rows are looked up by hash.
+Blobs are not deleted with the rows that reference them (several rows may
+share one). The worker's retention job sweeps blobs no turn or message
+references any more once they are ORPHAN_GRACE old (moving them to the
+archive schema along with archived rows, if one is configured). A writer
+reusing a blob older than REUSE_REFRESH refreshes its created_at, which
+keeps it out of a sweep running concurrently.
+"""
+
+import hashlib
+import zlib
+from datetime import UTC, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from .models import ContentBlob
+
+
+COMPRESS_MIN_BYTES = 256
+COMPRESS_LEVEL = 6
+
+# Hashes per lookup query (keeps IN lists within driver parameter limits)
+LOAD_CHUNK_SIZE = 500
+
+# Unreferenced blobs younger than this are never swept (in-flight writers)
+ORPHAN_GRACE = timedelta(days=1)
+# Reused blobs older than this get a fresh created_at (must be < ORPHAN_GRACE)
+REUSE_REFRESH = timedelta(hours=1)
+
+
+def content_hash(text: str) -> str:
+    """
+    Key of a body in content_blobs
+
+    Args:
+        text: Body text
+
+    Returns:
+        str: SHA-256 of the UTF-8 text, 64 hex characters
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_body(text: str) -> Tuple[bytes, str]:
+    """
+    Serialize a body, compressed when that pays off
+
+    Args:
+        text: Body text
+
+    Returns:
+        Tuple[bytes, str]: (stored bytes, compression: "zlib" or "none")
+    """
+    raw = text.encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(raw, COMPRESS_LEVEL)
+        if len(compressed) < len(raw):
+            return compressed, "zlib"
+    return raw, "none"
+
+
+def decode_body(body: bytes, compression: str) -> str:
+    """
+    Text of a stored body
+
+    Args:
+        body: Stored bytes
+        compression: "zlib" or "none"
+
+    Returns:
+        str: Body text
+
+    Raises:
+        ValueError: If the compression is unknown
+    """
+    if compression == "zlib":
+        return zlib.decompress(body).decode("utf-8")
+    if compression == "none":
+        return body.decode("utf-8")
+    raise ValueError(f"Unknown content compression: {compression}")
+
+
+async def store_contents(db: AsyncSession, texts: Iterable[str]) -> List[str]:
+    """
+    Store bodies that are not stored yet (caller commits)
+
+    Concurrent writers of the same text are fine: existing hashes keep their
+    body (ON CONFLICT DO UPDATE of created_at only). Existing blobs older
+    than REUSE_REFRESH get a fresh created_at; the conflicting row stays
+    locked until commit, so a concurrent orphan sweep cannot delete it.
+
+    Args:
+        db: Database session
+        texts: Body texts
+
+    Returns:
+        List[str]: Hash of each text, in input order
+    """
+    hashes = []
+    rows: Dict[str, Dict] = {}
+    for text in texts:
+        key = content_hash(text)
+        hashes.append(key)
+        if key not in rows:
+            body, compression = encode_body(text)
+            rows[key] = {
+                "content_hash": key,
+                "body": body,
+                "compression": compression,
+                "size": len(text.encode("utf-8")),
+                "created_at": datetime.now(UTC),
+            }
+    if rows:
+        insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        stmt = insert(ContentBlob).values(list(rows.values()))
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["content_hash"],
+                set_={"created_at": stmt.excluded.created_at},
+                where=ContentBlob.created_at < datetime.now(UTC) - REUSE_REFRESH,
+            )
+        )
+    return hashes
+
+
+async def load_contents(
+    db: Union[AsyncSession, AsyncConnection],
+    hashes: Iterable[Optional[str]],
+) -> Dict[str, str]:
+    """
+    Texts of stored bodies
+
+    Args:
+        db: Database session or connection
+        hashes: Body hashes (None entries, i.e. inline rows, are ignored)
+
+    Returns:
+        Dict[str, str]: hash -> text (missing hashes are left out)
+    """
+    keys = list({key for key in hashes if key is not None})
+    texts: Dict[str, str] = {}
+    for start in range(0, len(keys), LOAD_CHUNK_SIZE):
+        result = await db.execute(
+            select(ContentBlob.content_hash, ContentBlob.body, ContentBlob.compression).where(
+                ContentBlob.content_hash.in_(keys[start : start + LOAD_CHUNK_SIZE])
+            )
+        )
+        for key, body, compression in result:
+            texts[key] = decode_body(body, compression)
+    return texts
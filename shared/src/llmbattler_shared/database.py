@@ -3,18 +3,60 @@ Shared database connection and session management
 
 Provides database connections for both backend API and worker with appropriate
 connection pool configurations for each use case.
+
+Engines are created lazily, one per role ("backend", "worker", "replica") and
+process, on first use or by init(); dispose() closes them on shutdown. The
+"replica" role (backend reads, same pool sizes) connects to
+postgres_replica_uri.
+
+PostgreSQL pools are InstrumentedPool (see pool_metrics): checkout latency,
+overflow and timeouts are recorded per role. warm_up() pre-opens the pool at
+startup; dispose() waits for checked-out connections before closing.
+
+Read-only sessions (get_session_maker(role, readonly=True)) run on AUTOCOMMIT
+connections: no BEGIN/COMMIT round trips and no transaction held open while
+the handler runs. Each statement sees its own snapshot. Importing this
+module opens nothing, so CLI tools and tests only pay for the engine they use.
+
+Usage:
+    engine = init("backend")                   # at startup (optional, idempotent)
+    async with get_session_maker("backend")() as session:
+        ...
+    await warm_up("backend")                   # optional, after init
+    await dispose()                            # at shutdown
 """
 
-from typing import AsyncGenerator
+import os
+from typing import Any, AsyncGenerator, Dict, NamedTuple, Optional
 
+from llmbattler_shared import pool_metrics
 from llmbattler_shared.config import settings
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 
+# Engine roles and their pool configuration
+ROLES = ("backend", "worker", "replica")
+
+
+class _RoleEngine(NamedTuple):
+    """Engine of a role with its session makers"""
+
+    engine: AsyncEngine
+    session_maker: sessionmaker
+    readonly_session_maker: sessionmaker  # AUTOCOMMIT connections, never committed
+    pid: int  # Process that created the engine
+
+
+_engines: Dict[str, _RoleEngine] = {}
+
+
 def _create_engine_and_session_maker(
-    pool_size: int, max_overflow: int, pool_timeout: int | None = None
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: int | None = None,
+    uri: str | None = None,
 ):
     """
     Create async engine and session maker with specified pool configuration
@@ -23,19 +65,22 @@ def _create_engine_and_session_maker(
         pool_size: Number of connections to maintain in the pool
         max_overflow: Maximum overflow connections beyond pool_size
         pool_timeout: Timeout for getting connection from pool (optional)
+        uri: Database URL (default: settings.postgres_uri)
 
     Returns:
         Tuple of (engine, session_maker)
     """
+    uri = uri or settings.postgres_uri
+
     # Check if using SQLite (for tests)
-    is_sqlite = "sqlite" in settings.postgres_uri.lower()
+    is_sqlite = "sqlite" in uri.lower()
 
     if is_sqlite:
         # SQLite doesn't support pool configuration
         from sqlalchemy.pool import StaticPool
 
         engine = create_async_engine(
-            settings.postgres_uri,
+            uri,
             echo=False,
             connect_args={"check_same_thread": False},
             poolclass=StaticPool,
@@ -43,14 +88,28 @@ def _create_engine_and_session_maker(
     else:
         # PostgreSQL with pool configuration
         engine = create_async_engine(
-            settings.postgres_uri,
+            uri,
             echo=False,
             pool_size=pool_size,
             max_overflow=max_overflow,
             pool_timeout=pool_timeout,
+            poolclass=pool_metrics.InstrumentedPool,
         )
 
-    session_maker = sessionmaker(
+    return engine, _session_maker(engine)
+
+
+def _session_maker(engine: AsyncEngine) -> sessionmaker:
+    """
+    AsyncSession factory bound to an engine
+
+    Args:
+        engine: Engine (or an execution_options() copy of it)
+
+    Returns:
+        sessionmaker: Session factory
+    """
+    return sessionmaker(
         engine,
         class_=AsyncSession,
         expire_on_commit=False,
@@ -58,21 +117,147 @@ def _create_engine_and_session_maker(
         autoflush=False,
     )
 
-    return engine, session_maker
 
+def _pool_config(role: str) -> Dict[str, Any]:
+    """
+    Pool configuration of a role
+
+    Args:
+        role: "backend" (higher concurrency for API requests), "worker"
+              (lower concurrency for batch operations) or "replica" (backend
+              reads on postgres_replica_uri)
+
+    Returns:
+        Dict of _create_engine_and_session_maker keyword arguments
+
+    Raises:
+        ValueError: If role is unknown, or "replica" without postgres_replica_uri
+    """
+    if role == "replica":
+        if not settings.postgres_replica_uri:
+            raise ValueError("Replica role requires postgres_replica_uri")
+        return {
+            "pool_size": settings.postgres_pool_size,
+            "max_overflow": settings.postgres_max_overflow,
+            "uri": settings.postgres_replica_uri,
+        }
+    if role == "backend":
+        return {
+            "pool_size": settings.postgres_pool_size,
+            "max_overflow": settings.postgres_max_overflow,
+        }
+    if role == "worker":
+        return {
+            "pool_size": settings.worker_pool_size,
+            "max_overflow": settings.worker_max_overflow,
+            "pool_timeout": settings.worker_pool_timeout,
+        }
+    raise ValueError(f"Invalid database role: {role} (expected one of {ROLES})")
+
+
+def init(role: str, engine: Optional[AsyncEngine] = None) -> AsyncEngine:
+    """
+    Create the engine of a role if this process has none yet
+
+    A process forked after the engine was created gets its own engine; the
+    parent's pooled connections are left to the parent.
+
+    Args:
+        role: "backend", "worker" or "replica"
+        engine: Use this engine for the role instead (e.g. a test engine)
+
+    Returns:
+        AsyncEngine: Engine of the role
+
+    Raises:
+        ValueError: If role is unknown (or see _pool_config)
+    """
+    entry = _engines.get(role)
+    if engine is not None or entry is None or entry.pid != os.getpid():
+        if engine is None:
+            engine, _ = _create_engine_and_session_maker(**_pool_config(role))
+        pool_metrics.instrument(engine, role)
+        entry = _engines[role] = _RoleEngine(
+            engine=engine,
+            session_maker=_session_maker(engine),
+            readonly_session_maker=_session_maker(
+                engine.execution_options(isolation_level="AUTOCOMMIT")
+            ),
+            pid=os.getpid(),
+        )
+    return entry.engine
+
+
+def get_engine(role: str) -> AsyncEngine:
+    """
+    Engine of a role (created on first use)
+
+    Args:
+        role: "backend", "worker" or "replica"
+
+    Returns:
+        AsyncEngine: Engine of the role
+    """
+    init(role)
+    return _engines[role].engine
+
+
+def get_session_maker(role: str, readonly: bool = False) -> sessionmaker:
+    """
+    Session maker of a role (engine created on first use)
+
+    Args:
+        role: "backend", "worker" or "replica"
+        readonly: Sessions on AUTOCOMMIT connections, for reads that never commit
+
+    Returns:
+        sessionmaker: AsyncSession factory bound to the role's engine
+    """
+    init(role)
+    entry = _engines[role]
+    return entry.readonly_session_maker if readonly else entry.session_maker
+
+
+async def warm_up(role: str) -> int:
+    """
+    Open the role's pool_size connections ahead of the first requests
+
+    Failures are logged, not raised: the pool then connects on demand.
+
+    Args:
+        role: "backend", "worker" or "replica"
+
+    Returns:
+        int: Connections opened
+    """
+    return await pool_metrics.warm_up(get_engine(role), _pool_config(role)["pool_size"])
+
+
+async def dispose(role: Optional[str] = None, drain_seconds: float = 0.0) -> None:
+    """
+    Close pooled connections and forget the engine (recreated on next use)
+
+    Args:
+        role: Role to dispose, None for all roles
+        drain_seconds: Wait up to this long for checked-out connections to be
+                       returned first (in-flight queries finish)
+    """
+    for name in [role] if role is not None else list(_engines):
+        entry = _engines.pop(name, None)
+        if entry is not None and entry.pid == os.getpid():
+            if drain_seconds > 0:
+                await pool_metrics.drain(entry.engine, drain_seconds)
+            await entry.engine.dispose()
 
-# Backend database (higher concurrency for API requests)
-backend_engine, backend_session_maker = _create_engine_and_session_maker(
-    pool_size=settings.postgres_pool_size,
-    max_overflow=settings.postgres_max_overflow,
-)
 
-# Worker database (lower concurrency for batch operations)
-worker_engine, worker_session_maker = _create_engine_and_session_maker(
-    pool_size=settings.worker_pool_size,
-    max_overflow=settings.worker_max_overflow,
-    pool_timeout=settings.worker_pool_timeout,
-)
+def __getattr__(name: str) -> Any:
+    """Lazy module attributes backend_engine, backend_session_maker, worker_engine, ..."""
+    for role in ROLES:
+        if name == f"{role}_engine":
+            return get_engine(role)
+        if name == f"{role}_session_maker":
+            return get_session_maker(role)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def get_backend_db() -> AsyncGenerator[AsyncSession, None]:
@@ -87,7 +272,7 @@ async def get_backend_db() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession: Database session instance with auto commit/rollback
     """
-    async with backend_session_maker() as session:
+    async with get_session_maker("backend")() as session:
         try:
             yield session
             await session.commit()
@@ -110,7 +295,7 @@ async def get_worker_db() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession: Database session instance with auto commit/rollback
     """
-    async with worker_session_maker() as session:
+    async with get_session_maker("worker")() as session:
         try:
             yield session
             await session.commit()
@@ -128,7 +313,7 @@ async def create_db_and_tables():
     Note: In production, use Alembic migrations instead
     Uses backend_engine for table creation
     """
-    async with backend_engine.begin() as conn:
+    async with get_engine("backend").begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
@@ -138,5 +323,5 @@ async def drop_db_and_tables():
 
     Uses backend_engine for table deletion
     """
-    async with backend_engine.begin() as conn:
+    async with get_engine("backend").begin() as conn:
         await conn.run_sync(SQLModel.metadata.drop_all)
@@ -5,7 +5,7 @@ SQLModel models for PostgreSQL (shared between backend and worker)
 from datetime import UTC, datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy import JSON, DateTime
+from sqlalchemy import JSON, DateTime, Index, LargeBinary, UniqueConstraint, text
 from sqlmodel import Column, Field, SQLModel
 
 
@@ -42,23 +42,25 @@ class Battle(SQLModel, table=True):
     """
 
     __tablename__ = "battles"
+    __table_args__ = (
+        # Battles of a session in order: WHERE session_id ORDER BY seq_in_session
+        Index("ix_battles_session_id_seq", "session_id", "seq_in_session"),
+        # Ongoing battles, newest first: WHERE status ORDER BY created_at
+        Index("ix_battles_status_created_at", "status", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     battle_id: str = Field(unique=True, index=True, max_length=50)
-    session_id: str = Field(
-        index=True, max_length=50
-    )  # FK to sessions (application-level)
+    session_id: str = Field(max_length=50)  # FK to sessions (application-level)
     left_model_id: str = Field(max_length=255)
     right_model_id: str = Field(max_length=255)
 
-    seq_in_session: int = Field(index=True)  # Order of battle in session
+    seq_in_session: int  # Order of battle in session
 
-    status: str = Field(
-        default="ongoing", max_length=20, index=True
-    )  # ongoing, voted, abandoned
+    status: str = Field(default="ongoing", max_length=20)  # ongoing, voted, abandoned
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
-        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
     )
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
@@ -68,47 +70,103 @@ class Battle(SQLModel, table=True):
 
 class Turn(SQLModel, table=True):
     __tablename__ = "turns"
+    __table_args__ = (
+        # Turns of a session in conversation order
+        Index("ix_turns_session_order", "session_id", "battle_seq_in_session", "seq"),
+        # Turns of a battle (follow-up numbering)
+        Index("ix_turns_battle_id_seq", "battle_id", "seq"),
+        # Orphan blob sweep: is a content_blobs hash still referenced?
+        Index(
+            "ix_turns_user_input_hash",
+            "user_input_hash",
+            postgresql_where=text("user_input_hash IS NOT NULL"),
+            sqlite_where=text("user_input_hash IS NOT NULL"),
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     turn_id: str = Field(unique=True, index=True, max_length=50)
 
-    session_id: str = Field(index=True, max_length=50)
-    battle_id: str = Field(index=True, max_length=50)
-    battle_seq_in_session: int = Field(index=True)
+    session_id: str = Field(max_length=50)
+    battle_id: str = Field(max_length=50)
+    battle_seq_in_session: int
 
-    seq: int = Field(index=True)
+    seq: int  # Order of turn in battle
 
     user_input: Optional[str] = None
+    # Offloaded body (content_blobs, see content.py); user_input is NULL then
+    user_input_hash: Optional[str] = Field(default=None, max_length=64)
     user_input_json: Optional[Dict[str, Any]] = Field(
         default=None, sa_column=Column(JSON)
     )
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
-        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
     )
 
 
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Session history: WHERE session_id ORDER BY battle, turn, position in turn
+        Index(
+            "ix_messages_session_order",
+            "session_id",
+            "battle_seq_in_session",
+            "turn_seq",
+            "seq_in_turn",
+        ),
+        # Orphan blob sweep: is a content_blobs hash still referenced?
+        Index(
+            "ix_messages_content_hash",
+            "content_hash",
+            postgresql_where=text("content_hash IS NOT NULL"),
+            sqlite_where=text("content_hash IS NOT NULL"),
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     message_id: str = Field(unique=True, index=True, max_length=50)
 
-    session_id: str = Field(index=True, max_length=50)
-    battle_id: str = Field(index=True, max_length=50)
-    turn_id: str = Field(index=True, max_length=50)
+    session_id: str = Field(max_length=50)
+    battle_id: str = Field(max_length=50)
+    turn_id: str = Field(max_length=50)
 
-    battle_seq_in_session: int = Field(index=True)
-    turn_seq: int = Field(index=True)
-    seq_in_turn: int = Field(index=True)
+    battle_seq_in_session: int
+    turn_seq: int
+    seq_in_turn: int
 
-    session_seq: Optional[int] = Field(default=None, index=True)
+    session_seq: Optional[int] = None
 
     side: str = Field(max_length=10)
     content: Optional[str] = None
+    # Offloaded body (content_blobs, see content.py); content is NULL then
+    content_hash: Optional[str] = Field(default=None, max_length=64)
     content_json: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
     token_count: Optional[int] = None
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
-        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
+class ContentBlob(SQLModel, table=True):
+    """
+    Deduplicated prompt/response body (PostgreSQL)
+
+    Referenced by Turn.user_input_hash and Message.content_hash when
+    content offloading is enabled (see llmbattler_shared.content).
+    created_at is refreshed when a writer reuses an old blob, so the
+    orphan sweep never removes a blob that is being referenced again.
+    """
+
+    __tablename__ = "content_blobs"
+
+    content_hash: str = Field(primary_key=True, max_length=64)  # SHA-256 of the text
+    body: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    compression: str = Field(default="none", max_length=10)  # none, zlib
+    size: int  # Uncompressed UTF-8 bytes
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
     )
 
 
@@ -117,24 +175,55 @@ class Vote(SQLModel, table=True):
     User vote on battle outcome with denormalized model IDs (PostgreSQL)
 
     Denormalized to avoid JOIN queries in worker aggregation.
+
+    On PostgreSQL the table is range-partitioned by month on voted_at
+    (migration 4a1f8c6e2d93, not expressible here): the primary key is
+    (id, voted_at) and unique indexes include voted_at. One vote per battle
+    is enforced when voting by a conditional update of battles.status
+    (BattleRepository.mark_voted).
     """
 
     __tablename__ = "votes"
+    __table_args__ = (
+        # Partial indexes hold only unprocessed votes, however much history is kept
+        # Worker keyset scan: WHERE processing_status = 'pending' ORDER BY voted_at, id
+        Index(
+            "ix_votes_pending_voted_at_id",
+            "voted_at",
+            "id",
+            postgresql_where=text("processing_status = 'pending'"),
+            sqlite_where=text("processing_status = 'pending'"),
+        ),
+        # Retry scan and failure counts
+        Index(
+            "ix_votes_failed_voted_at_id",
+            "voted_at",
+            "id",
+            postgresql_where=text("processing_status IN ('failed', 'dead_letter')"),
+            sqlite_where=text("processing_status IN ('failed', 'dead_letter')"),
+        ),
+        Index("ix_votes_vote_id", "vote_id", "voted_at", unique=True),
+        Index("ix_votes_battle_id", "battle_id", "voted_at", unique=True),  # 1:1 relationship
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    vote_id: str = Field(unique=True, index=True, max_length=50)
-    battle_id: str = Field(unique=True, index=True, max_length=50)  # 1:1 relationship
+    vote_id: str = Field(max_length=50)
+    battle_id: str = Field(max_length=50)
     session_id: str = Field(index=True, max_length=50)  # For analytics
     vote: str = Field(max_length=20)  # left_better, right_better, tie, both_bad
     left_model_id: str = Field(max_length=255)  # Denormalized from battle
     right_model_id: str = Field(max_length=255)  # Denormalized from battle
     processing_status: str = Field(
-        default="pending", max_length=20, index=True
-    )  # pending, processed, failed
+        default="pending", max_length=20
+    )  # pending, processed, failed (retry scheduled), dead_letter (retries exhausted)
     processed_at: Optional[datetime] = Field(
         default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
     )
     error_message: Optional[str] = Field(default=None)
+    retry_count: int = Field(default=0)  # Failed processing attempts so far
+    next_attempt_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )  # When a failed vote is retried (NULL unless processing_status = 'failed')
     voted_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
         sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
@@ -158,7 +247,7 @@ class ModelStats(SQLModel, table=True):
     win_count: int = Field(default=0)
     loss_count: int = Field(default=0)
     tie_count: int = Field(default=0)
-    win_rate: float = Field(default=0.0)
+    win_rate: float = Field(default=0.0, index=True)
     organization: str = Field(max_length=255)
     license: str = Field(max_length=50)  # 'proprietary', 'open-source', etc.
     updated_at: datetime = Field(
@@ -167,6 +256,142 @@ class ModelStats(SQLModel, table=True):
     )
 
 
+# Model attributes that define leaderboard segments (ModelSegmentStats.segment_type)
+SEGMENT_TYPES = ("organization", "license")
+
+
+class ModelSegmentStats(SQLModel, table=True):
+    """
+    Per-segment model statistics (PostgreSQL)
+
+    Ratings computed by worker from battles where both models share the
+    segment value (e.g., two open-source models for segment license=open-source).
+    Updated in the same pass as model_stats.
+    """
+
+    __tablename__ = "model_segment_stats"
+    __table_args__ = (
+        UniqueConstraint("segment_type", "segment_value", "model_id"),
+        # One per sort key (sort_by), each led by the segment equality filters
+        Index(
+            "ix_model_segment_stats_segment_elo_score",
+            "segment_type",
+            "segment_value",
+            "elo_score",
+        ),
+        Index(
+            "ix_model_segment_stats_segment_vote_count",
+            "segment_type",
+            "segment_value",
+            "vote_count",
+        ),
+        Index(
+            "ix_model_segment_stats_segment_win_rate",
+            "segment_type",
+            "segment_value",
+            "win_rate",
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    segment_type: str = Field(max_length=50)  # One of SEGMENT_TYPES
+    segment_value: str = Field(max_length=255)
+    model_id: str = Field(max_length=255)
+    elo_score: int = Field(default=1500)
+    elo_ci: float = Field(default=200.0)
+    vote_count: int = Field(default=0)
+    win_count: int = Field(default=0)
+    loss_count: int = Field(default=0)
+    tie_count: int = Field(default=0)
+    win_rate: float = Field(default=0.0)
+    organization: str = Field(max_length=255)  # Denormalized from model_stats
+    license: str = Field(max_length=50)  # Denormalized from model_stats
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
+class ModelPairwiseStats(SQLModel, table=True):
+    """
+    Head-to-head outcome counts for one model pair (PostgreSQL)
+
+    Updated incrementally by worker while processing votes.
+    Pair is stored once in canonical order (model_a_id < model_b_id).
+    """
+
+    __tablename__ = "model_pairwise_stats"
+    __table_args__ = (UniqueConstraint("model_a_id", "model_b_id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    model_a_id: str = Field(max_length=255)
+    model_b_id: str = Field(max_length=255, index=True)
+    a_win_count: int = Field(default=0)
+    b_win_count: int = Field(default=0)
+    tie_count: int = Field(default=0)
+    both_bad_count: int = Field(default=0)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
+class ModelRatingHistory(SQLModel, table=True):
+    """
+    Per-run rating snapshot for each model (PostgreSQL)
+
+    Appended by worker after every aggregation run that processed votes.
+    Used for rating-trend charts (model_stats only holds the latest rating).
+    """
+
+    __tablename__ = "model_rating_history"
+    __table_args__ = (
+        Index("ix_model_rating_history_model_id_recorded_at", "model_id", "recorded_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    model_id: str = Field(max_length=255)
+    elo_score: int
+    elo_ci: float
+    vote_count: int
+    recorded_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+    )
+
+
+class RatingReplay(SQLModel, table=True):
+    """
+    Progress of a full rating recompute (worker replay mode)
+
+    Checkpoint for resuming: every vote up to (last_voted_at, last_vote_id)
+    is reflected in the shadow stats tables (<table>_replay).
+    """
+
+    __tablename__ = "rating_replays"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: str = Field(default="running", max_length=20, index=True)  # running/completed/abandoned
+    # Votes before cutoff_at (oldest unprocessed vote) are streamed; the rest at swap time
+    cutoff_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    last_voted_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    last_vote_id: Optional[int] = Field(default=None)
+    votes_replayed: int = Field(default=0)
+    started_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    completed_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
 class WorkerStatus(SQLModel, table=True):
     """
     Worker execution status tracking (PostgreSQL)
@@ -182,6 +407,42 @@ class WorkerStatus(SQLModel, table=True):
         default_factory=lambda: datetime.now(UTC),
         sa_column=Column(DateTime(timezone=True), nullable=False),
     )
-    status: str = Field(max_length=50)  # 'success', 'failed', 'running'
+    status: str = Field(max_length=50)  # 'success', 'failed', 'running', 'idle'
+    votes_processed: int = Field(default=0)
+    error_message: Optional[str] = Field(default=None, max_length=1000)
+    leader_id: Optional[str] = Field(default=None, max_length=255)  # Replica holding the lock
+    leader_heartbeat_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class WorkerRun(SQLModel, table=True):
+    """
+    Per-run history of worker executions (PostgreSQL)
+
+    Phase timings, throughput and the pending-vote backlog left after each
+    run; the worker's metrics endpoint reports the latest row.
+    """
+
+    __tablename__ = "worker_runs"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    worker_name: str = Field(max_length=100, index=True)  # e.g., "elo_aggregator"
+    triggered_by: str = Field(max_length=20)  # 'scheduled', 'adaptive' or 'notification'
+    status: str = Field(max_length=50)  # 'success' or 'failed'
+    started_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+    finished_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    duration_seconds: float = Field(default=0.0)
+    load_seconds: float = Field(default=0.0)  # Rating state preload + pending vote reads
+    compute_seconds: float = Field(default=0.0)  # In-memory rating updates and refinements
+    write_seconds: float = Field(default=0.0)  # Write-back, vote status updates, commits
     votes_processed: int = Field(default=0)
+    votes_failed: int = Field(default=0)
+    votes_retried: int = Field(default=0)  # Failed votes re-attempted in this run
+    votes_dead_lettered: int = Field(default=0)  # Votes that exhausted their retries
+    votes_per_second: float = Field(default=0.0)
+    pending_votes: int = Field(default=0)  # Backlog left after the run
+    oldest_pending_age_seconds: Optional[float] = Field(default=None)
     error_message: Optional[str] = Field(default=None, max_length=1000)
@@ -0,0 +1,253 @@
+"""
+Connection pool instrumentation
+
+Engines created by llmbattler_shared.database use InstrumentedPool, which
+records per role:
+
+- checkout latency (time to get a connection, including waiting for a free
+  one and opening a new one) as a histogram
+- checkouts, checkouts that needed an overflow connection, checkout timeouts
+  and new connections opened, as counters
+- pool size, checked-out connections and overflow in use, as gauges
+
+render() formats them in the Prometheus text format (llmbattler_db_pool_*,
+labelled by role); the backend serves them on /metrics and the worker adds
+them to its metrics listener.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+logger = logging.getLogger(__name__)
+
+# Checkout latency histogram bucket upper bounds (seconds)
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = "llmbattler_db_pool"
+
+
+class PoolMetrics:
+    """Counters and checkout latency histogram of one role's pool"""
+
+    def __init__(self, role: str):
+        """
+        Initialize metrics
+
+        Args:
+            role: Engine role ("backend", "worker", "replica"), used as label
+        """
+        self.role = role
+        self.pool: Optional["InstrumentedPool"] = None
+        self.bucket_counts = [0] * len(CHECKOUT_BUCKETS)
+        self.checkout_seconds_sum = 0.0
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+
+    def observe_checkout(self, seconds: float, overflow: bool) -> None:
+        """
+        Record a successful checkout
+
+        Args:
+            seconds: Time the checkout took
+            overflow: Whether all pool_size connections were busy
+        """
+        self.checkouts += 1
+        self.checkout_seconds_sum += seconds
+        if overflow:
+            self.overflow_checkouts += 1
+        for index, bound in enumerate(CHECKOUT_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[index] += 1
+                break
+
+    def render(self) -> List[str]:
+        """
+        Samples in the Prometheus text format (without HELP/TYPE lines)
+
+        Returns:
+            List[str]: Sample lines
+        """
+        label = f'role="{self.role}"'
+        lines = []
+
+        cumulative = 0
+        for bound, count in zip(CHECKOUT_BUCKETS, self.bucket_counts):
+            cumulative += count
+            lines.append(f'{PREFIX}_checkout_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'{PREFIX}_checkout_seconds_bucket{{{label},le="+Inf"}} {self.checkouts}')
+        lines.append(f"{PREFIX}_checkout_seconds_sum{{{label}}} {self.checkout_seconds_sum}")
+        lines.append(f"{PREFIX}_checkout_seconds_count{{{label}}} {self.checkouts}")
+
+        lines.append(f"{PREFIX}_overflow_checkouts_total{{{label}}} {self.overflow_checkouts}")
+        lines.append(f"{PREFIX}_checkout_timeouts_total{{{label}}} {self.timeouts}")
+        lines.append(f"{PREFIX}_connections_opened_total{{{label}}} {self.connections_opened}")
+
+        if self.pool is not None:
+            lines.append(f"{PREFIX}_size{{{label}}} {self.pool.size()}")
+            lines.append(f"{PREFIX}_checked_out{{{label}}} {self.pool.checkedout()}")
+            lines.append(f"{PREFIX}_overflow{{{label}}} {max(self.pool.overflow(), 0)}")
+        return lines
+
+
+# role -> metrics of the role's current pool (kept across engine re-creation)
+_metrics: Dict[str, PoolMetrics] = {}
+
+_HELP = {
+    "checkout_seconds": ("histogram", "Time to check out a connection (wait + connect)"),
+    "overflow_checkouts_total": ("counter", "Checkouts that needed an overflow connection"),
+    "checkout_timeouts_total": ("counter", "Checkouts that timed out (pool exhausted)"),
+    "connections_opened_total": ("counter", "New database connections opened"),
+    "size": ("gauge", "Configured pool size"),
+    "checked_out": ("gauge", "Connections currently checked out"),
+    "overflow": ("gauge", "Overflow connections in use"),
+}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that reports checkouts to its PoolMetrics"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection, timing the wait"""
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_checkout(
+                time.perf_counter() - started, overflow=self.checkedout() > self.size()
+            )
+        return connection
+
+    def recreate(self) -> "InstrumentedPool":
+        """Keep reporting to the same metrics after engine.dispose()"""
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+def instrument(engine: AsyncEngine, role: str) -> Optional[PoolMetrics]:
+    """
+    Attach a role's metrics to an engine created with poolclass=InstrumentedPool
+
+    Args:
+        engine: Engine of the role
+        role: Engine role
+
+    Returns:
+        Optional[PoolMetrics]: Role metrics, None if the pool is not instrumented
+                               (e.g. SQLite StaticPool)
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedPool):
+        return None
+
+    metrics = _metrics.setdefault(role, PoolMetrics(role))
+    metrics.pool = pool
+    pool.metrics = metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connections_opened += 1
+
+    return metrics
+
+
+def get_pool_metrics(role: str) -> Optional[PoolMetrics]:
+    """
+    Metrics of a role's pool
+
+    Args:
+        role: Engine role
+
+    Returns:
+        Optional[PoolMetrics]: Metrics, None if the role has no instrumented pool
+    """
+    return _metrics.get(role)
+
+
+def render() -> str:
+    """
+    All instrumented pools in the Prometheus text format
+
+    Returns:
+        str: Metrics text (empty if no pool is instrumented)
+    """
+    samples = [line for metrics in _metrics.values() for line in metrics.render()]
+    lines: List[str] = []
+    for name, (kind, help_text) in _HELP.items():
+        family = [
+            line
+            for line in samples
+            if line.startswith(f"{PREFIX}_{name}{{")
+            or (kind == "histogram" and line.startswith(f"{PREFIX}_{name}_"))
+        ]
+        if family:
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            lines.extend(family)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open connections ahead of the first requests
+
+    Args:
+        engine: Engine to warm up
+        connections: Connections to open (typically pool_size)
+
+    Returns:
+        int: Connections opened (0 on failure; the pool then connects lazily)
+    """
+    if connections <= 0 or not isinstance(engine.sync_engine.pool, InstrumentedPool):
+        return 0
+    opened = []
+    try:
+        # Hold them all at once, so each checkout opens a new connection
+        for _ in range(connections):
+            opened.append(await engine.connect())
+    except Exception as e:
+        logger.warning(f"Pool warm-up stopped after {len(opened)} connections: {e}")
+    finally:
+        for connection in opened:
+            await connection.close()
+    return len(opened)
+
+
+async def drain(engine: AsyncEngine, timeout_seconds: float) -> bool:
+    """
+    Wait for checked-out connections to be returned
+
+    Args:
+        engine: Engine to drain
+        timeout_seconds: Maximum wait
+
+    Returns:
+        bool: True if no connection is checked out anymore
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedPool):
+        return True
+    deadline = time.monotonic() + timeout_seconds
+    while pool.checkedout() > 0 and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    if pool.checkedout() > 0:
+        logger.warning(f"{pool.checkedout()} connection(s) still checked out at shutdown")
+        return False
+    return True
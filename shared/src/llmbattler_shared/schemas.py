@@ -179,6 +179,44 @@ class LeaderboardResponse(BaseModel):
     metadata: LeaderboardMetadata
 
 
+class RatingHistoryPoint(BaseModel):
+    """Single point of a model's rating time series"""
+
+    recorded_at: datetime
+    elo_score: int
+    elo_ci: float
+    vote_count: int
+
+
+class ModelRatingSeries(BaseModel):
+    """Rating time series for one model"""
+
+    model_id: str
+    points: List[RatingHistoryPoint]
+
+
+class RatingHistoryResponse(BaseModel):
+    """Response schema for GET /api/leaderboard/history"""
+
+    series: List[ModelRatingSeries]
+    start: datetime
+    end: datetime
+    max_points: int  # Upper bound on points per series after downsampling
+
+
+class PairwiseMatrixResponse(BaseModel):
+    """
+    Response schema for GET /api/leaderboard/matrix
+
+    Row i / column j refers to models[i] vs models[j].
+    """
+
+    models: List[str]
+    win_count: List[List[int]]  # Battles where row model beat column model
+    battle_count: List[List[int]]  # All battles between row and column model
+    win_rate: List[List[Optional[float]]]  # win_count / battle_count (None if no battles)
+
+
 # ==================== Error Schemas ====================
 
 
@@ -0,0 +1,109 @@
+"""
+Benchmark: ELOAggregator throughput (votes/sec)
+
+Seeds N pending votes across a fixed set of models, then times one
+process_pending_votes() run (preload -> in-memory updates -> bulk write-back).
+
+Usage (from worker/):
+    uv run python benchmarks/bench_aggregator.py                  # 10k and 1M votes
+    uv run python benchmarks/bench_aggregator.py --votes 10000
+    BENCH_DATABASE_URL=postgresql+asyncpg://... uv run python benchmarks/bench_aggregator.py
+
+Defaults to a temporary SQLite file. Point BENCH_DATABASE_URL at a scratch
+PostgreSQL database to measure the production path (tables are dropped!).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from llmbattler_shared.models import Vote
+from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+
+VOTE_TYPES = ["left_better", "right_better", "tie", "both_bad"]
+INSERT_BATCH_SIZE = 10_000
+
+
+def _vote_rows(count: int, model_count: int, seed: int):
+    """Yield batches of pending vote rows with random model pairs"""
+    rng = random.Random(seed)
+    models = [f"model-{i:03d}" for i in range(model_count)]
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+
+    batch = []
+    for i in range(count):
+        left, right = rng.sample(models, 2)
+        batch.append(
+            {
+                "vote_id": f"vote_{i}",
+                "battle_id": f"battle_{i}",
+                "session_id": f"session_{i // 5}",
+                "vote": rng.choice(VOTE_TYPES),
+                "left_model_id": left,
+                "right_model_id": right,
+                "processing_status": "pending",
+                "voted_at": start + timedelta(seconds=i),
+            }
+        )
+        if len(batch) == INSERT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def run_benchmark(database_url: str, vote_count: int, model_count: int) -> float:
+    """
+    Seed votes and time a single aggregation run
+
+    Returns:
+        float: Throughput in votes/sec
+    """
+    engine = create_async_engine(database_url, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with engine.begin() as conn:
+        for batch in _vote_rows(vote_count, model_count, seed=42):
+            await conn.execute(insert(Vote.__table__), batch)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        started = time.perf_counter()
+        processed = await ELOAggregator(session).process_pending_votes()
+        elapsed = time.perf_counter() - started
+
+    await engine.dispose()
+
+    assert processed == vote_count, f"processed {processed} of {vote_count} votes"
+    return vote_count / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--votes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--models", type=int, default=50)
+    args = parser.parse_args()
+
+    database_url = os.getenv("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        print(f"Database: {url.split('@')[-1]}  models: {args.models}")
+        for vote_count in args.votes:
+            throughput = await run_benchmark(url, vote_count, args.models)
+            print(f"{vote_count:>10,} pending votes: {throughput:>12,.0f} votes/sec")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Benchmark: Bradley-Terry fit time (cold start and warm start)
+
+Simulates N battles between M models with normal strengths, aggregates them
+into a win matrix, then times fit_bradley_terry() from zeros and from the
+previous solution (the hourly case).
+
+Usage (from worker/):
+    uv run python benchmarks/bench_bradley_terry.py                  # 100/300/500 models, 1M votes
+    uv run python benchmarks/bench_bradley_terry.py --models 1000 --votes 5000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from llmbattler_worker.aggregators.bradley_terry import fit_bradley_terry
+
+
+def simulate_wins(n_models: int, n_votes: int, rng: np.random.Generator) -> np.ndarray:
+    """Simulate n_votes random battles between n_models with normal strengths"""
+    strength = rng.normal(0, 1, n_models)
+    a = rng.integers(0, n_models, n_votes)
+    b = rng.integers(0, n_models, n_votes)
+    keep = a != b
+    a, b = a[keep], b[keep]
+    a_won = rng.random(len(a)) < 1 / (1 + np.exp(strength[b] - strength[a]))
+
+    wins = np.zeros((n_models, n_models))
+    np.add.at(wins, (a[a_won], b[a_won]), 1)
+    np.add.at(wins, (b[~a_won], a[~a_won]), 1)
+    return wins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", type=int, nargs="+", default=[100, 300, 500])
+    parser.add_argument("--votes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n_models in args.models:
+        wins = simulate_wins(n_models, args.votes, rng)
+
+        start = time.perf_counter()
+        solution = fit_bradley_terry(wins)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fit_bradley_terry(wins, initial=solution)
+        warm = time.perf_counter() - start
+
+        print(
+            f"{n_models:>5} models, {args.votes:,} votes: "
+            f"cold {cold * 1000:8.1f} ms, warm {warm * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: scalar ELO functions vs the array API
+
+Times three workloads on simulated votes between M models:
+- Independent updates: calculate_elo per pair vs calculate_elo_batch
+- One vote stream: get_score_from_vote + calculate_elo per vote (the
+  aggregator's path) vs elo_scan on a 1-D stream
+- Simulation runs: R independent streams, scalar loop vs one 2-D elo_scan
+
+Every array result is checked against the scalar result.
+
+Usage (from worker/):
+    uv run python benchmarks/bench_elo_calculator.py                   # 50 models, 1M votes
+    uv run python benchmarks/bench_elo_calculator.py --models 300 --votes 5000000 --runs 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from llmbattler_worker.aggregators.elo_calculator import (
+    INITIAL_ELO,
+    calculate_elo,
+    calculate_elo_batch,
+    elo_scan,
+    encode_votes,
+    get_score_from_vote,
+)
+
+
+VOTE_TYPES = np.array(["left_better", "right_better", "tie", "both_bad"])
+
+
+def simulate_votes(n_models: int, n_votes: int, rng: np.random.Generator):
+    """Random battles between distinct models, returned as index arrays and vote strings"""
+    left = rng.integers(0, n_models, n_votes)
+    right = (left + rng.integers(1, n_models, n_votes)) % n_models
+    votes = VOTE_TYPES[rng.integers(0, 4, n_votes)].tolist()
+    return left, right, votes
+
+
+def scalar_scan(ratings: list, left: list, right: list, votes: list) -> list:
+    """Apply votes one by one, as ELOAggregator._apply_outcome does"""
+    ratings = list(ratings)
+    for a, b, vote in zip(left, right, votes):
+        left_score = get_score_from_vote(vote, is_left=True)
+        right_score = get_score_from_vote(vote, is_left=False)
+        new_a = calculate_elo(ratings[a], ratings[b], left_score)
+        new_b = calculate_elo(ratings[b], ratings[a], right_score)
+        ratings[a], ratings[b] = round(new_a), round(new_b)
+    return ratings
+
+
+def timed(function, *args):
+    """Run function once, return (result, seconds)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def report(name: str, n: int, scalar: float, batch: float) -> None:
+    print(
+        f"{name:<22} {n:>11,}  scalar {scalar:7.3f} s  array {batch:7.3f} s  "
+        f"({scalar / batch:5.1f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", type=int, default=50)
+    parser.add_argument("--votes", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=100, help="simulation runs")
+    parser.add_argument("--run-votes", type=int, default=10_000, help="votes per run")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    # Independent updates (kernel throughput)
+    rating_a = rng.normal(INITIAL_ELO, 200, args.votes)
+    rating_b = rng.normal(INITIAL_ELO, 200, args.votes)
+    result = rng.choice([0.0, 0.25, 0.5, 1.0], args.votes)
+    pairs = (rating_a.tolist(), rating_b.tolist(), result.tolist())
+    expected, scalar = timed(lambda: [calculate_elo(*row) for row in zip(*pairs)])
+    batch_ratings, batch = timed(calculate_elo_batch, rating_a, rating_b, result)
+    assert np.allclose(batch_ratings, expected, rtol=0, atol=1e-9)
+    report("independent updates", args.votes, scalar, batch)
+
+    # One vote stream (replay)
+    left, right, votes = simulate_votes(args.models, args.votes, rng)
+    initial = [INITIAL_ELO] * args.models
+    expected, scalar = timed(scalar_scan, initial, left.tolist(), right.tolist(), votes)
+    scanned, batch = timed(lambda: elo_scan(np.array(initial), left, right, encode_votes(votes)))
+    assert scanned.tolist() == expected
+    report("vote stream", args.votes, scalar, batch)
+
+    # Independent simulation runs
+    streams = [simulate_votes(args.models, args.run_votes, rng) for _ in range(args.runs)]
+    expected, scalar = timed(
+        lambda: [scalar_scan(initial, a.tolist(), b.tolist(), v) for a, b, v in streams]
+    )
+    left = np.stack([stream[0] for stream in streams])
+    right = np.stack([stream[1] for stream in streams])
+    codes = np.stack([encode_votes(stream[2]) for stream in streams])
+    scanned, batch = timed(
+        elo_scan, np.full((args.runs, args.models), float(INITIAL_ELO)), left, right, codes
+    )
+    assert np.array_equal(scanned, expected)
+    report(f"{args.runs} simulation runs", args.runs * args.run_votes, scalar, batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Bootstrap confidence intervals for Bradley-Terry ratings
+
+calculate_ci() only looks at a model's vote count. The bootstrap also
+accounts for who the model played: head-to-head outcome counts are
+resampled with multinomial draws (equivalent to resampling votes), the
+Bradley-Terry model is refit per replicate, and the 95% interval is taken
+from the replicate percentiles.
+
+Performance:
+- Replicates are grouped into tasks of REPLICATES_PER_TASK; each task draws
+  its multinomial samples in one call and fits them as one batched solve
+- Tasks run on a ProcessPoolExecutor, so replicates use all CPU cores
+- Every task has its own child seed of the configured seed, so results are
+  reproducible and independent of the number of processes
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bradley_terry import fit_bradley_terry, to_elo_scale
+
+
+logger = logging.getLogger("llmbattler_worker.bootstrap")
+
+# Replicates fit together in one batched solve (bounds memory: task x n x n floats)
+REPLICATES_PER_TASK = 16
+
+# Two-sided 95% interval
+CI_PERCENTILES = (2.5, 97.5)
+
+# (first model index, second model index, is draw) per outcome cell, plus counts
+OutcomeCells = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def build_outcome_cells(model_ids: Sequence[str], pairs: Iterable[Any]) -> OutcomeCells:
+    """
+    Flatten head-to-head counts into outcome cells for multinomial resampling
+
+    Each pair yields up to three cells: A beat B, B beat A, draw (tie or both_bad).
+
+    Args:
+        model_ids: Models in matrix order
+        pairs: Rows (mappings) with model_a_id, model_b_id and outcome counts
+
+    Returns:
+        OutcomeCells: (first, second, is_draw, counts) arrays, zero-count cells dropped
+    """
+    index = {model_id: i for i, model_id in enumerate(model_ids)}
+    cells: List[Tuple[int, int, bool, int]] = []
+    for pair in pairs:
+        a = index.get(pair["model_a_id"])
+        b = index.get(pair["model_b_id"])
+        if a is None or b is None:
+            continue
+        cells.append((a, b, False, pair["a_win_count"]))
+        cells.append((b, a, False, pair["b_win_count"]))
+        cells.append((a, b, True, pair["tie_count"] + pair["both_bad_count"]))
+
+    cells = [cell for cell in cells if cell[3] > 0]
+    if not cells:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty, np.zeros(0, dtype=bool), empty
+
+    first, second, is_draw, counts = (np.asarray(column) for column in zip(*cells))
+    return first, second, is_draw, counts
+
+
+def wins_from_cells(n_models: int, cells: OutcomeCells, counts: np.ndarray) -> np.ndarray:
+    """
+    Rebuild win matrices from (resampled) cell counts
+
+    Args:
+        n_models: Matrix size
+        cells: Outcome cells from build_outcome_cells (its counts are ignored)
+        counts: (..., n_cells) counts, e.g. one row per replicate
+
+    Returns:
+        np.ndarray: (..., n_models, n_models) win matrices (draws count half each)
+    """
+    first, second, is_draw, _ = cells
+    batch_shape = counts.shape[:-1]
+    wins = np.zeros(batch_shape + (n_models, n_models))
+
+    weight = np.where(is_draw, 0.5, 1.0) * counts
+    flat = wins.reshape(-1, n_models, n_models)
+    batch = np.arange(flat.shape[0])[:, None]
+    np.add.at(flat, (batch, first, second), weight.reshape(flat.shape[0], -1))
+    np.add.at(
+        flat,
+        (batch, second[is_draw], first[is_draw]),
+        weight.reshape(flat.shape[0], -1)[:, is_draw],
+    )
+    return wins
+
+
+def _fit_replicates(
+    n_models: int,
+    cells: OutcomeCells,
+    initial: np.ndarray,
+    replicates: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    Draw and fit one task's bootstrap replicates (runs in a worker process)
+
+    Args:
+        n_models: Number of models
+        cells: Outcome cells with observed counts
+        initial: Point estimate log-strengths (warm start)
+        replicates: Number of replicates in this task
+        seed: Child seed of this task
+
+    Returns:
+        np.ndarray: (replicates, n_models) ratings on the Elo scale
+    """
+    counts = cells[3]
+    total = int(counts.sum())
+    samples = np.random.default_rng(seed).multinomial(total, counts / total, size=replicates)
+    wins = wins_from_cells(n_models, cells, samples)
+    return to_elo_scale(fit_bradley_terry(wins, initial))
+
+
+def bootstrap_ci(
+    model_ids: Sequence[str],
+    pairs: Iterable[Any],
+    replicates: int,
+    seed: int,
+    processes: Optional[int] = None,
+) -> np.ndarray:
+    """
+    95% bootstrap confidence interval half-width per model (Elo points)
+
+    Args:
+        model_ids: Models to rate
+        pairs: Head-to-head count rows (see build_outcome_cells)
+        replicates: Number of bootstrap replicates
+        seed: Base seed (same seed and data give the same intervals)
+        processes: Worker processes (None = CPU count, 1 = run in this process)
+
+    Returns:
+        np.ndarray: Half-width of the 95% interval per model, in model_ids order
+    """
+    n_models = len(model_ids)
+    cells = build_outcome_cells(model_ids, pairs)
+    if n_models == 0 or replicates <= 0 or len(cells[3]) == 0:
+        return np.zeros(n_models)
+
+    initial = fit_bradley_terry(wins_from_cells(n_models, cells, cells[3]))
+
+    task_sizes = [
+        min(REPLICATES_PER_TASK, replicates - start)
+        for start in range(0, replicates, REPLICATES_PER_TASK)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(task_sizes))
+    args = [
+        (n_models, cells, initial, size, task_seed) for size, task_seed in zip(task_sizes, seeds)
+    ]
+
+    if processes == 1:
+        results = [_fit_replicates(*task) for task in args]
+    else:
+        # spawn: the worker process may run threads (scheduler, DB driver); fork is unsafe
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = list(executor.map(_fit_replicates, *zip(*args)))
+
+    ratings = np.concatenate(results)
+    lower, upper = np.percentile(ratings, CI_PERCENTILES, axis=0)
+
+    logger.info(f"Bootstrap CI: {replicates} replicates, {n_models} models")
+    return (upper - lower) / 2
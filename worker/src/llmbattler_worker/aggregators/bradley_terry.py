@@ -0,0 +1,162 @@
+"""
+Bradley-Terry rating engine
+
+Fits Bradley-Terry strengths by maximum likelihood over aggregated
+head-to-head counts (model_pairwise_stats), so ratings do not depend on
+vote order. Solved with Newton's method on log-strengths, vectorized with NumPy.
+
+Model:
+    P(i beats j) = p_i / (p_i + p_j)
+
+Outcome weights:
+- left_better / right_better: one win for the winner
+- tie / both_bad: half a win for each model
+
+Strengths are mapped onto the Elo scale (400 points = 10x odds), centered
+on INITIAL_ELO, so they can be stored in model_stats.elo_score unchanged.
+"""
+
+import math
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .elo_calculator import INITIAL_ELO
+
+
+# Elo points per unit of natural-log strength (400 / ln 10)
+ELO_PER_LOG_STRENGTH = 400 / math.log(10)
+
+# Virtual games (half won, half lost) against an average opponent per model.
+# Keeps strengths finite for undefeated/winless models and anchors the scale.
+PRIOR_GAMES = 1.0
+
+# Newton stopping criteria
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-9  # Max change of log-strength between iterations
+
+
+def build_win_matrix(model_ids: Sequence[str], pairs: Iterable[Any]) -> np.ndarray:
+    """
+    Build win matrix from head-to-head counts
+
+    Args:
+        model_ids: Models in matrix order
+        pairs: Rows (mappings) with model_a_id, model_b_id, a_win_count,
+               b_win_count, tie_count, both_bad_count
+
+    Returns:
+        np.ndarray: (n, n) matrix, wins[i, j] = games model i won against model j
+                    (ties and both_bad count half for each side)
+    """
+    index = {model_id: i for i, model_id in enumerate(model_ids)}
+    rows = [
+        (
+            index[pair["model_a_id"]],
+            index[pair["model_b_id"]],
+            pair["a_win_count"],
+            pair["b_win_count"],
+            pair["tie_count"] + pair["both_bad_count"],
+        )
+        for pair in pairs
+        if pair["model_a_id"] in index and pair["model_b_id"] in index
+    ]
+
+    wins = np.zeros((len(model_ids), len(model_ids)))
+    if not rows:
+        return wins
+
+    a, b, a_wins, b_wins, draws = (np.asarray(column) for column in zip(*rows))
+    np.add.at(wins, (a, b), a_wins + 0.5 * draws)
+    np.add.at(wins, (b, a), b_wins + 0.5 * draws)
+    return wins
+
+
+def fit_bradley_terry(
+    wins: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    prior_games: float = PRIOR_GAMES,
+    max_iterations: int = MAX_ITERATIONS,
+    tolerance: float = TOLERANCE,
+) -> np.ndarray:
+    """
+    Maximum-likelihood Bradley-Terry fit (Newton iterations on log-strengths)
+
+    With s = log p and pi_ij = sigmoid(s_i - s_j), each iteration solves
+        H @ step = gradient
+        gradient_i = W_i - sum_j n_ij * pi_ij
+        H_ii = sum_j n_ij * pi_ij * (1 - pi_ij),  H_ij = -n_ij * pi_ij * (1 - pi_ij)
+    plus the prior's virtual games against an opponent of strength 0, which
+    makes H positive definite. Converges in a handful of iterations, each one
+    O(n^2) for the matrix terms plus one O(n^3) solve.
+
+    Also accepts a stack of win matrices (..., n, n), e.g. bootstrap
+    replicates, which are solved together with batched linear algebra.
+
+    Args:
+        wins: (n, n) win matrix from build_win_matrix, or (..., n, n) stack
+        initial: Warm start log-strengths (e.g., previous solution), None for all zeros
+        prior_games: Virtual games per model against an average opponent
+        max_iterations: Iteration cap
+        tolerance: Stop when no log-strength moves more than this
+
+    Returns:
+        np.ndarray: Log-strengths (natural log), centered on 0, shape wins.shape[:-1]
+    """
+    n = wins.shape[-1]
+    if n == 0:
+        return np.zeros(wins.shape[:-1])
+
+    games = wins + np.swapaxes(wins, -1, -2)
+    total_wins = wins.sum(axis=-1)
+    if initial is None:
+        log_strength = np.zeros(wins.shape[:-1])
+    else:
+        log_strength = np.broadcast_to(np.asarray(initial, dtype=float), wins.shape[:-1]).copy()
+    diagonal = np.arange(n)
+
+    for _ in range(max_iterations):
+        win_prob = 1.0 / (1.0 + np.exp(log_strength[..., None, :] - log_strength[..., :, None]))
+        prior_prob = 1.0 / (1.0 + np.exp(-log_strength))
+
+        gradient = total_wins - (games * win_prob).sum(axis=-1)
+        gradient += prior_games / 2 - prior_games * prior_prob
+
+        weight = games * win_prob * (1.0 - win_prob)  # Zero diagonal (no self-pairs)
+        hessian = -weight
+        hessian[..., diagonal, diagonal] = weight.sum(axis=-1) + prior_games * prior_prob * (
+            1.0 - prior_prob
+        )
+
+        step = np.linalg.solve(hessian, gradient[..., None])[..., 0]
+        log_strength += step
+        if np.abs(step).max() < tolerance:
+            break
+
+    return log_strength - log_strength.mean(axis=-1, keepdims=True)
+
+
+def to_elo_scale(log_strength: np.ndarray) -> np.ndarray:
+    """
+    Map log-strengths onto the Elo scale
+
+    Args:
+        log_strength: Centered log-strengths from fit_bradley_terry
+
+    Returns:
+        np.ndarray: Ratings, mean INITIAL_ELO
+    """
+    return INITIAL_ELO + ELO_PER_LOG_STRENGTH * np.asarray(log_strength)
+
+
+def from_elo_scale(ratings: Sequence[float]) -> np.ndarray:
+    """
+    Map Elo-scale ratings back to log-strengths (warm start from stored scores)
+
+    Args:
+        ratings: Ratings on the Elo scale
+
+    Returns:
+        np.ndarray: Log-strengths
+    """
+    return (np.asarray(ratings, dtype=float) - INITIAL_ELO) / ELO_PER_LOG_STRENGTH
@@ -4,47 +4,131 @@ ELO Aggregation Worker
 Processes pending votes from PostgreSQL and updates model ELO ratings.
 
 Workflow:
-1. Read pending votes (processing_status = 'pending')
-2. For each vote:
+1. Preload rating state once per run (model_stats, model_segment_stats,
+   model_pairwise_stats) into in-memory dicts
+2. Read pending votes (processing_status = 'pending') in voted_at-ordered chunks
+   - Keyset pagination on (voted_at, id), so memory stays flat for any backlog size
+   - PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED (rows locked by another
+     consumer are skipped and picked up by a later run)
+3. For each vote (in memory, no database round trips):
    - Get or create ModelStats for both models
    - Calculate new ELO ratings using elo_calculator
    - Update win/loss/tie counts
    - Calculate confidence intervals
-   - Mark vote as processed
-3. Handle errors and mark failed votes
+   - Update per-segment stats (organization, license) when both models share the segment
+   - Update head-to-head counts
+4. Write back each chunk with set-based statements, then commit it:
+   - One bulk upsert per stats table (only rows touched in this chunk)
+   - One bulk UPDATE marking processed votes
+   - Failed votes marked with their error message
+   A failure loses at most the current chunk; committed chunks stay durable.
+   With a fence (leader election), it is awaited before every commit and
+   aborts the run once this replica is no longer the leader.
+4b. Retry failed votes whose backoff has elapsed, after the fresh votes (so
+   retries never delay them). A vote that fails is retried with exponential
+   backoff (worker_vote_retry_base_seconds * 2^(attempt - 1)); after
+   worker_vote_max_retries retries it is moved to 'dead_letter'.
+5. With rating_engine = "bradley_terry": refit all scores (global and per
+   segment) from head-to-head counts and overwrite the online ELO scores
+6. With worker_bootstrap_replicates > 0: replace model_stats.elo_ci with
+   bootstrap confidence intervals (computed in worker processes)
+7. Append a rating snapshot per model to model_rating_history
+
+Time spent per phase (load, compute, write) is accumulated in phase_seconds
+for the worker's run metrics.
 """
 
+import asyncio
 import logging
-from datetime import UTC, datetime
-from typing import Dict, Optional
-
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Integer, Table, any_, bindparam, func, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from llmbattler_shared.models import ModelStats, Vote
+from llmbattler_shared.config import settings
+from llmbattler_shared.models import (
+    SEGMENT_TYPES,
+    ModelPairwiseStats,
+    ModelRatingHistory,
+    ModelSegmentStats,
+    ModelStats,
+    Vote,
+)
 
+from .bootstrap import bootstrap_ci
+from .bradley_terry import (
+    build_win_matrix,
+    fit_bradley_terry,
+    from_elo_scale,
+    to_elo_scale,
+)
 from .elo_calculator import (
     INITIAL_ELO,
     calculate_ci,
     calculate_elo,
-    get_score_from_vote,
+    get_scores_from_vote,
 )
 
 
 logger = logging.getLogger("llmbattler_worker.elo_aggregator")
 
+# Vote IDs per IN (...) list on databases without array parameters (SQLite)
+IN_CLAUSE_BATCH_SIZE = 500
+
+# Rating engines selectable per run (settings.rating_engine)
+RATING_ENGINES = ("elo", "bradley_terry")
+
+# Run phases timed in ELOAggregator.phase_seconds
+PHASES = ("load", "compute", "write")
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """
+    Backoff before retrying a vote that failed attempts times
+
+    Args:
+        attempts: Failed processing attempts so far (>= 1)
+
+    Returns:
+        float: worker_vote_retry_base_seconds * 2^(attempts - 1)
+    """
+    return settings.worker_vote_retry_base_seconds * 2 ** (attempts - 1)
+
+
+SegmentKey = Tuple[str, str, str]  # (segment_type, segment_value, model_id)
+PairKey = Tuple[str, str]  # (model_a_id, model_b_id), model_a_id < model_b_id
+StatsRow = Dict[str, Any]  # Column name -> value of one stats row
+
 
 class ELOAggregator:
     """
     ELO rating aggregation worker
 
     Processes pending votes and updates model statistics in PostgreSQL.
+    Rating state is held in memory for the whole run and written back
+    with bulk statements after every chunk of votes, so throughput is
+    bounded by CPU, not round trips.
     """
 
+    # Stats tables read and written by the aggregator (RatingReplayer uses shadow copies)
+    model_stats_table: Table = ModelStats.__table__
+    segment_stats_table: Table = ModelSegmentStats.__table__
+    pairwise_stats_table: Table = ModelPairwiseStats.__table__
+
     def __init__(
         self,
         session: AsyncSession,
         model_configs: Optional[Dict[str, Dict[str, str]]] = None,
+        chunk_size: Optional[int] = None,
+        rating_engine: Optional[str] = None,
+        fence: Optional[Callable[[], Awaitable[None]]] = None,
     ):
         """
         Initialize ELO aggregator
@@ -53,151 +137,456 @@ class ELOAggregator:
             session: Async SQLAlchemy session for PostgreSQL
             model_configs: Optional dict mapping model_id -> {organization, license}
                           If None, defaults to "Unknown" values
+            chunk_size: Pending votes per chunk (one transaction each)
+                       If None, uses settings.worker_vote_chunk_size
+            rating_engine: "elo" (online, order-dependent) or "bradley_terry"
+                          (MLE refit over head-to-head counts after each run)
+                          If None, uses settings.rating_engine
+            fence: Optional check awaited before every commit; raising aborts
+                   the run with the pending chunk rolled back
+                   (e.g. LeaderElection.ensure_leader)
+
+        Raises:
+            ValueError: If rating_engine is unknown
         """
         self.session = session
         self.model_configs = model_configs or {}
+        self.chunk_size = chunk_size or settings.worker_vote_chunk_size
+        self.rating_engine = rating_engine or settings.rating_engine
+        self.fence = fence
+        if self.rating_engine not in RATING_ENGINES:
+            raise ValueError(
+                f"Invalid rating engine: {self.rating_engine} (expected one of {RATING_ENGINES})"
+            )
+
+        # In-memory rating state: plain column dicts (no ORM instrumentation in the hot loop)
+        self._model_stats: Dict[str, StatsRow] = {}
+        self._segment_stats: Dict[SegmentKey, StatsRow] = {}
+        self._pairwise_stats: Dict[PairKey, StatsRow] = {}
+
+        # Keys touched since last write-back
+        self._dirty_models: set[str] = set()
+        self._dirty_segments: set[SegmentKey] = set()
+        self._dirty_pairs: set[PairKey] = set()
+
+        # Run metrics of the last process_pending_votes call
+        self.phase_seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.votes_processed = 0  # Committed so far (also after a failed chunk)
+        self.votes_failed = 0
+        self.votes_retried = 0
+        self.votes_dead_lettered = 0
 
     async def process_pending_votes(self) -> int:
         """
         Process all pending votes and update model statistics
 
+        Votes are consumed chunk by chunk; each chunk is committed together
+        with the rating state it produced.
+
         Returns:
             int: Number of votes processed
 
         Raises:
-            Exception: If database operation fails
+            Exception: If database operation fails (earlier chunks stay committed)
         """
         logger.info("Starting vote aggregation...")
 
-        # Read all pending votes
-        result = await self.session.execute(select(Vote).where(Vote.processing_status == "pending"))
-        pending_votes = result.scalars().all()
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.votes_processed = 0
+        self.votes_failed = 0
+        self.votes_retried = 0
+        self.votes_dead_lettered = 0
+
+        # Preload rating state once per run
+        with self._timed("load"):
+            await self._load_rating_state()
+
+        # Fresh votes first, then failed votes that are due for a retry.
+        # Votes failing again are scheduled after retry_due, so each is tried once per run.
+        retry_due = datetime.now(UTC)
+        await self._consume_votes(Vote.processing_status == "pending")
+        self.votes_retried = await self._consume_votes(
+            (Vote.processing_status == "failed") & (Vote.next_attempt_at <= retry_due)
+        )
 
-        if not pending_votes:
+        total_processed = self.votes_processed
+        total_failed = self.votes_failed
+        if total_processed == 0 and total_failed == 0:
             logger.info("No pending votes to process")
             return 0
 
-        logger.info(f"Found {len(pending_votes)} pending votes")
+        if total_processed > 0 and self._has_refinements():
+            with self._timed("compute"):
+                await self._refine_ratings()
+            with self._timed("write"):
+                await self._write_rating_state()
+                await self._commit()
 
-        votes_processed = 0
-        votes_failed = 0
+        # Bulk statements bypass the identity map: make loaded objects reload on next access
+        self.session.expire_all()
 
-        for vote in pending_votes:
-            try:
-                await self._process_single_vote(vote)
-                votes_processed += 1
-            except Exception as e:
-                logger.error(
-                    f"Failed to process vote {vote.vote_id}: {e}",
-                    exc_info=True,
-                )
-                # Mark vote as failed
-                vote.processing_status = "failed"
-                vote.error_message = str(e)[:1000]  # Truncate to 1000 chars
-                votes_failed += 1
+        logger.info(
+            f"Vote aggregation complete: {total_processed} processed, {total_failed} failed "
+            f"({self.votes_retried} retried, {self.votes_dead_lettered} dead-lettered)"
+        )
+        return total_processed
 
-        # Commit all changes
-        await self.session.commit()
+    async def _consume_votes(self, condition: Any) -> int:
+        """
+        Process every vote matching condition, chunk by chunk
 
-        logger.info(
-            f"Vote aggregation complete: {votes_processed} processed, {votes_failed} failed"
+        Updates votes_processed and votes_failed after each committed chunk.
+
+        Args:
+            condition: Filter on Vote (e.g., processing_status = 'pending')
+
+        Returns:
+            int: Number of votes read
+        """
+        total_read = 0
+        last_key: Optional[Tuple[datetime, int]] = None
+
+        while True:
+            with self._timed("load"):
+                votes = await self._fetch_pending_chunk(last_key, condition)
+            if not votes:
+                break
+
+            last_key = (votes[-1].voted_at, votes[-1].id)
+            processed, failed = await self._process_chunk(votes)
+            total_read += len(votes)
+            self.votes_processed += processed
+            self.votes_failed += failed
+
+            if len(votes) < self.chunk_size:
+                break
+
+        return total_read
+
+    @contextmanager
+    def _timed(self, phase: str):
+        """Add the wall time of the block to phase_seconds[phase]"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[phase] += time.perf_counter() - start
+
+    def _has_refinements(self) -> bool:
+        """Whether whole-state refinements (see _refine_ratings) are configured"""
+        return self.rating_engine == "bradley_terry" or settings.worker_bootstrap_replicates > 0
+
+    async def _refine_ratings(self) -> None:
+        """
+        Apply whole-state refinements to the in-memory rating state
+
+        - rating_engine = "bradley_terry": refit scores from head-to-head counts
+        - worker_bootstrap_replicates > 0: bootstrap confidence intervals
+
+        Touched rows are marked dirty; the caller writes them back and commits.
+        """
+        if self.rating_engine == "bradley_terry":
+            self._refit_bradley_terry()
+        if settings.worker_bootstrap_replicates > 0:
+            await self._update_bootstrap_ci()
+
+    def _refit_bradley_terry(self) -> None:
+        """
+        Replace online ELO scores with a Bradley-Terry fit (in memory)
+
+        Global scores are fit over all head-to-head counts; each segment is fit
+        over the sub-matrix of its members (battles between two models of the
+        same segment are exactly the battles that count for that segment).
+        Stored scores are the warm start, so each hourly refit takes a few
+        Newton iterations.
+        """
+        model_ids = sorted(self._model_stats)
+        index = {model_id: i for i, model_id in enumerate(model_ids)}
+        wins = build_win_matrix(model_ids, self._pairwise_stats.values())
+
+        initial = from_elo_scale([self._model_stats[m]["elo_score"] for m in model_ids])
+        scores = to_elo_scale(fit_bradley_terry(wins, initial))
+        for model_id, score in zip(model_ids, scores):
+            self._model_stats[model_id]["elo_score"] = round(float(score))
+            self._dirty_models.add(model_id)
+
+        segments: Dict[Tuple[str, str], List[SegmentKey]] = defaultdict(list)
+        for key in self._segment_stats:
+            segments[key[:2]].append(key)
+
+        for keys in segments.values():
+            members = [index[key[2]] for key in keys]
+            initial = from_elo_scale([self._segment_stats[key]["elo_score"] for key in keys])
+            scores = to_elo_scale(fit_bradley_terry(wins[np.ix_(members, members)], initial))
+            for key, score in zip(keys, scores):
+                self._segment_stats[key]["elo_score"] = round(float(score))
+                self._dirty_segments.add(key)
+
+        logger.info(f"Bradley-Terry refit: {len(model_ids)} models, {len(segments)} segments")
+
+    async def _update_bootstrap_ci(self) -> None:
+        """
+        Replace model_stats.elo_ci with bootstrap confidence intervals (in memory)
+
+        The replicates run in a process pool from a separate thread, so the
+        event loop (scheduler, leader heartbeat) stays responsive meanwhile.
+        Segment rows keep the vote-count based CI.
+        """
+        model_ids = sorted(self._model_stats)
+        half_widths = await asyncio.to_thread(
+            bootstrap_ci,
+            model_ids,
+            list(self._pairwise_stats.values()),
+            replicates=settings.worker_bootstrap_replicates,
+            seed=settings.worker_bootstrap_seed,
+            processes=settings.worker_bootstrap_processes or None,
         )
-        return votes_processed
 
-    async def _process_single_vote(self, vote: Vote) -> None:
+        for model_id, half_width in zip(model_ids, half_widths):
+            self._model_stats[model_id]["elo_ci"] = round(float(half_width), 1)
+            self._dirty_models.add(model_id)
+
+    async def _fetch_pending_chunk(
+        self, after: Optional[Tuple[datetime, int]], condition: Any = None
+    ) -> Sequence[Any]:
+        """
+        Read the next chunk of pending votes (keyset pagination on voted_at, id)
+
+        On PostgreSQL the rows are locked with FOR UPDATE SKIP LOCKED until the
+        chunk commits, so votes held by another consumer are skipped, not waited on.
+
+        Args:
+            after: (voted_at, id) of the last vote of the previous chunk, None for the first
+            condition: Filter on Vote (default: processing_status = 'pending')
+
+        Returns:
+            Sequence of rows with id, vote_id, vote, left/right model IDs, voted_at
+            and retry_count
+        """
+        if condition is None:
+            condition = Vote.processing_status == "pending"
+
+        stmt = (
+            select(
+                Vote.id,
+                Vote.vote_id,
+                Vote.vote,
+                Vote.left_model_id,
+                Vote.right_model_id,
+                Vote.voted_at,
+                Vote.retry_count,
+            )
+            .where(condition)
+            .order_by(Vote.voted_at, Vote.id)
+            .limit(self.chunk_size)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Vote.voted_at, Vote.id) > tuple_(*after))
+        if self._dialect_name() == "postgresql":
+            stmt = stmt.with_for_update(skip_locked=True)
+
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def _process_chunk(self, pending_votes: Sequence[Any]) -> Tuple[int, int]:
         """
-        Process a single vote and update model statistics
+        Apply a chunk of votes, write back touched rating state and commit
 
         Args:
-            vote: Vote object to process
+            pending_votes: Rows returned by _fetch_pending_chunk
+
+        Returns:
+            Tuple[int, int]: (processed count, failed count)
+        """
+        logger.info(f"Processing chunk of {len(pending_votes)} pending votes")
+
+        processed: List[Tuple[int, datetime]] = []
+        failed: List[Tuple[int, datetime, int, str]] = []
+        now = datetime.now(UTC)
+
+        with self._timed("compute"):
+            for vote in pending_votes:
+                try:
+                    self._process_single_vote(vote, now)
+                    processed.append((vote.id, vote.voted_at))
+                except Exception as e:
+                    logger.error(
+                        f"Failed to process vote {vote.vote_id}: {e}",
+                        exc_info=True,
+                    )
+                    # Truncate to 1000 chars
+                    failed.append((vote.id, vote.voted_at, vote.retry_count, str(e)[:1000]))
+
+        # Write back rating state and vote statuses, then commit the chunk
+        with self._timed("write"):
+            await self._write_rating_state()
+            await self._mark_votes_processed(processed)
+            await self._mark_votes_failed(failed)
+            await self._commit()
+
+        return len(processed), len(failed)
+
+    async def _commit(self) -> None:
+        """Commit the current transaction once the fence (if any) passes"""
+        if self.fence is not None:
+            await self.fence()
+        await self.session.commit()
+
+    async def has_unrecorded_rating_changes(self) -> bool:
+        """
+        Whether any model's stats changed after the latest rating history snapshot
+
+        Returns:
+            bool: True if model_stats were updated since the last snapshot
+                  (or there is no snapshot yet and stats exist)
+        """
+        last_update = (await self.session.execute(select(func.max(ModelStats.updated_at)))).scalar()
+        if last_update is None:
+            return False
+
+        last_snapshot = (
+            await self.session.execute(select(func.max(ModelRatingHistory.recorded_at)))
+        ).scalar()
+        return last_snapshot is None or last_update > last_snapshot
+
+    async def record_rating_history(self) -> int:
+        """
+        Append current rating of every model to model_rating_history
+
+        All rows of one run share the same recorded_at, so every series
+        has a point at each run timestamp.
+
+        Returns:
+            int: Number of snapshot rows written
+        """
+        result = await self.session.execute(select(ModelStats))
+        all_stats = result.scalars().all()
+
+        recorded_at = datetime.now(UTC)
+        for stats in all_stats:
+            self.session.add(
+                ModelRatingHistory(
+                    model_id=stats.model_id,
+                    elo_score=stats.elo_score,
+                    elo_ci=stats.elo_ci,
+                    vote_count=stats.vote_count,
+                    recorded_at=recorded_at,
+                )
+            )
+
+        await self._commit()
+
+        logger.info(f"Recorded rating history for {len(all_stats)} models")
+        return len(all_stats)
+
+    def _process_single_vote(self, vote: Any, now: datetime) -> None:
+        """
+        Apply a single vote to the in-memory rating state
+
+        Args:
+            vote: Vote row with vote, left_model_id, right_model_id
+            now: Timestamp written to updated_at of touched rows
 
         Raises:
-            ValueError: If vote type is invalid
-            Exception: If database operation fails
+            ValueError: If vote type is invalid (state is left untouched)
         """
+        # Get scores for each model (raises ValueError if invalid vote type)
+        left_score, right_score = get_scores_from_vote(vote.vote)
+
         # Get or create model stats for both models
-        left_stats = await self._get_or_create_model_stats(vote.left_model_id)
-        right_stats = await self._get_or_create_model_stats(vote.right_model_id)
+        left_stats = self._get_or_create_model_stats(vote.left_model_id)
+        right_stats = self._get_or_create_model_stats(vote.right_model_id)
+
+        # Update global ratings and counts
+        self._apply_outcome(left_stats, right_stats, left_score, right_score, now)
+
+        # Update segment ratings (only battles within the same segment count)
+        for segment_type in SEGMENT_TYPES:
+            segment_value = left_stats[segment_type]
+            if segment_value != right_stats[segment_type]:
+                continue
+
+            left_segment = self._get_or_create_segment_stats(
+                segment_type, segment_value, left_stats
+            )
+            right_segment = self._get_or_create_segment_stats(
+                segment_type, segment_value, right_stats
+            )
+            self._apply_outcome(left_segment, right_segment, left_score, right_score, now)
+
+        # Update head-to-head counts
+        self._update_pairwise_stats(vote, now)
+
+    def _apply_outcome(
+        self,
+        left_stats: StatsRow,
+        right_stats: StatsRow,
+        left_score: float,
+        right_score: float,
+        now: datetime,
+    ) -> None:
+        """
+        Apply one battle outcome to a pair of stats rows
 
-        # Get scores for each model (raises ValueError if invalid vote type)
-        left_score = get_score_from_vote(vote.vote, is_left=True)
-        right_score = get_score_from_vote(vote.vote, is_left=False)
+        Updates ELO, vote/win/loss/tie counts, win rate, CI and timestamp.
 
+        Args:
+            left_stats: Stats row of left model (global or segment)
+            right_stats: Stats row of right model (same table as left_stats)
+            left_score: Score of left model (from get_scores_from_vote)
+            right_score: Score of right model (from get_scores_from_vote)
+            now: Timestamp written to updated_at
+        """
         # Calculate new ELO ratings
         new_left_elo = calculate_elo(
-            left_stats.elo_score,
-            right_stats.elo_score,
+            left_stats["elo_score"],
+            right_stats["elo_score"],
             left_score,
         )
         new_right_elo = calculate_elo(
-            right_stats.elo_score,
-            left_stats.elo_score,
+            right_stats["elo_score"],
+            left_stats["elo_score"],
             right_score,
         )
 
         # Update ELO scores
-        left_stats.elo_score = round(new_left_elo)
-        right_stats.elo_score = round(new_right_elo)
+        left_stats["elo_score"] = round(new_left_elo)
+        right_stats["elo_score"] = round(new_right_elo)
 
         # Update vote counts and win/loss/tie counts
-        left_stats.vote_count += 1
-        right_stats.vote_count += 1
+        left_stats["vote_count"] += 1
+        right_stats["vote_count"] += 1
 
         if left_score == 1.0:
-            left_stats.win_count += 1
-            right_stats.loss_count += 1
+            left_stats["win_count"] += 1
+            right_stats["loss_count"] += 1
         elif right_score == 1.0:
-            right_stats.win_count += 1
-            left_stats.loss_count += 1
+            right_stats["win_count"] += 1
+            left_stats["loss_count"] += 1
         elif left_score == 0.5:  # Tie
-            left_stats.tie_count += 1
-            right_stats.tie_count += 1
+            left_stats["tie_count"] += 1
+            right_stats["tie_count"] += 1
         # Note: both_bad (0.25) doesn't increment win/loss/tie
 
-        # Calculate win rates
-        left_stats.win_rate = (
-            left_stats.win_count / left_stats.vote_count if left_stats.vote_count > 0 else 0.0
-        )
-        right_stats.win_rate = (
-            right_stats.win_count / right_stats.vote_count if right_stats.vote_count > 0 else 0.0
-        )
-
-        # Calculate confidence intervals
-        left_stats.elo_ci = calculate_ci(left_stats.vote_count)
-        right_stats.elo_ci = calculate_ci(right_stats.vote_count)
-
-        # Update timestamps
-        left_stats.updated_at = datetime.now(UTC)
-        right_stats.updated_at = datetime.now(UTC)
-
-        # Mark vote as processed
-        vote.processing_status = "processed"
-        vote.processed_at = datetime.now(UTC)
-
-        # Add to session (will be committed by caller)
-        self.session.add(left_stats)
-        self.session.add(right_stats)
-        self.session.add(vote)
+        for stats in (left_stats, right_stats):
+            # vote_count was just incremented, so it is always > 0 here
+            stats["win_rate"] = stats["win_count"] / stats["vote_count"]
+            stats["elo_ci"] = calculate_ci(stats["vote_count"])
+            stats["updated_at"] = now
 
-    async def _get_or_create_model_stats(self, model_id: str) -> ModelStats:
+    def _get_or_create_model_stats(self, model_id: str) -> StatsRow:
         """
-        Get existing ModelStats or create new one with default values
+        Get preloaded ModelStats or create new one with default values
 
         Args:
             model_id: Model identifier
 
         Returns:
-            ModelStats: Existing or newly created model statistics
-
-        Raises:
-            Exception: If database operation fails
+            StatsRow: Existing or newly created model stats row (in memory)
         """
-        # Try to get existing stats
-        result = await self.session.execute(
-            select(ModelStats).where(ModelStats.model_id == model_id)
-        )
-        stats = result.scalar_one_or_none()
+        self._dirty_models.add(model_id)
 
+        stats = self._model_stats.get(model_id)
         if stats is not None:
             return stats
 
@@ -222,8 +611,307 @@ class ELOAggregator:
             win_rate=0.0,
             organization=organization,
             license=license_type,
-        )
-        self.session.add(stats)
-        await self.session.flush()  # Flush to get ID assigned
+        ).model_dump(exclude={"id"})
+        self._model_stats[model_id] = stats
 
         return stats
+
+    def _get_or_create_segment_stats(
+        self,
+        segment_type: str,
+        segment_value: str,
+        model_stats: StatsRow,
+    ) -> StatsRow:
+        """
+        Get preloaded ModelSegmentStats or create new one with default values
+
+        Args:
+            segment_type: Segment dimension (one of SEGMENT_TYPES)
+            segment_value: Segment value (e.g., "open-source")
+            model_stats: Global stats row of the model (for denormalized fields)
+
+        Returns:
+            StatsRow: Existing or newly created segment stats row (in memory)
+        """
+        key = (segment_type, segment_value, model_stats["model_id"])
+        self._dirty_segments.add(key)
+
+        stats = self._segment_stats.get(key)
+        if stats is not None:
+            return stats
+
+        stats = ModelSegmentStats(
+            segment_type=segment_type,
+            segment_value=segment_value,
+            model_id=model_stats["model_id"],
+            elo_score=INITIAL_ELO,
+            organization=model_stats["organization"],
+            license=model_stats["license"],
+        ).model_dump(exclude={"id"})
+        self._segment_stats[key] = stats
+
+        return stats
+
+    def _update_pairwise_stats(self, vote: Any, now: datetime) -> None:
+        """
+        Increment head-to-head counts for the vote's model pair
+
+        Pair is stored in canonical order (model_a_id < model_b_id), so the
+        vote outcome is flipped when the left model sorts after the right one.
+
+        Args:
+            vote: Vote being processed (vote type already validated)
+            now: Timestamp written to updated_at
+        """
+        if vote.left_model_id == vote.right_model_id:
+            return
+
+        left_is_a = vote.left_model_id < vote.right_model_id
+        key = (
+            (vote.left_model_id, vote.right_model_id)
+            if left_is_a
+            else (vote.right_model_id, vote.left_model_id)
+        )
+        self._dirty_pairs.add(key)
+
+        pair = self._pairwise_stats.get(key)
+        if pair is None:
+            pair = ModelPairwiseStats(model_a_id=key[0], model_b_id=key[1]).model_dump(
+                exclude={"id"}
+            )
+            self._pairwise_stats[key] = pair
+
+        if vote.vote == "tie":
+            pair["tie_count"] += 1
+        elif vote.vote == "both_bad":
+            pair["both_bad_count"] += 1
+        elif (vote.vote == "left_better") == left_is_a:
+            pair["a_win_count"] += 1
+        else:
+            pair["b_win_count"] += 1
+
+        pair["updated_at"] = now
+
+    async def _load_rating_state(self) -> None:
+        """
+        Preload all stats tables into memory (one SELECT per table)
+
+        Rows are kept as plain column dicts (primary key excluded), so in-memory
+        updates never go through ORM attribute instrumentation or flushes.
+        """
+        self._model_stats = {
+            row["model_id"]: row for row in await self._load_rows(self.model_stats_table)
+        }
+        self._segment_stats = {
+            (row["segment_type"], row["segment_value"], row["model_id"]): row
+            for row in await self._load_rows(self.segment_stats_table)
+        }
+        self._pairwise_stats = {
+            (row["model_a_id"], row["model_b_id"]): row
+            for row in await self._load_rows(self.pairwise_stats_table)
+        }
+
+        self._dirty_models.clear()
+        self._dirty_segments.clear()
+        self._dirty_pairs.clear()
+
+        logger.info(
+            f"Loaded rating state: {len(self._model_stats)} models, "
+            f"{len(self._segment_stats)} segment rows, {len(self._pairwise_stats)} pairs"
+        )
+
+    async def _load_rows(self, table: Table) -> List[StatsRow]:
+        """
+        Load all rows of a stats table as column dicts without the primary key
+
+        Args:
+            table: Stats table
+
+        Returns:
+            List[StatsRow]: One mutable dict per row
+        """
+        result = await self.session.execute(select(*(c for c in table.c if c.name != "id")))
+        return [dict(row) for row in result.mappings()]
+
+    async def _write_rating_state(self) -> None:
+        """
+        Upsert all stats rows touched since the last write-back
+
+        Each table is written with one INSERT ... ON CONFLICT DO UPDATE (executemany).
+        Values are absolute (not increments): the aggregator is the only writer.
+        """
+        await self._upsert(
+            self.model_stats_table,
+            [self._model_stats[key] for key in self._dirty_models],
+            conflict_columns=["model_id"],
+            update_columns=[
+                "elo_score",
+                "elo_ci",
+                "vote_count",
+                "win_count",
+                "loss_count",
+                "tie_count",
+                "win_rate",
+                "updated_at",
+            ],
+        )
+        await self._upsert(
+            self.segment_stats_table,
+            [self._segment_stats[key] for key in self._dirty_segments],
+            conflict_columns=["segment_type", "segment_value", "model_id"],
+            update_columns=[
+                "elo_score",
+                "elo_ci",
+                "vote_count",
+                "win_count",
+                "loss_count",
+                "tie_count",
+                "win_rate",
+                "updated_at",
+            ],
+        )
+        await self._upsert(
+            self.pairwise_stats_table,
+            [self._pairwise_stats[key] for key in self._dirty_pairs],
+            conflict_columns=["model_a_id", "model_b_id"],
+            update_columns=[
+                "a_win_count",
+                "b_win_count",
+                "tie_count",
+                "both_bad_count",
+                "updated_at",
+            ],
+        )
+
+        self._dirty_models.clear()
+        self._dirty_segments.clear()
+        self._dirty_pairs.clear()
+
+    async def _upsert(
+        self,
+        table: Table,
+        rows: Sequence[StatsRow],
+        conflict_columns: List[str],
+        update_columns: List[str],
+    ) -> None:
+        """
+        Bulk INSERT ... ON CONFLICT DO UPDATE for a stats table
+
+        One statement executed with a parameter list (executemany), so it is
+        compiled once and cached across chunks; the driver batches the rows.
+
+        Args:
+            table: Stats table
+            rows: Column dicts to write (without primary key)
+            conflict_columns: Columns of the unique constraint to conflict on
+            update_columns: Columns overwritten on conflict
+        """
+        if not rows:
+            return
+
+        insert = postgresql.insert if self._dialect_name() == "postgresql" else sqlite.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+        await self.session.execute(stmt, list(rows))
+
+    async def _mark_votes_processed(self, vote_keys: List[Tuple[int, datetime]]) -> None:
+        """
+        Mark votes as processed with a single set-based UPDATE
+
+        votes is partitioned on voted_at (PostgreSQL), so the statement also
+        bounds voted_at: only the partitions holding the chunk are scanned,
+        however much history is kept.
+
+        PostgreSQL: UPDATE votes ... WHERE id = ANY(:vote_ids)
+                    AND voted_at BETWEEN :first AND :last (chunks are voted_at-ordered)
+        Other dialects: batched (id, voted_at) IN (...) lists
+
+        Args:
+            vote_keys: (primary key, voted_at) of processed votes
+        """
+        if not vote_keys:
+            return
+
+        votes = Vote.__table__
+        stmt = update(votes).values(
+            processing_status="processed", processed_at=datetime.now(UTC), next_attempt_at=None
+        )
+
+        if self._dialect_name() == "postgresql":
+            vote_ids = [vote_id for vote_id, _ in vote_keys]
+            voted_ats = [voted_at for _, voted_at in vote_keys]
+            await self.session.execute(
+                stmt.where(
+                    votes.c.id
+                    == any_(bindparam("vote_ids", vote_ids, type_=postgresql.ARRAY(Integer))),
+                    votes.c.voted_at.between(min(voted_ats), max(voted_ats)),
+                )
+            )
+            return
+
+        for start in range(0, len(vote_keys), IN_CLAUSE_BATCH_SIZE):
+            await self.session.execute(
+                stmt.where(
+                    tuple_(votes.c.id, votes.c.voted_at).in_(
+                        vote_keys[start : start + IN_CLAUSE_BATCH_SIZE]
+                    )
+                )
+            )
+
+    async def _mark_votes_failed(self, failed: List[Tuple[int, datetime, int, str]]) -> None:
+        """
+        Schedule failed votes for a retry, or dead-letter them (executemany by primary key)
+
+        Each row is matched on (id, voted_at), so PostgreSQL prunes to its partition.
+
+        Args:
+            failed: List of (vote primary key, voted_at, retry_count before this attempt,
+                    error message)
+        """
+        if not failed:
+            return
+
+        now = datetime.now(UTC)
+        params = []
+        for vote_pk, voted_at, retry_count, message in failed:
+            attempts = retry_count + 1
+            if attempts > settings.worker_vote_max_retries:
+                status, next_attempt_at = "dead_letter", None
+                self.votes_dead_lettered += 1
+                logger.warning(f"Vote {vote_pk} dead-lettered after {attempts} failed attempts")
+            else:
+                status = "failed"
+                next_attempt_at = now + timedelta(seconds=retry_delay_seconds(attempts))
+            params.append(
+                {
+                    "vote_pk": vote_pk,
+                    "vote_voted_at": voted_at,
+                    "status": status,
+                    "message": message,
+                    "attempts": attempts,
+                    "next_attempt_at": next_attempt_at,
+                }
+            )
+
+        votes = Vote.__table__
+        await self.session.execute(
+            update(votes)
+            .where(
+                votes.c.id == bindparam("vote_pk"),
+                votes.c.voted_at == bindparam("vote_voted_at"),
+            )
+            .values(
+                processing_status=bindparam("status"),
+                error_message=bindparam("message"),
+                retry_count=bindparam("attempts"),
+                next_attempt_at=bindparam("next_attempt_at"),
+            ),
+            params,
+        )
+
+    def _dialect_name(self) -> str:
+        """Name of the database dialect bound to the session (e.g., 'postgresql', 'sqlite')"""
+        return self.session.bind.dialect.name
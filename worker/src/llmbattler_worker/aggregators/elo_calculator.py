@@ -7,15 +7,34 @@ Implements standard ELO rating algorithm with:
 - Support for ties (score = 0.5)
 - Support for both_bad votes (score = 0.25)
 - Bradley-Terry confidence interval calculation
+
+Scalar functions (calculate_elo, get_score_from_vote) serve the aggregator.
+Array counterparts (expected_score, calculate_elo_batch, elo_scan) work on
+NumPy arrays of rating indices and outcome codes for replays, simulations
+and matchmaking experiments, without per-vote interpreter overhead.
 """
 
 import math
+from typing import Iterable, Tuple
+
+import numpy as np
 
 
 # ELO constants
 INITIAL_ELO = 1500
 K_FACTOR = 32
 
+# Outcome codes for the array API (index into VOTE_SCORES)
+VOTE_CODES = {"left_better": 0, "right_better": 1, "tie": 2, "both_bad": 3}
+
+# (left score, right score) per outcome code; both_bad is a small penalty for
+# both models (LM Arena approach)
+VOTE_SCORES = np.array([[1.0, 0.0], [0.0, 1.0], [0.5, 0.5], [0.25, 0.25]])
+VOTE_SCORES.flags.writeable = False
+
+# Same table keyed by vote string, for the scalar path
+_SCORES_BY_VOTE = {vote: tuple(VOTE_SCORES[code].tolist()) for vote, code in VOTE_CODES.items()}
+
 
 def calculate_elo(rating_a: float, rating_b: float, result: float, k: int = K_FACTOR) -> float:
     """
@@ -75,17 +94,189 @@ def get_score_from_vote(vote: str, is_left: bool) -> float:
         >>> get_score_from_vote("both_bad", is_left=True)
         0.25
     """
-    if vote == "both_bad":
-        # Small penalty for both models (LM Arena approach)
-        return 0.25
-    elif vote == "tie":
-        return 0.5
-    elif vote == "left_better":
-        return 1.0 if is_left else 0.0
-    elif vote == "right_better":
-        return 0.0 if is_left else 1.0
-    else:
-        raise ValueError(f"Invalid vote type: {vote}")
+    left_score, right_score = get_scores_from_vote(vote)
+    return left_score if is_left else right_score
+
+
+def get_scores_from_vote(vote: str) -> Tuple[float, float]:
+    """
+    Convert vote to ELO scores for both models (one table lookup)
+
+    Args:
+        vote: Vote result ("left_better", "right_better", "tie", "both_bad")
+
+    Returns:
+        Tuple[float, float]: (left score, right score)
+
+    Raises:
+        ValueError: If vote type is invalid
+    """
+    try:
+        return _SCORES_BY_VOTE[vote]
+    except KeyError:
+        raise ValueError(f"Invalid vote type: {vote}") from None
+
+
+def encode_votes(votes: Iterable[str]) -> np.ndarray:
+    """
+    Convert vote strings to outcome codes
+
+    Args:
+        votes: Vote results ("left_better", "right_better", "tie", "both_bad")
+
+    Returns:
+        np.ndarray: int8 outcome codes (see VOTE_CODES)
+
+    Raises:
+        ValueError: If any vote type is invalid
+    """
+    try:
+        return np.fromiter((VOTE_CODES[vote] for vote in votes), dtype=np.int8)
+    except KeyError as e:
+        raise ValueError(f"Invalid vote type: {e.args[0]}") from None
+
+
+def expected_score(rating_a: np.ndarray, rating_b: np.ndarray) -> np.ndarray:
+    """
+    Expected score of A against B, elementwise
+
+    Args:
+        rating_a: Ratings of model A
+        rating_b: Ratings of model B (broadcast against rating_a)
+
+    Returns:
+        np.ndarray: E_A = 1 / (1 + 10^((R_B - R_A) / 400))
+    """
+    return 1 / (1 + np.power(10.0, (np.asarray(rating_b) - np.asarray(rating_a)) / 400))
+
+
+def calculate_elo_batch(
+    rating_a: np.ndarray, rating_b: np.ndarray, result: np.ndarray, k: float = K_FACTOR
+) -> np.ndarray:
+    """
+    Array counterpart of calculate_elo: independent updates, elementwise
+
+    All updates see the input ratings, so this is only equivalent to
+    sequential calculate_elo calls when no model appears twice (use
+    elo_scan for a vote stream).
+
+    Args:
+        rating_a: Current ratings of model A
+        rating_b: Current ratings of model B
+        result: Scores for model A (e.g., VOTE_SCORES[codes, 0])
+        k: K-factor
+
+    Returns:
+        np.ndarray: New ratings of model A
+    """
+    return np.asarray(rating_a) + k * (np.asarray(result) - expected_score(rating_a, rating_b))
+
+
+def elo_scan(
+    ratings: np.ndarray,
+    left: np.ndarray,
+    right: np.ndarray,
+    codes: np.ndarray,
+    k: float = K_FACTOR,
+    round_ratings: bool = True,
+) -> np.ndarray:
+    """
+    Apply a vote stream in order (exact sequential Elo)
+
+    Gives the same ratings as calling calculate_elo for both models vote by
+    vote, as the aggregator does. Elo is order dependent, so votes are
+    applied one after another:
+    - 1-D: one stream; a tight loop over plain floats with the rating
+      change cached per (rating difference, outcome), no per-vote calls
+      or NumPy scalars
+    - 2-D: independent streams, e.g. simulation runs; the loop runs over
+      vote positions and each step updates all runs with the array kernels
+
+    Args:
+        ratings: Initial ratings, (n_models,) or (n_runs, n_models)
+        left: Left model index per vote, (n_votes,) or (n_runs, n_votes)
+        right: Right model index per vote, same shape as left
+        codes: Outcome codes per vote (see VOTE_CODES), same shape as left
+        k: K-factor
+        round_ratings: Round ratings to integers after every vote (as stored
+                       in model_stats.elo_score)
+
+    Returns:
+        np.ndarray: Final ratings (float), same shape as ratings
+
+    Raises:
+        ValueError: If array shapes do not match or a code is out of range
+    """
+    ratings = np.asarray(ratings, dtype=float)
+    left, right, codes = np.asarray(left), np.asarray(right), np.asarray(codes)
+    if not (left.shape == right.shape == codes.shape):
+        raise ValueError("left, right and codes must have the same shape")
+    if ratings.ndim != left.ndim or ratings.shape[:-1] != left.shape[:-1] or ratings.ndim > 2:
+        raise ValueError(f"Shape mismatch: ratings {ratings.shape}, votes {left.shape}")
+    if codes.size and (codes.min() < 0 or codes.max() >= len(VOTE_SCORES)):
+        raise ValueError("Invalid outcome code")
+
+    if ratings.ndim == 1:
+        return np.array(
+            _scan_stream(
+                ratings.tolist(),
+                left.tolist(),
+                right.tolist(),
+                codes.tolist(),
+                k,
+                round_ratings,
+            ),
+            dtype=float,
+        )
+
+    scores = VOTE_SCORES[codes]
+    ratings = ratings.copy()
+    runs = np.arange(ratings.shape[0])
+    for step in range(left.shape[1]):
+        left_step, right_step = left[:, step], right[:, step]
+        left_rating = ratings[runs, left_step]
+        right_rating = ratings[runs, right_step]
+        new_left = calculate_elo_batch(left_rating, right_rating, scores[:, step, 0], k)
+        new_right = calculate_elo_batch(right_rating, left_rating, scores[:, step, 1], k)
+        if round_ratings:
+            new_left, new_right = np.rint(new_left), np.rint(new_right)
+        ratings[runs, left_step] = new_left
+        ratings[runs, right_step] = new_right
+    return ratings
+
+
+def _scan_stream(
+    ratings: list, left: list, right: list, codes: list, k: float, round_ratings: bool
+) -> list:
+    """
+    Sequential Elo over plain Python lists (see elo_scan)
+
+    The rating change of both models only depends on the rating difference
+    and the outcome, so it is computed once per (difference, code) and
+    reused. Rounded ratings take few distinct differences, which makes most
+    votes a dict hit. The cached values come from the same float operations
+    as calculate_elo, so results are identical.
+    """
+    scores = VOTE_SCORES.tolist()
+    deltas = {}
+    for a, b, code in zip(left, right, codes):
+        rating_a = ratings[a]
+        rating_b = ratings[b]
+        difference = rating_b - rating_a
+        delta = deltas.get((difference, code))
+        if delta is None:
+            score_a, score_b = scores[code]
+            delta = deltas[(difference, code)] = (
+                k * (score_a - 1 / (1 + 10 ** (difference / 400))),
+                k * (score_b - 1 / (1 + 10 ** (-difference / 400))),
+            )
+        if round_ratings:
+            ratings[a] = round(rating_a + delta[0])
+            ratings[b] = round(rating_b + delta[1])
+        else:
+            ratings[a] = rating_a + delta[0]
+            ratings[b] = rating_b + delta[1]
+    return ratings
 
 
 def calculate_ci(vote_count: int) -> float:
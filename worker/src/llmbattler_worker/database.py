@@ -1,16 +1,59 @@
 """
 Database connection and session management for worker
 
-Re-exports shared database functions for worker use.
+Re-exports shared database functions for worker use. The worker engine is
+created on first use (or by init() in main); `engine` is resolved lazily.
 """
 
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from llmbattler_shared import database as _shared
+from llmbattler_shared.config import settings
 from llmbattler_shared.database import get_worker_db as get_db
-from llmbattler_shared.database import worker_engine as engine
-from llmbattler_shared.database import worker_session_maker as async_session_maker
+
+
+ROLE = "worker"
+
+
+def init() -> AsyncEngine:
+    """Create the worker engine (idempotent)"""
+    return _shared.init(ROLE)
+
+
+async def warm_up() -> int:
+    """Open the worker pool's connections"""
+    return await _shared.warm_up(ROLE)
+
+
+async def dispose() -> None:
+    """Drain and close the worker engine's connections"""
+    await _shared.dispose(ROLE, drain_seconds=settings.postgres_pool_drain_seconds)
+
+
+def get_engine() -> AsyncEngine:
+    """Worker engine (created on first use)"""
+    return _shared.get_engine(ROLE)
+
+
+def async_session_maker(**kwargs: Any) -> AsyncSession:
+    """Open a worker session (same call signature as a sessionmaker)"""
+    return _shared.get_session_maker(ROLE)(**kwargs)
+
+
+def __getattr__(name: str) -> Any:
+    """Lazy `engine` attribute (kept for old imports; use get_engine())"""
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
-    "engine",
     "async_session_maker",
     "get_db",
+    "get_engine",
+    "init",
+    "warm_up",
+    "dispose",
 ]
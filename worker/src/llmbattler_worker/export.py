@@ -0,0 +1,519 @@
+"""
+Bulk export of votes with their battle conversations (dataset dumps)
+
+Usage (from worker/):
+    uv run python -m llmbattler_worker.export --output exports/2026-10
+    uv run python -m llmbattler_worker.export --output exports/q3 \\
+        --since 2026-07-01 --until 2026-10-01 --format parquet
+    uv run python -m llmbattler_worker.export --output exports/q3 --restart
+
+One record per vote:
+
+    {"vote_id": ..., "battle_id": ..., "session_id": ..., "voted_at": ISO 8601,
+     "vote": "left_better", "left_model_id": ..., "right_model_id": ...,
+     "processing_status": ...,
+     "conversation": [{"user": ..., "left": ..., "right": ...}, ...]}
+
+with one conversation entry per turn of the battle, in order.
+
+- Votes in [--since, --until) are streamed in (voted_at, id) order through a
+  server-side cursor; conversations are fetched per batch of votes with
+  column-projected selects, so memory stays constant however many rows are
+  exported.
+- Output is split into parts of --rows-per-file records:
+  votes-00000.jsonl.gz (gzip JSONL, default) or votes-00000.parquet
+  (--format parquet, zstd; requires the optional pyarrow dependency:
+  `uv sync --extra export`).
+- Resumable: a part is written to <name>.partial and renamed when complete,
+  then export_state.json records the last exported (voted_at, id). Re-running
+  with the same filters continues after it; --restart starts over. Only the
+  part in progress is lost on interruption (gzip and parquet files cannot be
+  resumed mid-file), which parts of 100,000 records keep cheap to redo.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from llmbattler_shared.content import load_contents
+from llmbattler_shared.models import Battle, Message, Turn, Vote
+
+from . import database
+
+
+logger = logging.getLogger("llmbattler_worker.export")
+
+FORMATS = ("jsonl", "parquet")
+STATE_FILE = "export_state.json"
+PART_PREFIX = "votes-"
+SUFFIXES = {"jsonl": ".jsonl.gz", "parquet": ".parquet"}
+
+# Parts are the unit of resumption: an interrupted run re-exports the part in progress
+DEFAULT_ROWS_PER_FILE = 100_000
+DEFAULT_BATCH_SIZE = 5_000
+
+
+class ExportStateError(RuntimeError):
+    """Raised when the output directory holds an export with other settings"""
+
+
+@dataclass
+class ExportState:
+    """Progress of an export (export_state.json)"""
+
+    format: str
+    since: Optional[str]
+    until: Optional[str]
+    rows_per_file: int
+    parts: int = 0  # Completed part files
+    rows: int = 0  # Records in completed part files
+    last_voted_at: Optional[str] = None  # Key of the last exported vote
+    last_id: Optional[int] = None
+    completed_at: Optional[str] = None
+    files: List[str] = field(default_factory=list)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 date or timestamp filter
+
+    Args:
+        value: e.g. "2026-07-01" or "2026-07-01T12:00:00+02:00" (naive = UTC)
+
+    Returns:
+        Optional[datetime]: Timezone-aware timestamp, None if value is None
+    """
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Timestamps from SQLite come back naive; they are stored as UTC"""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+class _JsonlPart:
+    """gzip-compressed JSON Lines part file"""
+
+    def __init__(self, path: Path):
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+
+    def write(self, records: Sequence[Dict[str, Any]]) -> None:
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            self._file.write("\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetPart:
+    """Parquet part file, one row group per written batch"""
+
+    def __init__(self, path: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("--format parquet requires pyarrow (uv sync --extra export)") from e
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("vote_id", pa.string()),
+                ("battle_id", pa.string()),
+                ("session_id", pa.string()),
+                ("voted_at", pa.timestamp("ms", tz="UTC")),
+                ("vote", pa.string()),
+                ("left_model_id", pa.string()),
+                ("right_model_id", pa.string()),
+                ("processing_status", pa.string()),
+                (
+                    "conversation",
+                    pa.list_(
+                        pa.struct(
+                            [("user", pa.string()), ("left", pa.string()), ("right", pa.string())]
+                        )
+                    ),
+                ),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, records: Sequence[Dict[str, Any]]) -> None:
+        rows = [{**record, "voted_at": parse_timestamp(record["voted_at"])} for record in records]
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class VoteExporter:
+    """Stream votes and their conversations into compressed part files"""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        output_dir: Path,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        fmt: str = "jsonl",
+        rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """
+        Initialize exporter
+
+        Args:
+            engine: Database engine (one streaming and one lookup connection)
+            output_dir: Directory for part files and export_state.json
+            since: Export votes with voted_at >= since (None = from the first vote)
+            until: Export votes with voted_at < until (None = up to the last vote)
+            fmt: "jsonl" or "parquet"
+            rows_per_file: Records per part file
+            batch_size: Votes fetched from the cursor (and looked up) at a time
+
+        Raises:
+            ValueError: If fmt is unknown or sizes are not positive
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Invalid export format: {fmt} (expected one of {FORMATS})")
+        if rows_per_file <= 0 or batch_size <= 0:
+            raise ValueError("rows_per_file and batch_size must be positive")
+        self.engine = engine
+        self.output_dir = Path(output_dir)
+        self.since = since
+        self.until = until
+        self.fmt = fmt
+        self.rows_per_file = rows_per_file
+        self.batch_size = batch_size
+
+    async def run(self, restart: bool = False) -> ExportState:
+        """
+        Export (or continue exporting) all matching votes
+
+        Args:
+            restart: Delete a previous export in output_dir and start over
+
+        Returns:
+            ExportState: Final state (parts and rows in total, across runs)
+
+        Raises:
+            ExportStateError: If output_dir holds an export with other
+                              filters/format (use restart or another directory)
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        state = self._start_or_resume(restart)
+
+        after = None
+        if state.last_id is not None:
+            after = (parse_timestamp(state.last_voted_at), state.last_id)
+            logger.info(f"Resuming export after part {state.parts} ({state.rows} rows)")
+
+        part = None
+        part_rows = 0
+        last_key = None
+        async for batch in self._stream_records(after):
+            start = 0
+            while start < len(batch):
+                if part is None:
+                    part = self._open_part(state.parts)
+                take = batch[start : start + self.rows_per_file - part_rows]
+                start += len(take)
+                part.write([record for _, record in take])
+                part_rows += len(take)
+                last_key = take[-1][0]
+                if part_rows == self.rows_per_file:
+                    self._finish_part(part, state, part_rows, last_key)
+                    part, part_rows = None, 0
+
+        if part is not None:
+            self._finish_part(part, state, part_rows, last_key)
+
+        state.completed_at = datetime.now(UTC).isoformat()
+        self._save_state(state)
+        logger.info(f"Export complete: {state.rows} rows in {state.parts} part(s)")
+        return state
+
+    async def _stream_records(
+        self, after: Optional[tuple]
+    ) -> AsyncIterator[List[Tuple[tuple, Dict[str, Any]]]]:
+        """
+        Stream export records in (voted_at, id) order, one batch at a time
+
+        Args:
+            after: Resume after this (voted_at, id), None to start at the beginning
+
+        Yields:
+            List[Tuple[tuple, Dict]]: ((voted_at, id), record) of each vote in the batch
+        """
+        stmt = (
+            select(
+                Vote.id,
+                Vote.vote_id,
+                Vote.battle_id,
+                Vote.session_id,
+                Vote.voted_at,
+                Vote.vote,
+                Vote.left_model_id,
+                Vote.right_model_id,
+                Vote.processing_status,
+                Battle.seq_in_session,
+            )
+            .join(Battle, Battle.battle_id == Vote.battle_id)
+            .order_by(Vote.voted_at, Vote.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        if self.since is not None:
+            stmt = stmt.where(Vote.voted_at >= self.since)
+        if self.until is not None:
+            stmt = stmt.where(Vote.voted_at < self.until)
+        if after is not None:
+            stmt = stmt.where(tuple_(Vote.voted_at, Vote.id) > tuple_(*after))
+
+        # Server-side cursor on its own connection; lookups use a second one
+        async with self.engine.connect() as stream_conn, self.engine.connect() as lookup_conn:
+            result = await stream_conn.stream(stmt)
+            async for votes in result.partitions():
+                conversations = await self._conversations(lookup_conn, votes)
+                yield [
+                    (
+                        (vote.voted_at, vote.id),
+                        {
+                            "vote_id": vote.vote_id,
+                            "battle_id": vote.battle_id,
+                            "session_id": vote.session_id,
+                            "voted_at": _as_utc(vote.voted_at).isoformat(),
+                            "vote": vote.vote,
+                            "left_model_id": vote.left_model_id,
+                            "right_model_id": vote.right_model_id,
+                            "processing_status": vote.processing_status,
+                            "conversation": conversations.get(vote.battle_id, []),
+                        },
+                    )
+                    for vote in votes
+                ]
+
+    async def _conversations(
+        self, connection: AsyncConnection, votes: Sequence[Any]
+    ) -> Dict[str, List[Dict[str, Optional[str]]]]:
+        """
+        Turn-by-turn conversations of the votes' battles
+
+        Looks turns and messages up by (session_id, battle_seq_in_session), the
+        prefix of their session-order indexes.
+
+        Args:
+            connection: Lookup connection
+            votes: Batch of streamed vote rows
+
+        Returns:
+            Dict[str, List[Dict]]: battle_id -> [{"user", "left", "right"}, ...]
+        """
+        keys = list({(vote.session_id, vote.seq_in_session) for vote in votes})
+        turns = await connection.execute(
+            select(Turn.battle_id, Turn.turn_id, Turn.user_input, Turn.user_input_hash)
+            .where(tuple_(Turn.session_id, Turn.battle_seq_in_session).in_(keys))
+            .order_by(Turn.session_id, Turn.battle_seq_in_session, Turn.seq)
+        )
+        messages = await connection.execute(
+            select(Message.turn_id, Message.side, Message.content, Message.content_hash).where(
+                tuple_(Message.session_id, Message.battle_seq_in_session).in_(keys)
+            )
+        )
+        turns, messages = turns.all(), messages.all()
+        # Bodies offloaded to content_blobs (content_offload)
+        bodies = await load_contents(
+            connection,
+            [row.content_hash for row in messages if row.content is None]
+            + [row.user_input_hash for row in turns if row.user_input is None],
+        )
+
+        responses: Dict[str, Dict[str, Optional[str]]] = {}
+        for turn_id, side, content, content_hash in messages:
+            responses.setdefault(turn_id, {})[side] = (
+                content if content is not None else bodies.get(content_hash)
+            )
+
+        conversations: Dict[str, List[Dict[str, Optional[str]]]] = {}
+        for battle_id, turn_id, user_input, user_input_hash in turns:
+            turn_responses = responses.get(turn_id, {})
+            conversations.setdefault(battle_id, []).append(
+                {
+                    "user": user_input if user_input is not None else bodies.get(user_input_hash),
+                    "left": turn_responses.get("left"),
+                    "right": turn_responses.get("right"),
+                }
+            )
+        return conversations
+
+    def _start_or_resume(self, restart: bool) -> ExportState:
+        """
+        Load the state of a previous export with the same settings, or start a new one
+
+        Args:
+            restart: Remove a previous export's files and state
+
+        Returns:
+            ExportState: State to continue from
+        """
+        settings = ExportState(
+            format=self.fmt,
+            since=self.since.isoformat() if self.since else None,
+            until=self.until.isoformat() if self.until else None,
+            rows_per_file=self.rows_per_file,
+        )
+        state_path = self.output_dir / STATE_FILE
+
+        # Leftovers of an interrupted part are always rewritten
+        for partial in self.output_dir.glob(f"{PART_PREFIX}*.partial"):
+            partial.unlink()
+
+        if state_path.exists() and not restart:
+            state = ExportState(**json.loads(state_path.read_text()))
+            same = (state.format, state.since, state.until, state.rows_per_file) == (
+                settings.format,
+                settings.since,
+                settings.until,
+                settings.rows_per_file,
+            )
+            if not same:
+                raise ExportStateError(
+                    f"{self.output_dir} holds an export with other settings "
+                    f"({state.format}, since={state.since}, until={state.until}, "
+                    f"rows_per_file={state.rows_per_file}); use --restart or another --output"
+                )
+            state.completed_at = None
+            return state
+
+        for suffix in SUFFIXES.values():
+            for old in self.output_dir.glob(f"{PART_PREFIX}*{suffix}"):
+                old.unlink()
+        self._save_state(settings)
+        return settings
+
+    def _open_part(self, index: int):
+        """Open part file <index> under its .partial name"""
+        path = self._part_path(index).with_name(self._part_path(index).name + ".partial")
+        return _ParquetPart(path) if self.fmt == "parquet" else _JsonlPart(path)
+
+    def _finish_part(self, part, state: ExportState, rows: int, last_key: tuple) -> None:
+        """Close a part, rename it into place, then checkpoint"""
+        part.close()
+        path = self._part_path(state.parts)
+        os.replace(path.with_name(path.name + ".partial"), path)
+
+        state.parts += 1
+        state.rows += rows
+        state.last_voted_at = _as_utc(last_key[0]).isoformat()
+        state.last_id = last_key[1]
+        state.files.append(path.name)
+        self._save_state(state)
+        logger.info(f"Wrote {path.name} ({rows} rows, {state.rows} total)")
+
+    def _part_path(self, index: int) -> Path:
+        """Final path of part file <index>"""
+        return self.output_dir / f"{PART_PREFIX}{index:05d}{SUFFIXES[self.fmt]}"
+
+    def _save_state(self, state: ExportState) -> None:
+        """Write export_state.json atomically"""
+        path = self.output_dir / STATE_FILE
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(state), indent=2))
+        os.replace(tmp, path)
+
+
+async def run_export(
+    output_dir: Path,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fmt: str = "jsonl",
+    rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    restart: bool = False,
+) -> ExportState:
+    """
+    Run an export on the worker engine
+
+    Args:
+        output_dir: Directory for part files and export_state.json
+        since: Lower voted_at bound (inclusive)
+        until: Upper voted_at bound (exclusive)
+        fmt: "jsonl" or "parquet"
+        rows_per_file: Records per part file
+        batch_size: Votes per cursor fetch
+        restart: Discard a previous export in output_dir
+
+    Returns:
+        ExportState: Final export state
+    """
+    engine = database.init()
+    try:
+        exporter = VoteExporter(
+            engine,
+            output_dir,
+            since=since,
+            until=until,
+            fmt=fmt,
+            rows_per_file=rows_per_file,
+            batch_size=batch_size,
+        )
+        return await exporter.run(restart=restart)
+    finally:
+        await database.dispose()
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(
+        description="Export votes with their conversations to compressed files"
+    )
+    parser.add_argument("--output", type=Path, required=True, help="output directory")
+    parser.add_argument("--since", help="voted_at >= this ISO date/time (UTC if naive)")
+    parser.add_argument("--until", help="voted_at < this ISO date/time (UTC if naive)")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl", help="output format")
+    parser.add_argument(
+        "--rows-per-file", type=int, default=DEFAULT_ROWS_PER_FILE, help="records per part file"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="votes per cursor fetch"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="discard a previous export in --output"
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(
+            run_export(
+                args.output,
+                since=parse_timestamp(args.since),
+                until=parse_timestamp(args.until),
+                fmt=args.format,
+                rows_per_file=args.rows_per_file,
+                batch_size=args.batch_size,
+                restart=args.restart,
+            )
+        )
+    except RuntimeError as e:  # ExportStateError, missing pyarrow
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Leader election for worker replicas
+
+Only one worker replica may aggregate votes at a time: two replicas running
+the hourly job against the same pending votes would double-apply ELO updates.
+
+PostgreSQL: the leader holds a session-level advisory lock on a dedicated
+connection. The lock is released by PostgreSQL as soon as that connection
+closes (process crash, container stop, network loss), so a standby polling
+with pg_try_advisory_lock takes over within one check interval.
+
+Other dialects (SQLite in tests and local dev): single process, always leader.
+
+The current leader and its last heartbeat are written to worker_status.
+
+Fencing: leadership can be lost in the middle of a run (lock connection
+dropped while aggregating on another connection). Leader-only writers call
+ensure_leader() right before each commit; it re-checks the lock on the lock
+connection and raises LeadershipLostError, so a demoted replica stops
+before writing another chunk.
+
+Replay fence: a rating replay (llmbattler_worker.replay) must swap in its
+recomputed ratings while no aggregation run is writing. Each leader run
+takes a second advisory lock (REPLAY_FENCE_KEY) in shared mode on the lock
+connection via enter_aggregation() and skips the run if it cannot; the
+replay takes it exclusively for its final pass, waiting for a running run to
+finish. A queued exclusive request also makes new shared requests fail, so
+runs pause while the replay waits.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import UTC, datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from llmbattler_shared.models import WorkerStatus
+
+
+logger = logging.getLogger("llmbattler_worker.leader")
+
+# Advisory lock key shared by all elo_aggregator replicas ("llmb" in ASCII)
+ADVISORY_LOCK_KEY = 0x6C6C6D62
+
+# Advisory lock key of the replay fence ("llmr"): shared per aggregation run,
+# exclusive while a replay catches up and swaps
+REPLAY_FENCE_KEY = 0x6C6C6D72
+
+WORKER_NAME = "elo_aggregator"
+
+
+class LeadershipLostError(RuntimeError):
+    """Raised by ensure_leader() when this replica no longer holds the leader lock"""
+
+
+def default_instance_id() -> str:
+    """
+    Identify this replica for worker_status (e.g., "worker-7f9c:1")
+
+    Returns:
+        str: "<hostname>:<pid>"
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaderElection:
+    """
+    Advisory-lock based leader election
+
+    Call check() periodically (every few seconds); run leader-only work
+    only while is_leader is True.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_maker: sessionmaker,
+        instance_id: Optional[str] = None,
+        lock_key: int = ADVISORY_LOCK_KEY,
+    ):
+        """
+        Initialize leader election
+
+        Args:
+            engine: Async engine the lock connection is taken from
+            session_maker: Session maker used to record leadership in worker_status
+            instance_id: Identifier of this replica (default: hostname:pid)
+            lock_key: PostgreSQL advisory lock key
+        """
+        self.engine = engine
+        self.session_maker = session_maker
+        self.instance_id = instance_id or default_instance_id()
+        self.lock_key = lock_key
+
+        self._connection: Optional[AsyncConnection] = None
+        self._is_leader = False
+        # Serializes use of the lock connection (check job vs. ensure_leader)
+        self._connection_lock = asyncio.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this replica currently holds leadership"""
+        return self._is_leader
+
+    async def check(self) -> bool:
+        """
+        Acquire leadership, or verify it is still held, and record a heartbeat
+
+        Never raises: database errors demote this replica to standby.
+
+        Returns:
+            bool: True if this replica is the leader
+        """
+        if self.engine.dialect.name != "postgresql":
+            # Single process: nothing to coordinate
+            if not self._is_leader:
+                logger.info(f"Leader election disabled ({self.engine.dialect.name}), leading")
+            self._is_leader = True
+            await self._record_heartbeat()
+            return True
+
+        async with self._connection_lock:
+            if self._is_leader:
+                await self._verify_lock()
+            else:
+                await self._try_acquire_lock()
+
+        if self._is_leader:
+            await self._record_heartbeat()
+        return self._is_leader
+
+    async def ensure_leader(self) -> None:
+        """
+        Fence a leader-only write: verify the advisory lock is still held
+
+        Queries pg_locks on the lock connection, so a lock lost since the
+        last check() (connection dropped, lock released) is caught before
+        the caller commits. On loss the replica steps down.
+
+        Raises:
+            LeadershipLostError: If this replica is not (or no longer) the leader
+        """
+        if not self._is_leader:
+            raise LeadershipLostError(f"{self.instance_id} is not the leader")
+        if self.engine.dialect.name != "postgresql":
+            return
+
+        async with self._connection_lock:
+            held = False
+            try:
+                if self._connection is not None:
+                    # bigint keys are split into classid (high) and objid (low 32 bits)
+                    result = await self._connection.execute(
+                        text(
+                            "SELECT EXISTS (SELECT 1 FROM pg_locks "
+                            "WHERE locktype = 'advisory' AND granted "
+                            "AND pid = pg_backend_pid() "
+                            "AND ((classid::bigint << 32) | objid::bigint) = :key)"
+                        ),
+                        {"key": self.lock_key},
+                    )
+                    held = bool(result.scalar())
+                    await self._connection.commit()
+            except Exception as e:
+                logger.warning(f"Leader lock check failed: {e}")
+
+            if not held:
+                logger.warning(f"Leadership lost by {self.instance_id}, stepping down")
+                self._is_leader = False
+                await self._close_connection()
+                raise LeadershipLostError(f"{self.instance_id} lost the leader lock")
+
+    async def enter_aggregation(self) -> bool:
+        """
+        Take the replay fence (shared) for one aggregation run
+
+        Taken on the lock connection, so it is dropped together with
+        leadership if that connection goes away.
+
+        Returns:
+            bool: True if the run may start (call exit_aggregation() after it),
+                  False while a replay holds or waits for the fence
+        """
+        if self.engine.dialect.name != "postgresql":
+            return True
+
+        async with self._connection_lock:
+            if self._connection is None:
+                return False
+            try:
+                result = await self._connection.execute(
+                    text("SELECT pg_try_advisory_lock_shared(:key)"), {"key": REPLAY_FENCE_KEY}
+                )
+                acquired = bool(result.scalar())
+                await self._connection.commit()
+            except Exception as e:
+                logger.warning(f"Replay fence check failed: {e}")
+                return False
+        return acquired
+
+    async def exit_aggregation(self) -> None:
+        """Release the replay fence taken by enter_aggregation()"""
+        if self.engine.dialect.name != "postgresql":
+            return
+
+        async with self._connection_lock:
+            if self._connection is None:
+                # Connection closed: PostgreSQL already released the fence
+                return
+            try:
+                await self._connection.execute(
+                    text("SELECT pg_advisory_unlock_shared(:key)"), {"key": REPLAY_FENCE_KEY}
+                )
+                await self._connection.commit()
+            except Exception as e:
+                logger.warning(f"Failed to release replay fence: {e}")
+
+    async def release(self) -> None:
+        """Give up leadership (on shutdown) so a standby can take over immediately"""
+        async with self._connection_lock:
+            if self._connection is not None and self._is_leader:
+                try:
+                    await self._connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+                    )
+                    await self._connection.commit()
+                except Exception as e:
+                    logger.warning(f"Failed to release leader lock: {e}")
+
+            if self._is_leader:
+                logger.info(f"Leadership released by {self.instance_id}")
+            self._is_leader = False
+            await self._close_connection()
+
+    async def _try_acquire_lock(self) -> None:
+        """Try to take the advisory lock without blocking"""
+        try:
+            if self._connection is None:
+                self._connection = await self.engine.connect()
+
+            result = await self._connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+            )
+            acquired = bool(result.scalar())
+            # End the implicit transaction; session-level lock outlives it
+            await self._connection.commit()
+        except Exception as e:
+            logger.error(f"Leader election check failed: {e}")
+            await self._close_connection()
+            return
+
+        if acquired:
+            self._is_leader = True
+            logger.info(f"Leadership acquired by {self.instance_id}")
+
+    async def _verify_lock(self) -> None:
+        """Make sure the lock connection (and therefore the lock) is still alive"""
+        try:
+            await self._connection.execute(text("SELECT 1"))
+            await self._connection.commit()
+        except Exception as e:
+            logger.warning(f"Leader connection lost, stepping down: {e}")
+            self._is_leader = False
+            await self._close_connection()
+
+    async def _record_heartbeat(self) -> None:
+        """Write leader_id and leader_heartbeat_at to worker_status"""
+        try:
+            async with self.session_maker() as session:
+                result = await session.execute(
+                    select(WorkerStatus).where(WorkerStatus.worker_name == WORKER_NAME)
+                )
+                worker_status = result.scalar_one_or_none()
+
+                now = datetime.now(UTC)
+                if worker_status is None:
+                    # No run yet: create row so the leader is visible right away
+                    worker_status = WorkerStatus(
+                        worker_name=WORKER_NAME,
+                        last_run_at=now,
+                        status="idle",
+                        votes_processed=0,
+                    )
+                    session.add(worker_status)
+
+                worker_status.leader_id = self.instance_id
+                worker_status.leader_heartbeat_at = now
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record leader heartbeat: {e}")
+
+    async def _close_connection(self) -> None:
+        """Close the lock connection (PostgreSQL releases session-level locks)"""
+        if self._connection is None:
+            return
+        try:
+            await self._connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close leader connection: {e}")
+        self._connection = None
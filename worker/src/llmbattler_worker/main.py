@@ -1,18 +1,27 @@
 """
 Worker main entry point
 
-Runs hourly cron job to aggregate votes from PostgreSQL
-and update ELO ratings.
+Aggregates votes from PostgreSQL and updates ELO ratings:
+- within seconds of new votes (LISTEN/NOTIFY, see notifications.py)
+- on the hourly cron job, as a safety net that also snapshots rating history
+
+When several replicas run, only the elected leader aggregates (see leader.py).
+With WORKER_SCHEDULE_MODE=adaptive the interval follows the backlog instead
+(see scheduling.py).
 """
 
 import asyncio
+import contextlib
+import signal
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Dict
+from typing import Awaitable, Callable, Dict
 
 import yaml
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -20,14 +29,27 @@ from llmbattler_shared.config import settings
 from llmbattler_shared.logging_config import setup_logging
 from llmbattler_shared.models import WorkerStatus
 
+from . import database
 from .aggregators.elo_aggregator import ELOAggregator
 from .database import async_session_maker
+from .leader import LeaderElection
+from .metrics import MetricsServer, get_vote_backlog, record_worker_run
+from .notifications import VoteNotificationTrigger
+from .partitions import VotePartitionManager
+from .retention import ConversationRetention
+from .scheduling import SCHEDULE_MODES, AdaptiveAggregationLoop, SchedulerStats
 
 
 # Configure package-level logging
 # Child modules (e.g., llmbattler_worker.*) will inherit this configuration
 logger = setup_logging("llmbattler_worker")
 
+# Serializes cron and notification-triggered runs within this process
+_aggregation_lock = asyncio.Lock()
+
+# Missed / coalesced aggregation runs (exposed on /metrics)
+scheduler_stats = SchedulerStats()
+
 
 def load_model_configs() -> Dict[str, Dict[str, str]]:
     """
@@ -68,7 +90,11 @@ def load_model_configs() -> Dict[str, Dict[str, str]]:
         return {}
 
 
-async def run_aggregation(session: AsyncSession | None = None):
+async def run_aggregation(
+    session: AsyncSession | None = None,
+    triggered_by: str = "scheduled",
+    fence: Callable[[], Awaitable[None]] | None = None,
+):
     """
     Main aggregation task
 
@@ -76,22 +102,30 @@ async def run_aggregation(session: AsyncSession | None = None):
     1. Read pending votes from PostgreSQL
     2. Calculate ELO ratings for each model
     3. Update model_stats in PostgreSQL
-    4. Update worker_status with execution metadata
+    4. Append rating snapshot to model_rating_history (scheduled runs, if
+       ratings changed since the last snapshot)
+    5. Update worker_status with execution metadata
+    6. Append run metrics (phase timings, backlog) to worker_runs
 
     Args:
         session: Optional database session (for testing). If None, creates own session.
+        triggered_by: "scheduled" (cron), "adaptive" or "notification"
+                      (incremental runs; no history snapshot, so history
+                      keeps one point per scheduled run)
+        fence: Optional check awaited before every chunk commit
+               (LeaderElection.ensure_leader on the leader)
     """
     logger.info("Starting vote aggregation...")
 
     # Use provided session or create new one
     if session is not None:
         # Testing mode: use provided session
-        await _run_aggregation_with_session(session)
+        await _run_aggregation_with_session(session, triggered_by, fence)
     else:
         # Production mode: create own session
         async with async_session_maker() as session:
             try:
-                await _run_aggregation_with_session(session)
+                await _run_aggregation_with_session(session, triggered_by, fence)
             except Exception:
                 await session.rollback()
                 raise
@@ -99,25 +133,154 @@ async def run_aggregation(session: AsyncSession | None = None):
                 await session.close()
 
 
-async def _run_aggregation_with_session(session: AsyncSession):
+async def run_leader_aggregation(election: LeaderElection, triggered_by: str = "scheduled"):
+    """
+    Scheduled aggregation task: runs only on the elected leader
+
+    Args:
+        election: Leader election of this replica
+        triggered_by: "scheduled", "adaptive" or "notification" (see run_aggregation)
+    """
+    if not election.is_leader:
+        if triggered_by == "scheduled":
+            logger.info("Not the leader, skipping vote aggregation")
+        return
+
+    async with _aggregation_lock:
+        if not await election.enter_aggregation():
+            logger.info("Rating replay holds the replay fence, skipping vote aggregation")
+            return
+        try:
+            # Fenced: the run aborts before the next commit if leadership is lost mid-run
+            await run_aggregation(triggered_by=triggered_by, fence=election.ensure_leader)
+        finally:
+            await election.exit_aggregation()
+
+
+async def run_incremental_aggregation(election: LeaderElection):
+    """
+    Notification-triggered aggregation: leader only, no history snapshot
+
+    Args:
+        election: Leader election of this replica
+    """
+    if not election.is_leader:
+        # Standbys receive notifications too; the leader handles them
+        return
+
+    await run_leader_aggregation(election, triggered_by="notification")
+
+
+async def get_pending_vote_count() -> int:
+    """
+    Pending vote count (adaptive scheduling input)
+
+    Returns:
+        int: Votes waiting for aggregation
+    """
+    async with async_session_maker() as session:
+        pending, _ = await get_vote_backlog(session)
+        return pending
+
+
+def _on_aggregation_job_event(event: JobEvent):
+    """
+    Report cron runs APScheduler skipped
+
+    Args:
+        event: EVENT_JOB_MISSED (misfire) or EVENT_JOB_MAX_INSTANCES (previous run
+               still in progress)
+    """
+    if event.job_id != "elo_aggregation":
+        return
+    if event.code == EVENT_JOB_MISSED:
+        scheduler_stats.runs_missed += 1
+        logger.warning(f"Aggregation run missed (due {event.scheduled_run_time})")
+    else:
+        scheduler_stats.runs_coalesced += 1
+        logger.warning("Aggregation still running, coalescing due run")
+
+
+async def run_partition_maintenance(election: LeaderElection):
+    """
+    Daily votes partition maintenance: leader only (see partitions.py)
+
+    Args:
+        election: Leader election of this replica
+    """
+    if not election.is_leader:
+        return
+
+    manager = VotePartitionManager(
+        async_session_maker,
+        months_ahead=settings.worker_vote_partition_months_ahead,
+        retention_months=settings.worker_vote_retention_months,
+        archive_schema=settings.worker_vote_archive_schema,
+    )
+    try:
+        await manager.run()
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+
+
+async def run_conversation_retention(election: LeaderElection):
+    """
+    Hourly conversation retention: leader only (see retention.py)
+
+    Args:
+        election: Leader election of this replica
+    """
+    if not election.is_leader:
+        return
+
+    retention = ConversationRetention(
+        async_session_maker,
+        abandon_hours=settings.worker_battle_abandon_hours,
+        abandoned_retention_days=settings.worker_abandoned_battle_retention_days,
+        unvoted_session_retention_days=settings.worker_unvoted_session_retention_days,
+        batch_size=settings.worker_retention_batch_size,
+        archive_schema=settings.worker_conversation_archive_schema,
+    )
+    try:
+        await retention.run()
+    except Exception as e:
+        logger.error(f"Conversation retention failed: {e}", exc_info=True)
+
+
+async def _run_aggregation_with_session(
+    session: AsyncSession,
+    triggered_by: str = "scheduled",
+    fence: Callable[[], Awaitable[None]] | None = None,
+):
     """
     Run aggregation with provided session
 
     Args:
         session: Database session to use
+        triggered_by: "scheduled" or "notification" (see run_aggregation)
+        fence: Check awaited before every chunk commit (see run_aggregation)
     """
     votes_processed = 0
     status = "success"
     error_message = None
+    started_at = datetime.now(UTC)
+    aggregator = None
 
     try:
         # Load model configs for organization and license info
         model_configs = load_model_configs()
 
         # Run ELO aggregation
-        aggregator = ELOAggregator(session, model_configs=model_configs)
+        aggregator = ELOAggregator(session, model_configs=model_configs, fence=fence)
         votes_processed = await aggregator.process_pending_votes()
 
+        # Keep per-run rating history for trend charts (skip runs with no changes).
+        # Incremental runs consume most votes, so also check for unrecorded changes.
+        if triggered_by == "scheduled" and (
+            votes_processed > 0 or await aggregator.has_unrecorded_rating_changes()
+        ):
+            await aggregator.record_rating_history()
+
         # Update worker_status
         await _update_worker_status(
             session,
@@ -125,6 +288,7 @@ async def _run_aggregation_with_session(session: AsyncSession):
             status=status,
             error_message=error_message,
         )
+        await _record_run(session, aggregator, triggered_by, status, started_at)
 
         logger.info(f"Vote aggregation complete: {votes_processed} votes processed")
 
@@ -132,17 +296,63 @@ async def _run_aggregation_with_session(session: AsyncSession):
         logger.error(f"Aggregation failed: {e}", exc_info=True)
         # Try to update worker_status with error
         try:
+            await session.rollback()  # Committed chunks stay; drop the failed one
             await _update_worker_status(
                 session,
                 votes_processed=0,
                 status="failed",
                 error_message=str(e)[:1000],
             )
+            await _record_run(
+                session, aggregator, triggered_by, "failed", started_at, str(e)[:1000]
+            )
         except Exception as inner_e:
             logger.error(f"Failed to update worker_status: {inner_e}", exc_info=True)
         raise
 
 
+async def _record_run(
+    session: AsyncSession,
+    aggregator: ELOAggregator | None,
+    triggered_by: str,
+    status: str,
+    started_at: datetime,
+    error_message: str | None = None,
+):
+    """
+    Append run metrics to worker_runs
+
+    Args:
+        session: Database session
+        aggregator: Aggregator of this run (None if it failed before starting);
+                    its counts include chunks committed before a failure
+        triggered_by: "scheduled" or "notification"
+        status: 'success' or 'failed'
+        started_at: Run start time
+        error_message: Error message if failed
+    """
+    run = await record_worker_run(
+        session,
+        triggered_by=triggered_by,
+        status=status,
+        started_at=started_at,
+        phase_seconds=aggregator.phase_seconds if aggregator is not None else {},
+        votes_processed=aggregator.votes_processed if aggregator is not None else 0,
+        votes_failed=aggregator.votes_failed if aggregator is not None else 0,
+        votes_retried=aggregator.votes_retried if aggregator is not None else 0,
+        votes_dead_lettered=aggregator.votes_dead_lettered if aggregator is not None else 0,
+        error_message=error_message,
+        retention_days=settings.worker_run_retention_days,
+    )
+    logger.info(
+        f"Run metrics: {run.duration_seconds:.2f}s "
+        f"(load {run.load_seconds:.2f}s, compute {run.compute_seconds:.2f}s, "
+        f"write {run.write_seconds:.2f}s), {run.votes_per_second:.0f} votes/s, "
+        f"{run.votes_retried} retried, {run.votes_dead_lettered} dead-lettered, "
+        f"backlog {run.pending_votes}"
+    )
+
+
 async def _update_worker_status(
     session,
     votes_processed: int,
@@ -185,23 +395,86 @@ async def _update_worker_status(
     logger.info(f"Updated worker_status: {status}, {votes_processed} votes")
 
 
+def _describe_schedule() -> str:
+    """
+    Aggregation schedule for the startup log
+
+    Returns:
+        str: Mode with its interval (min/max delay in adaptive mode)
+    """
+    if settings.worker_schedule_mode == "adaptive":
+        return (
+            f"adaptive, every {settings.worker_adaptive_min_seconds}-"
+            f"{settings.worker_adaptive_max_seconds}s depending on backlog "
+            f"(rating history every {settings.worker_interval_minutes} minute(s))"
+        )
+    return f"fixed, every {settings.worker_interval_minutes} minute(s)"
+
+
 async def main():
     """
     Start worker with scheduler
 
-    Runs every 60 minutes (hourly) at :00 UTC by default
-    Configurable via WORKER_INTERVAL_MINUTES environment variable
+    Aggregates within seconds of new votes (vote notifications), and every
+    60 minutes (hourly) at :00 UTC by default as a safety net.
+    Configurable via WORKER_INTERVAL_MINUTES environment variable, or
+    backlog-driven with WORKER_SCHEDULE_MODE=adaptive. Runs until SIGINT/SIGTERM.
+
+    Raises:
+        ValueError: If worker_schedule_mode is unknown
     """
+    if settings.worker_schedule_mode not in SCHEDULE_MODES:
+        raise ValueError(
+            f"Invalid schedule mode: {settings.worker_schedule_mode} "
+            f"(expected one of {SCHEDULE_MODES})"
+        )
+
     logger.info("Starting llmbattler-worker...")
-    logger.info(f"Scheduler: Every {settings.worker_interval_minutes} minute(s)")
+    logger.info(f"Scheduler: {_describe_schedule()}")
+
+    # Worker connection pool (the backend pool is never created in this process)
+    engine = database.init()
+    if settings.postgres_pool_warm_up:
+        await database.warm_up()
 
     # Create async scheduler
     scheduler = AsyncIOScheduler(timezone=settings.worker_timezone)
 
+    # Leader election: only one replica aggregates, standbys poll for takeover
+    election = LeaderElection(
+        engine,
+        async_session_maker,
+        instance_id=settings.worker_instance_id or None,
+    )
+    await election.check()
+    scheduler.add_job(
+        election.check,
+        trigger=IntervalTrigger(seconds=settings.worker_leader_check_seconds),
+        id="leader_election",
+        name="Leader Election",
+        replace_existing=True,
+    )
+    logger.info(
+        f"Replica {election.instance_id}: "
+        f"{'leader' if election.is_leader else 'standby'}, "
+        f"checking every {settings.worker_leader_check_seconds}s"
+    )
+
     # Schedule aggregation
-    # Note: For interval=60 minutes (1 hour), use CronTrigger for precise :00 execution
-    # For other intervals, use IntervalTrigger
-    if settings.worker_interval_minutes == 60:
+    adaptive_loop = None
+    if settings.worker_schedule_mode == "adaptive":
+        # Run now, then at a backlog-driven pace (see scheduling.py)
+        adaptive_loop = AdaptiveAggregationLoop(
+            run=lambda triggered_by: run_leader_aggregation(election, triggered_by),
+            backlog=get_pending_vote_count,
+            lock=_aggregation_lock,
+            min_seconds=settings.worker_adaptive_min_seconds,
+            max_seconds=settings.worker_adaptive_max_seconds,
+            backlog_target=settings.worker_vote_chunk_size,
+            snapshot_seconds=settings.worker_interval_minutes * 60,
+            stats=scheduler_stats,
+        )
+    elif settings.worker_interval_minutes == 60:
         # Run every hour at :00
         trigger = CronTrigger(
             hour="*",
@@ -212,33 +485,113 @@ async def main():
     else:
         # For other intervals, use IntervalTrigger
         # This runs every N minutes from the start time
-        from apscheduler.triggers.interval import IntervalTrigger
-
         trigger = IntervalTrigger(
             minutes=settings.worker_interval_minutes,
             timezone=settings.worker_timezone,
         )
         logger.info(f"Using IntervalTrigger: every {settings.worker_interval_minutes} minutes")
 
+    if adaptive_loop is None:
+        # One instance at a time; runs missed while busy or down fold into one
+        scheduler.add_job(
+            run_leader_aggregation,
+            trigger=trigger,
+            args=[election],
+            id="elo_aggregation",
+            name="ELO Rating Aggregation",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+        scheduler.add_listener(
+            _on_aggregation_job_event, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+
+    # Near-real-time aggregation: LISTEN for vote notifications (PostgreSQL),
+    # poll for pending votes otherwise
+    vote_trigger = VoteNotificationTrigger(
+        engine,
+        async_session_maker,
+        run=lambda: run_incremental_aggregation(election),
+        channel=settings.vote_notify_channel,
+        debounce_seconds=settings.worker_notify_debounce_seconds,
+    )
+    await vote_trigger.start()
+    scheduler.add_job(
+        vote_trigger.poll,
+        trigger=IntervalTrigger(seconds=settings.worker_poll_seconds),
+        id="vote_notifications",
+        name="Vote Notification Listener",
+        replace_existing=True,
+    )
+    logger.info(
+        f"Vote notifications: {'LISTEN' if vote_trigger.is_listening else 'polling'}, "
+        f"debounce {settings.worker_notify_debounce_seconds}s"
+    )
+
+    # Votes partitions: create upcoming months, archive expired ones
+    await run_partition_maintenance(election)
+    scheduler.add_job(
+        run_partition_maintenance,
+        trigger=CronTrigger(hour="3", minute="30", timezone=settings.worker_timezone),
+        args=[election],
+        id="vote_partitions",
+        name="Votes Partition Maintenance",
+        replace_existing=True,
+    )
+
+    # Conversations: mark idle battles abandoned, purge expired ones
     scheduler.add_job(
-        run_aggregation,
-        trigger=trigger,
-        id="elo_aggregation",
-        name="ELO Rating Aggregation",
+        run_conversation_retention,
+        trigger=CronTrigger(minute="15", timezone=settings.worker_timezone),
+        args=[election],
+        id="conversation_retention",
+        name="Conversation Retention",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
 
+    # Metrics endpoint (run history, backlog and lag)
+    metrics_server = None
+    if settings.worker_metrics_port > 0:
+        metrics_server = MetricsServer(
+            async_session_maker,
+            election,
+            host=settings.worker_metrics_host,
+            port=settings.worker_metrics_port,
+            scheduler_stats=scheduler_stats,
+        )
+        await metrics_server.start()
+
+    # Shut down on SIGINT (Ctrl+C) / SIGTERM (docker stop)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):  # Windows
+            loop.add_signal_handler(signum, stop.set)
+
     # Start scheduler
     scheduler.start()
+    adaptive_task = None
+    if adaptive_loop is not None:
+        adaptive_task = asyncio.create_task(adaptive_loop.run_forever(stop))
     logger.info("Worker started. Press Ctrl+C to exit.")
 
     # Keep running
     try:
-        while True:
-            await asyncio.sleep(1)
-    except (KeyboardInterrupt, SystemExit):
+        await stop.wait()
+    finally:
         logger.info("Shutting down worker...")
+        stop.set()
         scheduler.shutdown()
+        if adaptive_task is not None:
+            await adaptive_task  # Finishes a run in progress
+        await vote_trigger.stop()
+        if metrics_server is not None:
+            await metrics_server.stop()
+        await election.release()
+        await database.dispose()
         logger.info("Worker shutdown complete")
 
 
@@ -0,0 +1,343 @@
+"""
+Worker run metrics and aggregation lag
+
+Every aggregation run is recorded in worker_runs (phase timings, votes/sec,
+backlog left behind). A small HTTP listener exposes them in the Prometheus
+text format, together with the live backlog, so alerts can fire on
+aggregation lag before users notice a stale leaderboard:
+
+    GET /metrics  Prometheus text exposition
+    GET /health   "ok" while the event loop is serving
+
+The backlog (pending vote count, oldest pending vote age) is queried on each
+scrape, so the lag keeps growing in the metrics even if runs stop. The
+worker's database pool metrics (llmbattler_db_pool_*, see
+llmbattler_shared.pool_metrics) are appended.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from llmbattler_shared import pool_metrics
+from llmbattler_shared.models import Vote, WorkerRun
+
+from .leader import WORKER_NAME, LeaderElection
+from .scheduling import SchedulerStats
+
+
+logger = logging.getLogger("llmbattler_worker.metrics")
+
+# Seconds to wait for a scraper to send its request
+REQUEST_TIMEOUT_SECONDS = 5
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite) as UTC"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+async def get_vote_backlog(session: AsyncSession) -> Tuple[int, Optional[float]]:
+    """
+    Measure votes waiting for aggregation
+
+    Args:
+        session: Database session
+
+    Returns:
+        Tuple[int, Optional[float]]: (pending vote count, age of the oldest
+                                     pending vote in seconds, None if none)
+    """
+    result = await session.execute(
+        select(func.count(Vote.id), func.min(Vote.voted_at)).where(
+            Vote.processing_status == "pending"
+        )
+    )
+    pending, oldest = result.one()
+    if oldest is None:
+        return pending, None
+    return pending, (datetime.now(UTC) - _as_utc(oldest)).total_seconds()
+
+
+async def get_failed_vote_counts(session: AsyncSession) -> Tuple[int, int]:
+    """
+    Count votes that failed processing
+
+    Args:
+        session: Database session
+
+    Returns:
+        Tuple[int, int]: (votes awaiting a retry, dead-lettered votes)
+    """
+    result = await session.execute(
+        select(Vote.processing_status, func.count(Vote.id))
+        .where(Vote.processing_status.in_(("failed", "dead_letter")))
+        .group_by(Vote.processing_status)
+    )
+    counts = dict(result.all())
+    return counts.get("failed", 0), counts.get("dead_letter", 0)
+
+
+async def record_worker_run(
+    session: AsyncSession,
+    triggered_by: str,
+    status: str,
+    started_at: datetime,
+    phase_seconds: Dict[str, float],
+    votes_processed: int,
+    votes_failed: int,
+    votes_retried: int = 0,
+    votes_dead_lettered: int = 0,
+    error_message: Optional[str] = None,
+    retention_days: int = 0,
+) -> WorkerRun:
+    """
+    Append a worker_runs row, including the backlog left after the run
+
+    Args:
+        session: Database session
+        triggered_by: 'scheduled', 'adaptive' or 'notification'
+        status: 'success' or 'failed'
+        started_at: Run start time
+        phase_seconds: Seconds per phase (load, compute, write)
+        votes_processed: Votes applied in this run
+        votes_failed: Votes that failed in this run
+        votes_retried: Failed votes re-attempted in this run
+        votes_dead_lettered: Votes that exhausted their retries in this run
+        error_message: Error message if the run failed
+        retention_days: Delete rows older than this many days (0 = keep all)
+
+    Returns:
+        WorkerRun: Recorded run
+    """
+    finished_at = datetime.now(UTC)
+    duration = (finished_at - started_at).total_seconds()
+    pending, oldest_age = await get_vote_backlog(session)
+
+    run = WorkerRun(
+        worker_name=WORKER_NAME,
+        triggered_by=triggered_by,
+        status=status,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_seconds=duration,
+        load_seconds=phase_seconds.get("load", 0.0),
+        compute_seconds=phase_seconds.get("compute", 0.0),
+        write_seconds=phase_seconds.get("write", 0.0),
+        votes_processed=votes_processed,
+        votes_failed=votes_failed,
+        votes_retried=votes_retried,
+        votes_dead_lettered=votes_dead_lettered,
+        votes_per_second=votes_processed / duration if duration > 0 else 0.0,
+        pending_votes=pending,
+        oldest_pending_age_seconds=oldest_age,
+        error_message=error_message,
+    )
+    session.add(run)
+
+    if retention_days > 0:
+        await session.execute(
+            delete(WorkerRun).where(
+                WorkerRun.started_at < finished_at - timedelta(days=retention_days)
+            )
+        )
+
+    await session.commit()
+    return run
+
+
+class MetricsServer:
+    """Minimal HTTP listener serving /metrics and /health"""
+
+    def __init__(
+        self,
+        session_maker: sessionmaker,
+        election: Optional[LeaderElection],
+        host: str,
+        port: int,
+        scheduler_stats: Optional[SchedulerStats] = None,
+    ):
+        """
+        Initialize metrics server
+
+        Args:
+            session_maker: Session maker for backlog and run queries
+            election: Leader election of this replica (None = not reported)
+            host: Listen address
+            port: Listen port (0 = any free port)
+            scheduler_stats: Missed/coalesced run counters (None = not reported)
+        """
+        self.session_maker = session_maker
+        self.election = election
+        self.scheduler_stats = scheduler_stats
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Metrics listening on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop listening"""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def render(self) -> str:
+        """
+        Build the Prometheus text exposition
+
+        Returns:
+            str: Metrics text
+        """
+        async with self.session_maker() as session:
+            pending, oldest_age = await get_vote_backlog(session)
+            awaiting_retry, dead_lettered = await get_failed_vote_counts(session)
+            last_run = (
+                await session.execute(
+                    select(WorkerRun)
+                    .where(WorkerRun.worker_name == WORKER_NAME)
+                    .order_by(WorkerRun.started_at.desc())
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+            last_success = (
+                await session.execute(
+                    select(func.max(WorkerRun.finished_at)).where(
+                        WorkerRun.worker_name == WORKER_NAME, WorkerRun.status == "success"
+                    )
+                )
+            ).scalar()
+
+        lines: List[str] = []
+
+        def metric(name: str, help_text: str, samples: Dict[str, float]) -> None:
+            # Monotonic *_total series are counters, everything else is a gauge
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# HELP llmbattler_worker_{name} {help_text}")
+            lines.append(f"# TYPE llmbattler_worker_{name} {kind}")
+            for labels, value in samples.items():
+                lines.append(f"llmbattler_worker_{name}{labels} {value}")
+
+        metric("pending_votes", "Votes waiting for aggregation", {"": pending})
+        metric(
+            "oldest_pending_vote_age_seconds",
+            "Age of the oldest pending vote (0 if none)",
+            {"": oldest_age or 0.0},
+        )
+        metric("votes_awaiting_retry", "Failed votes scheduled for a retry", {"": awaiting_retry})
+        metric("dead_letter_votes", "Votes that exhausted their retries", {"": dead_lettered})
+        if self.election is not None:
+            metric("is_leader", "1 if this replica aggregates", {"": int(self.election.is_leader)})
+        if self.scheduler_stats is not None:
+            stats = self.scheduler_stats
+            metric(
+                "runs_missed_total",
+                "Due runs that started an interval or more late",
+                {"": stats.runs_missed},
+            )
+            metric(
+                "runs_coalesced_total",
+                "Due runs folded into a run in progress",
+                {"": stats.runs_coalesced},
+            )
+            if stats.next_interval_seconds is not None:
+                metric(
+                    "next_run_interval_seconds",
+                    "Delay before the next adaptive run",
+                    {"": stats.next_interval_seconds},
+                )
+        if last_success is not None:
+            metric(
+                "last_success_timestamp_seconds",
+                "End of the last successful run (Unix time)",
+                {"": _as_utc(last_success).timestamp()},
+            )
+        if last_run is not None:
+            metric(
+                "last_run_timestamp_seconds",
+                "End of the last run (Unix time)",
+                {"": _as_utc(last_run.finished_at).timestamp()},
+            )
+            metric(
+                "last_run_success",
+                "1 if the last run succeeded",
+                {"": int(last_run.status == "success")},
+            )
+            metric(
+                "last_run_duration_seconds",
+                "Duration of the last run, total and per phase",
+                {
+                    '{phase="total"}': last_run.duration_seconds,
+                    '{phase="load"}': last_run.load_seconds,
+                    '{phase="compute"}': last_run.compute_seconds,
+                    '{phase="write"}': last_run.write_seconds,
+                },
+            )
+            metric(
+                "last_run_votes",
+                "Votes handled by the last run",
+                {
+                    '{result="processed"}': last_run.votes_processed,
+                    '{result="failed"}': last_run.votes_failed,
+                    '{result="retried"}': last_run.votes_retried,
+                    '{result="dead_lettered"}': last_run.votes_dead_lettered,
+                },
+            )
+            metric(
+                "last_run_votes_per_second",
+                "Throughput of the last run",
+                {"": last_run.votes_per_second},
+            )
+
+        return "\n".join(lines) + "\n" + pool_metrics.render()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP request, then close the connection"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_SECONDS)
+            # Skip headers (no request body is expected)
+            while (await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_SECONDS)).strip():
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) >= 2 else ""
+            if len(parts) < 2 or parts[0] != "GET":
+                status, body = "405 Method Not Allowed", "method not allowed\n"
+            elif path == "/metrics":
+                try:
+                    status, body = "200 OK", await self.render()
+                except Exception as e:
+                    logger.error(f"Failed to render metrics: {e}")
+                    status, body = "503 Service Unavailable", "metrics unavailable\n"
+            elif path == "/health":
+                status, body = "200 OK", "ok\n"
+            else:
+                status, body = "404 Not Found", "not found\n"
+
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+                + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,174 @@
+"""
+Near-real-time aggregation trigger
+
+The backend sends a PostgreSQL NOTIFY (settings.vote_notify_channel) when a
+vote commits. The worker LISTENs on a dedicated connection and runs an
+incremental aggregation a few seconds later, so new votes reach the
+leaderboard within seconds instead of at the next hourly run.
+
+Debouncing: the first notification schedules a run after
+worker_notify_debounce_seconds; notifications arriving while waiting or
+running are folded into one follow-up run. A burst of votes therefore costs
+one or two runs, and latency stays bounded by debounce + run time.
+
+Fallbacks (poll every worker_poll_seconds):
+- SQLite (tests, local dev) has no LISTEN: check for pending votes instead
+- PostgreSQL listener connection lost: reconnect, then run once to pick up
+  votes whose notifications were missed
+
+The hourly cron job keeps running as a safety net.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from llmbattler_shared.models import Vote
+
+
+logger = logging.getLogger("llmbattler_worker.notifications")
+
+
+class VoteNotificationTrigger:
+    """
+    Run aggregation shortly after votes arrive (LISTEN/NOTIFY or polling)
+
+    Call start() once, poll() periodically and stop() on shutdown.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_maker: sessionmaker,
+        run: Callable[[], Awaitable[Any]],
+        channel: str,
+        debounce_seconds: float,
+    ):
+        """
+        Initialize trigger
+
+        Args:
+            engine: Async engine the listener connection is taken from
+            session_maker: Session maker used to poll for pending votes
+            run: Aggregation coroutine function (called without arguments)
+            channel: NOTIFY channel the backend publishes on
+            debounce_seconds: Delay between a notification and the run
+        """
+        self.engine = engine
+        self.session_maker = session_maker
+        self.run = run
+        self.channel = channel
+        self.debounce_seconds = debounce_seconds
+
+        self._connection: Optional[AsyncConnection] = None
+        self._driver_connection: Any = None
+        self._requested = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_listening(self) -> bool:
+        """Whether the LISTEN connection is open"""
+        return self._driver_connection is not None and not self._driver_connection.is_closed()
+
+    async def start(self) -> None:
+        """Start listening (PostgreSQL) and catch up on votes already pending"""
+        await self.poll()
+
+    async def poll(self) -> None:
+        """
+        Keep the listener connected, or fall back to checking for pending votes
+
+        Never raises: errors are logged and retried on the next poll.
+        """
+        if self.engine.dialect.name == "postgresql":
+            if not self.is_listening:
+                await self._listen()
+            if self.is_listening:
+                return
+
+        try:
+            if await self._has_pending_votes():
+                self.request_run()
+        except Exception as e:
+            logger.warning(f"Pending vote poll failed: {e}")
+
+    def request_run(self) -> None:
+        """Schedule a debounced aggregation run (coalesces with a pending one)"""
+        self._requested = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Stop listening and cancel a scheduled run"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self._close_connection()
+
+    async def _drain(self) -> None:
+        """Run aggregation until no request arrived during the last run"""
+        while self._requested:
+            await asyncio.sleep(self.debounce_seconds)
+            self._requested = False
+            try:
+                await self.run()
+            except Exception as e:
+                # Keep the trigger alive; cron and the next notification retry
+                logger.error(f"Triggered aggregation failed: {e}", exc_info=True)
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """asyncpg listener callback (runs on the event loop)"""
+        logger.debug(f"Vote notification: {payload}")
+        self.request_run()
+
+    async def _listen(self) -> None:
+        """Open the listener connection and LISTEN on the channel"""
+        await self._close_connection()
+        try:
+            self._connection = await self.engine.connect()
+            raw_connection = await self._connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(self.channel, self._on_notification)
+        except Exception as e:
+            logger.warning(f"LISTEN {self.channel} failed, polling instead: {e}")
+            if self._connection is not None:
+                await self._connection.invalidate()
+                self._connection = None
+            return
+
+        self._driver_connection = driver_connection
+        logger.info(f"Listening for vote notifications on '{self.channel}'")
+        # Votes committed while not listening sent no notification we received
+        self.request_run()
+
+    async def _has_pending_votes(self) -> bool:
+        """Whether at least one vote waits for aggregation"""
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(Vote.id).where(Vote.processing_status == "pending").limit(1)
+            )
+            return result.first() is not None
+
+    async def _close_connection(self) -> None:
+        """Stop listening and return the connection to the pool (or discard it)"""
+        driver_connection, self._driver_connection = self._driver_connection, None
+        if self._connection is None:
+            return
+        try:
+            if driver_connection is not None and not driver_connection.is_closed():
+                # UNLISTEN before the connection goes back to the pool
+                await driver_connection.remove_listener(self.channel, self._on_notification)
+                await self._connection.close()
+            else:
+                await self._connection.invalidate()
+        except Exception as e:
+            logger.warning(f"Failed to close listener connection: {e}")
+        self._connection = None
@@ -0,0 +1,281 @@
+"""
+Votes partition maintenance (PostgreSQL)
+
+The votes table is range-partitioned by month on voted_at (votes_pYYYY_MM,
+UTC bounds) with a default partition for anything outside them. A daily
+leader-only job keeps it healthy:
+
+- Creates partitions worker_vote_partition_months_ahead months ahead, so
+  inserts never land in the default partition. Rows that did (e.g. the
+  worker was down over a month boundary) are moved into the new partition.
+- Archives partitions older than worker_vote_retention_months: the partition
+  is detached and moved to the worker_vote_archive_schema schema, where it
+  stays queryable but is no longer scanned, indexed or replayed. Partitions
+  still holding pending or failed votes are kept until those are resolved.
+
+No-op on other databases (SQLite tests and local dev use a plain table).
+"""
+
+import logging
+import re
+from datetime import UTC, datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+
+logger = logging.getLogger("llmbattler_worker.partitions")
+
+PARENT_TABLE = "votes"
+DEFAULT_PARTITION = "votes_default"
+_PARTITION_NAME = re.compile(r"^votes_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    """
+    First instant of the value's month (UTC)
+
+    Args:
+        value: Timestamp (naive timestamps are treated as UTC)
+
+    Returns:
+        datetime: Month start, timezone-aware UTC
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return datetime(value.year, value.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """
+    Shift a month start by a number of months
+
+    Args:
+        month: Month start (see month_start)
+        months: Months to add (negative to go back)
+
+    Returns:
+        datetime: Shifted month start
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(month: datetime) -> str:
+    """
+    Name of a month's partition, e.g. votes_p2026_10
+
+    Args:
+        month: Any timestamp within the month
+
+    Returns:
+        str: Partition table name
+    """
+    return f"votes_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """
+    Month covered by a partition
+
+    Args:
+        name: Partition table name
+
+    Returns:
+        Optional[datetime]: Month start, None if not a monthly partition
+    """
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=UTC)
+
+
+def missing_partitions(existing: Iterable[str], now: datetime, months_ahead: int) -> List[datetime]:
+    """
+    Months from the current one to months_ahead ahead that have no partition
+
+    Args:
+        existing: Names of attached partitions
+        now: Current time
+        months_ahead: Months to create beyond the current one
+
+    Returns:
+        List[datetime]: Month starts to create, oldest first
+    """
+    existing = set(existing)
+    current = month_start(now)
+    months = (add_months(current, offset) for offset in range(months_ahead + 1))
+    return [month for month in months if partition_name(month) not in existing]
+
+
+def expired_partitions(existing: Iterable[str], now: datetime, retention_months: int) -> List[str]:
+    """
+    Partitions entirely older than the retention window
+
+    Args:
+        existing: Names of attached partitions
+        now: Current time
+        retention_months: Full months kept before the current one (0 = keep all)
+
+    Returns:
+        List[str]: Partition names to archive, oldest first
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -retention_months)
+    expired = [
+        (month, name)
+        for name in existing
+        if (month := partition_month(name)) is not None and month < cutoff
+    ]
+    return [name for _, name in sorted(expired)]
+
+
+class VotePartitionManager:
+    """Create upcoming votes partitions and archive expired ones"""
+
+    def __init__(
+        self,
+        session_maker: sessionmaker,
+        months_ahead: int,
+        retention_months: int,
+        archive_schema: str,
+    ):
+        """
+        Initialize partition manager
+
+        Args:
+            session_maker: Session maker (one transaction per partition change)
+            months_ahead: Months of partitions kept ahead of the current one
+            retention_months: Full months kept attached before the current one
+                              (0 = never archive)
+            archive_schema: Schema detached partitions are moved to
+        """
+        self.session_maker = session_maker
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_schema = archive_schema
+
+    async def run(self, now: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+        """
+        Create missing partitions, then archive expired ones
+
+        A failing partition is logged and skipped; the others still run.
+
+        Args:
+            now: Current time (default: now, UTC)
+
+        Returns:
+            Tuple[List[str], List[str]]: (created partitions, archived partitions)
+        """
+        now = now or datetime.now(UTC)
+        created: List[str] = []
+        archived: List[str] = []
+
+        async with self.session_maker() as session:
+            if session.bind.dialect.name != "postgresql":
+                return created, archived
+            existing = await self._attached_partitions(session)
+
+        for month in missing_partitions(existing, now, self.months_ahead):
+            name = partition_name(month)
+            try:
+                async with self.session_maker() as session:
+                    moved = await self._create_partition(session, month)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Failed to create partition {name}: {e}")
+                continue
+            created.append(name)
+            logger.info(f"Created partition {name} ({moved} rows moved from {DEFAULT_PARTITION})")
+
+        for name in expired_partitions(existing, now, self.retention_months):
+            try:
+                async with self.session_maker() as session:
+                    if await self._has_unprocessed_votes(session, name):
+                        logger.warning(f"Keeping expired partition {name}: unprocessed votes")
+                        continue
+                    await self._archive_partition(session, name)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Failed to archive partition {name}: {e}")
+                continue
+            archived.append(name)
+            logger.info(f"Archived partition {name} to schema {self.archive_schema}")
+
+        return created, archived
+
+    async def _attached_partitions(self, session: AsyncSession) -> List[str]:
+        """Names of partitions currently attached to votes"""
+        result = await session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return [row[0] for row in result.all()]
+
+    async def _create_partition(self, session: AsyncSession, month: datetime) -> int:
+        """
+        Create a month's partition, moving matching rows out of the default partition
+
+        CREATE TABLE ... PARTITION OF fails if the default partition holds rows
+        for the range, so the table is built standalone, filled and attached.
+
+        Args:
+            session: Database session (caller commits)
+            month: Month start
+
+        Returns:
+            int: Rows moved from the default partition
+        """
+        quote = session.bind.dialect.identifier_preparer.quote
+        name = quote(partition_name(month))
+        bounds = {"start": month, "end": add_months(month, 1)}
+
+        await session.execute(
+            text(
+                f"CREATE TABLE {name} "
+                f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        moved = await session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                "WHERE voted_at >= :start AND voted_at < :end RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        # Bounds are literals in DDL (no bind parameters)
+        await session.execute(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') "
+                f"TO ('{bounds['end'].isoformat()}')"
+            )
+        )
+        return moved.rowcount
+
+    async def _has_unprocessed_votes(self, session: AsyncSession, name: str) -> bool:
+        """Whether a partition holds votes the worker still has to process"""
+        quote = session.bind.dialect.identifier_preparer.quote
+        result = await session.execute(
+            text(
+                f"SELECT 1 FROM {quote(name)} "
+                "WHERE processing_status IN ('pending', 'failed') LIMIT 1"
+            )
+        )
+        return result.first() is not None
+
+    async def _archive_partition(self, session: AsyncSession, name: str) -> None:
+        """Detach a partition and move it to the archive schema (caller commits)"""
+        quote = session.bind.dialect.identifier_preparer.quote
+        schema = quote(self.archive_schema)
+        await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {quote(name)}"))
+        await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        await session.execute(text(f"ALTER TABLE {quote(name)} SET SCHEMA {schema}"))
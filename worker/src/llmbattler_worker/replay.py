@@ -0,0 +1,426 @@
+"""
+Full rating recompute (replay mode)
+
+Rebuilds model_stats, model_segment_stats and model_pairwise_stats from the
+votes table, e.g. after a K-factor change, a bug fix or a data purge.
+
+Usage (from worker/):
+    uv run python -m llmbattler_worker.replay              # Start or resume
+    uv run python -m llmbattler_worker.replay --restart    # Discard progress, start over
+    uv run python -m llmbattler_worker.replay --fence-timeout 0    # Wait for running aggregation indefinitely
+
+Workflow:
+1. Create shadow tables (<table>_replay) and start a rating_replays row, or
+   resume the running one. Its cutoff is the voted_at of the oldest vote not
+   yet processed (pending or failed), or the start time if there is none:
+   every vote before the cutoff is already processed, so no vote the live
+   worker processes later can sort before it
+2. Stream processed votes with voted_at < cutoff ordered by (voted_at, id)
+   through a server-side cursor on a dedicated read connection
+3. Apply them with the aggregator's in-memory logic; each chunk writes the
+   shadow rows and the checkpoint (last voted_at, id) in one transaction
+4. Take the replay fence (an advisory lock every leader aggregation run
+   holds in shared mode, see llmbattler_worker.leader), waiting up to
+   --fence-timeout seconds for a running aggregation run to finish. New runs
+   are skipped from the moment the replay starts waiting
+5. With the fence held, continue from the checkpoint over every processed
+   vote, still in (voted_at, id) order (catch-up pass), then in one
+   transaction replace live stats rows with the shadow rows and mark the
+   replay completed; release the fence and drop the shadow tables
+
+Memory is bounded by the number of models and pairs, not the number of votes.
+Live workers keep running during steps 1-3 and pause only for step 5. The
+result only depends on the processed votes, not on when the live worker
+processed them. If the fence is not acquired in time, ReplayLockedError is
+raised with progress checkpointed; re-run to finish.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Column, MetaData, Table, UniqueConstraint, delete, func, insert, text, tuple_
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import select
+
+from llmbattler_shared.models import (
+    ModelPairwiseStats,
+    ModelSegmentStats,
+    ModelStats,
+    RatingReplay,
+    Vote,
+)
+
+from .aggregators.elo_aggregator import ELOAggregator
+from .database import async_session_maker
+from .leader import REPLAY_FENCE_KEY
+from .main import load_model_configs
+
+
+logger = logging.getLogger("llmbattler_worker.replay")
+
+# Seconds to wait for the replay fence before giving up (0 = wait indefinitely)
+DEFAULT_FENCE_TIMEOUT_SECONDS = 600.0
+
+_shadow_metadata = MetaData()
+
+
+def _shadow_table(table: Table, unique_columns: Sequence[str]) -> Table:
+    """
+    Copy of a stats table for replay output
+
+    Secondary indexes are not copied (index names are unique per schema and
+    the shadow table is only written by upserts and read once at swap time).
+
+    Args:
+        table: Live stats table
+        unique_columns: Columns of the upsert conflict target
+
+    Returns:
+        Table: <table>_replay definition
+    """
+    return Table(
+        f"{table.name}_replay",
+        _shadow_metadata,
+        *(
+            Column(
+                column.name, column.type, primary_key=column.primary_key, nullable=column.nullable
+            )
+            for column in table.columns
+        ),
+        UniqueConstraint(*unique_columns),
+    )
+
+
+SHADOW_MODEL_STATS = _shadow_table(ModelStats.__table__, ["model_id"])
+SHADOW_SEGMENT_STATS = _shadow_table(
+    ModelSegmentStats.__table__, ["segment_type", "segment_value", "model_id"]
+)
+SHADOW_PAIRWISE_STATS = _shadow_table(ModelPairwiseStats.__table__, ["model_a_id", "model_b_id"])
+
+
+class ReplayLockedError(RuntimeError):
+    """Raised when the replay fence is not acquired within the fence timeout"""
+
+
+class RatingReplayer(ELOAggregator):
+    """
+    Recompute all ratings from the votes table into shadow tables, then swap
+
+    Reuses ELOAggregator's in-memory rating logic and bulk write-back,
+    pointed at the shadow tables.
+    """
+
+    model_stats_table = SHADOW_MODEL_STATS
+    segment_stats_table = SHADOW_SEGMENT_STATS
+    pairwise_stats_table = SHADOW_PAIRWISE_STATS
+
+    async def run(
+        self, restart: bool = False, fence_timeout: float = DEFAULT_FENCE_TIMEOUT_SECONDS
+    ) -> int:
+        """
+        Run (or resume) a full replay and swap the result in
+
+        Args:
+            restart: Discard a running replay and start from the first vote
+            fence_timeout: Seconds to wait for the replay fence (0 = no limit)
+
+        Returns:
+            int: Number of votes replayed in total
+
+        Raises:
+            ReplayLockedError: If an aggregation run kept the replay fence past
+                               fence_timeout (progress stays checkpointed; re-run)
+        """
+        await self._create_shadow_tables()
+        replay = await self._start_or_resume(restart)
+        await self._load_rating_state()
+
+        # Stream votes before the cutoff, checkpointing every chunk
+        await self._replay_votes(replay, Vote.voted_at < replay.cutoff_at, checkpoint=True)
+        streamed = replay.votes_replayed
+
+        # Pause live aggregation, catch up from the checkpoint and swap in one transaction
+        async with self._replay_fence(fence_timeout, replay):
+            await self._replay_votes(replay, None, checkpoint=False)
+            caught_up = replay.votes_replayed - streamed
+
+            if self._has_refinements():
+                await self._refine_ratings()
+            await self._write_rating_state()
+
+            await self._swap()
+            replay.status = "completed"
+            replay.completed_at = datetime.now(UTC)
+            replay.updated_at = replay.completed_at
+            votes_replayed = replay.votes_replayed
+            await self.session.commit()
+
+        await self._drop_shadow_tables()
+        self.session.expire_all()
+        await self.record_rating_history()
+
+        logger.info(
+            f"Replay complete: {votes_replayed} votes ({caught_up} applied in catch-up pass)"
+        )
+        return votes_replayed
+
+    async def _replay_votes(self, replay: RatingReplay, condition: Any, checkpoint: bool) -> None:
+        """
+        Apply processed votes after the replay's checkpoint, in (voted_at, id) order
+
+        Args:
+            replay: Replay row; its position and vote count are advanced
+            condition: Extra vote filter (None = every processed vote)
+            checkpoint: Write the shadow rows and commit the position after
+                        every chunk (otherwise the caller commits)
+        """
+        after = None
+        if replay.last_vote_id is not None:
+            after = (replay.last_voted_at, replay.last_vote_id)
+
+        async for votes in self._stream_votes(condition, after):
+            self._apply_votes(votes)
+            replay.last_voted_at = votes[-1].voted_at
+            replay.last_vote_id = votes[-1].id
+            replay.votes_replayed += len(votes)
+            replay.updated_at = datetime.now(UTC)
+
+            if checkpoint:
+                await self._write_rating_state()
+                await self.session.commit()
+                logger.info(f"Replay checkpoint: {replay.votes_replayed} votes")
+
+    @asynccontextmanager
+    async def _replay_fence(self, timeout: float, replay: RatingReplay):
+        """
+        Hold the replay fence exclusively (PostgreSQL; no-op elsewhere)
+
+        pg_advisory_lock waits in PostgreSQL's lock queue, bounded by a
+        transaction-local lock_timeout; the session-level lock is held on a
+        dedicated connection until the caller's block ends.
+
+        Args:
+            timeout: Seconds to wait (0 = no limit)
+            replay: Running replay (for the error message)
+
+        Raises:
+            ReplayLockedError: If the fence was not acquired within timeout
+        """
+        if self.session.bind.dialect.name != "postgresql":
+            yield
+            return
+
+        async with self.session.bind.connect() as connection:
+            logger.info("Waiting for the replay fence (running aggregation to finish)")
+            try:
+                await connection.execute(
+                    text("SELECT set_config('lock_timeout', :timeout, true)"),
+                    {"timeout": f"{int(timeout * 1000)}ms"},
+                )
+                await connection.execute(
+                    text("SELECT pg_advisory_lock(:key)"), {"key": REPLAY_FENCE_KEY}
+                )
+                await connection.commit()
+            except DBAPIError as e:
+                raise ReplayLockedError(
+                    f"Aggregation kept the replay fence for over {timeout:g}s; re-run to "
+                    f"finish (checkpoint: {replay.votes_replayed} votes)"
+                ) from e
+
+            try:
+                yield
+            finally:
+                try:
+                    await connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": REPLAY_FENCE_KEY}
+                    )
+                    await connection.commit()
+                except Exception as e:
+                    # Closing the connection releases it as well
+                    logger.warning(f"Failed to release replay fence: {e}")
+
+    async def _start_or_resume(self, restart: bool) -> RatingReplay:
+        """
+        Resume the running replay, or start a new one with empty shadow tables
+
+        Args:
+            restart: Abandon a running replay instead of resuming it
+
+        Returns:
+            RatingReplay: Replay row attached to the session
+        """
+        result = await self.session.execute(
+            select(RatingReplay)
+            .where(RatingReplay.status == "running")
+            .order_by(RatingReplay.id.desc())
+        )
+        replay = result.scalars().first()
+
+        if replay is not None and not restart:
+            logger.info(
+                f"Resuming replay {replay.id} after {replay.votes_replayed} votes "
+                f"(cutoff {replay.cutoff_at.isoformat()})"
+            )
+            return replay
+
+        if replay is not None:
+            logger.info(f"Abandoning replay {replay.id}")
+            replay.status = "abandoned"
+            replay.updated_at = datetime.now(UTC)
+
+        for table in (SHADOW_MODEL_STATS, SHADOW_SEGMENT_STATS, SHADOW_PAIRWISE_STATS):
+            await self.session.execute(delete(table))
+
+        # Votes the live worker has yet to process are all at or after the cutoff
+        oldest_unprocessed = await self.session.scalar(
+            select(func.min(Vote.voted_at)).where(Vote.processing_status.in_(("pending", "failed")))
+        )
+        replay = RatingReplay(cutoff_at=oldest_unprocessed or datetime.now(UTC))
+        self.session.add(replay)
+        await self.session.commit()
+
+        logger.info(f"Started replay {replay.id} (cutoff {replay.cutoff_at.isoformat()})")
+        return replay
+
+    async def _stream_votes(self, condition: Any, after: Optional[tuple]):
+        """
+        Stream processed votes in (voted_at, id) order, one chunk at a time
+
+        Uses a server-side cursor on its own connection, so commits on the
+        write session do not close it.
+
+        Args:
+            condition: Extra filter (voted_at before the cutoff), None for none
+            after: Resume after this (voted_at, id), None to start at the beginning
+
+        Yields:
+            Sequence of vote rows (at most chunk_size)
+        """
+        stmt = (
+            select(
+                Vote.id,
+                Vote.vote_id,
+                Vote.vote,
+                Vote.left_model_id,
+                Vote.right_model_id,
+                Vote.voted_at,
+            )
+            .where(Vote.processing_status == "processed")
+            .order_by(Vote.voted_at, Vote.id)
+            .execution_options(yield_per=self.chunk_size)
+        )
+        if condition is not None:
+            stmt = stmt.where(condition)
+        if after is not None:
+            stmt = stmt.where(tuple_(Vote.voted_at, Vote.id) > tuple_(*after))
+
+        async with self.session.bind.connect() as connection:
+            result = await connection.stream(stmt)
+            async for votes in result.partitions():
+                yield votes
+
+    def _apply_votes(self, votes: Sequence[Any]) -> None:
+        """
+        Apply a chunk of votes to the in-memory rating state
+
+        Args:
+            votes: Vote rows from _stream_votes
+        """
+        now = datetime.now(UTC)
+        for vote in votes:
+            try:
+                self._process_single_vote(vote, now)
+            except ValueError as e:
+                # Processed votes are valid by construction; skip anything that is not
+                logger.warning(f"Skipping vote {vote.vote_id} in replay: {e}")
+
+    async def _swap(self) -> None:
+        """
+        Replace live stats rows with the shadow rows (inside the caller's transaction)
+
+        DELETE + INSERT ... SELECT instead of renaming tables keeps the live
+        tables' indexes, sequences and grants; readers see either the old
+        or the new ratings, never a mix.
+        """
+        for live, shadow in (
+            (ModelStats.__table__, SHADOW_MODEL_STATS),
+            (ModelSegmentStats.__table__, SHADOW_SEGMENT_STATS),
+            (ModelPairwiseStats.__table__, SHADOW_PAIRWISE_STATS),
+        ):
+            columns = [column.name for column in live.columns if column.name != "id"]
+            await self.session.execute(delete(live))
+            await self.session.execute(
+                insert(live).from_select(columns, select(*(shadow.c[name] for name in columns)))
+            )
+
+    async def _create_shadow_tables(self) -> None:
+        """Create shadow tables if they do not exist yet"""
+        connection = await self.session.connection()
+        await connection.run_sync(_shadow_metadata.create_all)
+        await self.session.commit()
+
+    async def _drop_shadow_tables(self) -> None:
+        """Drop shadow tables after a completed swap"""
+        connection = await self.session.connection()
+        await connection.run_sync(_shadow_metadata.drop_all)
+        await self.session.commit()
+
+
+async def run_replay(
+    restart: bool = False,
+    chunk_size: Optional[int] = None,
+    fence_timeout: float = DEFAULT_FENCE_TIMEOUT_SECONDS,
+) -> int:
+    """
+    Run a full replay with its own session
+
+    Args:
+        restart: Discard a running replay and start over
+        chunk_size: Votes per streamed chunk / checkpoint (default: worker_vote_chunk_size)
+        fence_timeout: Seconds to wait for the replay fence (0 = no limit)
+
+    Returns:
+        int: Number of votes replayed
+    """
+    model_configs: Dict[str, Dict[str, str]] = load_model_configs()
+
+    async with async_session_maker() as session:
+        replayer = RatingReplayer(session, model_configs=model_configs, chunk_size=chunk_size)
+        return await replayer.run(restart=restart, fence_timeout=fence_timeout)
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Recompute all ratings from the votes table")
+    parser.add_argument(
+        "--restart", action="store_true", help="discard a running replay and start over"
+    )
+    parser.add_argument("--chunk-size", type=int, default=None, help="votes per checkpoint")
+    parser.add_argument(
+        "--fence-timeout",
+        type=float,
+        default=DEFAULT_FENCE_TIMEOUT_SECONDS,
+        help="seconds to wait for running aggregation before the swap (0 = no limit)",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(
+            run_replay(
+                restart=args.restart,
+                chunk_size=args.chunk_size,
+                fence_timeout=args.fence_timeout,
+            )
+        )
+    except ReplayLockedError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
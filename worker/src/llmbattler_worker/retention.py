@@ -0,0 +1,378 @@
+"""
+Conversation retention (abandoned battles, old unvoted sessions)
+
+Battles nobody votes on stay "ongoing" forever, and their turns and messages
+are the bulk of the conversation tables. An hourly leader-only job keeps the
+hot tables bounded:
+
+- Marks ongoing battles idle for worker_battle_abandon_hours as "abandoned"
+  (the backend then refuses follow-ups and votes on them).
+- Purges abandoned battles older than worker_abandoned_battle_retention_days:
+  their messages, turns and the battle row.
+- Purges sessions inactive for worker_unvoted_session_retention_days that
+  hold no vote: messages, turns, battles and the session row.
+- With either purge enabled, sweeps content_blobs (offloaded bodies, see
+  llmbattler_shared.content) no turn or message references any more and
+  that are older than ORPHAN_GRACE.
+
+Voted battles (and every session holding one) are never touched; they are
+the data ratings and exports are built from.
+
+Work is done in batches of worker_retention_batch_size battles/sessions,
+one transaction each, so locks stay short and a failure only loses the
+current batch. With worker_conversation_archive_schema set (PostgreSQL),
+purged rows are copied to same-named tables in that schema instead of being
+dropped; swept blobs go to its content_blobs, so archived rows keep their
+bodies.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy import (
+    Column,
+    MetaData,
+    Table,
+    and_,
+    delete,
+    exists,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from llmbattler_shared.content import ORPHAN_GRACE
+from llmbattler_shared.models import Battle, ContentBlob, Message, Session, Turn, Vote
+
+
+logger = logging.getLogger("llmbattler_worker.retention")
+
+
+@dataclass
+class RetentionResult:
+    """Rows affected by one retention run"""
+
+    abandoned_battles: int = 0
+    purged_battles: int = 0
+    purged_sessions: int = 0
+    purged_blobs: int = 0
+
+
+class ConversationRetention:
+    """Mark idle battles abandoned and purge expired conversations"""
+
+    def __init__(
+        self,
+        session_maker: sessionmaker,
+        abandon_hours: int,
+        abandoned_retention_days: int,
+        unvoted_session_retention_days: int,
+        batch_size: int = 500,
+        archive_schema: str = "",
+    ):
+        """
+        Initialize retention job
+
+        Args:
+            session_maker: Session maker (one transaction per batch)
+            abandon_hours: Idle hours before an ongoing battle is abandoned (0 = never)
+            abandoned_retention_days: Days abandoned battles are kept (0 = keep all)
+            unvoted_session_retention_days: Days inactive sessions without votes
+                                            are kept (0 = keep all)
+            batch_size: Battles or sessions per transaction
+            archive_schema: Schema purged rows are copied to (PostgreSQL;
+                            empty = delete only)
+        """
+        self.session_maker = session_maker
+        self.abandon_hours = abandon_hours
+        self.abandoned_retention_days = abandoned_retention_days
+        self.unvoted_session_retention_days = unvoted_session_retention_days
+        self.batch_size = batch_size
+        self.archive_schema = archive_schema
+
+    async def run(self, now: Optional[datetime] = None) -> RetentionResult:
+        """
+        Mark idle battles abandoned, then purge expired battles, sessions and orphan blobs
+
+        A failing step is logged and the remaining steps still run.
+
+        Args:
+            now: Current time (default: now, UTC)
+
+        Returns:
+            RetentionResult: Battles abandoned, battles, sessions and blobs purged
+        """
+        now = now or datetime.now(UTC)
+        result = RetentionResult()
+
+        if self.abandon_hours > 0:
+            try:
+                result.abandoned_battles = await self.mark_abandoned(
+                    now - timedelta(hours=self.abandon_hours)
+                )
+            except Exception as e:
+                logger.error(f"Failed to mark abandoned battles: {e}")
+
+        purging = self.abandoned_retention_days > 0 or self.unvoted_session_retention_days > 0
+        if purging and self.archive_schema and not await self._supports_archive():
+            logger.warning("Conversation archiving needs PostgreSQL, skipping purge")
+            return result
+
+        if self.abandoned_retention_days > 0:
+            try:
+                result.purged_battles = await self.purge_abandoned_battles(
+                    now - timedelta(days=self.abandoned_retention_days)
+                )
+            except Exception as e:
+                logger.error(f"Failed to purge abandoned battles: {e}")
+
+        if self.unvoted_session_retention_days > 0:
+            try:
+                result.purged_sessions = await self.purge_unvoted_sessions(
+                    now - timedelta(days=self.unvoted_session_retention_days)
+                )
+            except Exception as e:
+                logger.error(f"Failed to purge unvoted sessions: {e}")
+
+        if purging:
+            try:
+                result.purged_blobs = await self.purge_orphan_blobs(now - ORPHAN_GRACE)
+            except Exception as e:
+                logger.error(f"Failed to purge orphan content blobs: {e}")
+
+        if (
+            result.abandoned_battles
+            or result.purged_battles
+            or result.purged_sessions
+            or result.purged_blobs
+        ):
+            logger.info(
+                f"Retention: {result.abandoned_battles} battles abandoned, "
+                f"{result.purged_battles} abandoned battles, "
+                f"{result.purged_sessions} unvoted sessions and "
+                f"{result.purged_blobs} orphan content blobs purged"
+            )
+        return result
+
+    async def mark_abandoned(self, idle_before: datetime) -> int:
+        """
+        Set ongoing battles last updated before idle_before to "abandoned"
+
+        Args:
+            idle_before: Battles with updated_at before this are abandoned
+
+        Returns:
+            int: Battles marked abandoned
+        """
+        total = 0
+        while True:
+            async with self.session_maker() as session:
+                # created_at <= updated_at: lets (status, created_at) narrow the scan
+                battle_ids = (
+                    (
+                        await session.execute(
+                            select(Battle.battle_id)
+                            .where(
+                                Battle.status == "ongoing",
+                                Battle.created_at < idle_before,
+                                Battle.updated_at < idle_before,
+                            )
+                            .limit(self.batch_size)
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not battle_ids:
+                    return total
+                # Re-check: a follow-up or vote may have landed since the select
+                marked = await session.execute(
+                    update(Battle)
+                    .where(
+                        Battle.battle_id.in_(battle_ids),
+                        Battle.status == "ongoing",
+                        Battle.updated_at < idle_before,
+                    )
+                    .values(status="abandoned", updated_at=datetime.now(UTC))
+                )
+                await session.commit()
+            total += marked.rowcount
+            if len(battle_ids) < self.batch_size:
+                return total
+
+    async def purge_abandoned_battles(self, created_before: datetime) -> int:
+        """
+        Remove abandoned battles created before created_before with their turns/messages
+
+        Args:
+            created_before: Abandoned battles created before this are purged
+
+        Returns:
+            int: Battles purged
+        """
+        total = 0
+        while True:
+            async with self.session_maker() as session:
+                battles = (
+                    await session.execute(
+                        select(Battle.battle_id, Battle.session_id, Battle.seq_in_session)
+                        .where(Battle.status == "abandoned", Battle.created_at < created_before)
+                        .limit(self.batch_size)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).all()
+                if not battles:
+                    return total
+                await self._purge_battles(session, battles)
+                await session.commit()
+            total += len(battles)
+            if len(battles) < self.batch_size:
+                return total
+
+    async def purge_unvoted_sessions(self, inactive_before: datetime) -> int:
+        """
+        Remove sessions without votes inactive since before inactive_before
+
+        Args:
+            inactive_before: Sessions with last_active_at before this are purged
+
+        Returns:
+            int: Sessions purged
+        """
+        total = 0
+        while True:
+            async with self.session_maker() as session:
+                session_ids = (
+                    (
+                        await session.execute(
+                            select(Session.session_id)
+                            .where(
+                                Session.last_active_at < inactive_before,
+                                ~exists().where(Vote.session_id == Session.session_id),
+                            )
+                            .limit(self.batch_size)
+                            .with_for_update(skip_locked=True)
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not session_ids:
+                    return total
+                battles = (
+                    await session.execute(
+                        select(Battle.battle_id, Battle.session_id, Battle.seq_in_session).where(
+                            Battle.session_id.in_(session_ids)
+                        )
+                    )
+                ).all()
+                await self._purge_battles(session, battles)
+                await self._remove(session, Session.__table__, Session.session_id.in_(session_ids))
+                await session.commit()
+            total += len(session_ids)
+            if len(session_ids) < self.batch_size:
+                return total
+
+    async def purge_orphan_blobs(self, stored_before: datetime) -> int:
+        """
+        Remove content blobs stored before stored_before that nothing references
+
+        Writers reusing an old blob refresh its created_at (store_contents),
+        so the condition is re-checked by the DELETE itself.
+
+        Args:
+            stored_before: Only blobs with created_at before this are swept
+
+        Returns:
+            int: Blobs purged
+        """
+        orphaned = (
+            ContentBlob.created_at < stored_before,
+            ~exists().where(Turn.user_input_hash == ContentBlob.content_hash),
+            ~exists().where(Message.content_hash == ContentBlob.content_hash),
+        )
+        total = 0
+        while True:
+            async with self.session_maker() as session:
+                hashes = (
+                    (
+                        await session.execute(
+                            select(ContentBlob.content_hash).where(*orphaned).limit(self.batch_size)
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not hashes:
+                    return total
+                purged = await self._remove(
+                    session,
+                    ContentBlob.__table__,
+                    ContentBlob.content_hash.in_(hashes) & and_(*orphaned),
+                )
+                await session.commit()
+            total += purged
+            if len(hashes) < self.batch_size:
+                return total
+
+    async def _purge_battles(self, session: AsyncSession, battles: Sequence) -> None:
+        """
+        Remove battles with their turns and messages (caller commits)
+
+        Args:
+            session: Database session
+            battles: (battle_id, session_id, seq_in_session) rows
+        """
+        if not battles:
+            return
+        battle_ids = [battle.battle_id for battle in battles]
+        # Messages by (session_id, battle_seq_in_session): prefix of ix_messages_session_order
+        message_keys = [(battle.session_id, battle.seq_in_session) for battle in battles]
+        await self._remove(
+            session,
+            Message.__table__,
+            tuple_(Message.session_id, Message.battle_seq_in_session).in_(message_keys),
+        )
+        await self._remove(session, Turn.__table__, Turn.battle_id.in_(battle_ids))
+        await self._remove(session, Battle.__table__, Battle.battle_id.in_(battle_ids))
+
+    async def _remove(self, session: AsyncSession, table: Table, condition) -> int:
+        """Delete matching rows, copying them to the archive schema first if configured"""
+        if self.archive_schema:
+            archive = await self._archive_table(session, table)
+            columns = [column.name for column in table.columns]
+            await session.execute(
+                insert(archive).from_select(columns, select(table).where(condition))
+            )
+        deleted = await session.execute(delete(table).where(condition))
+        return deleted.rowcount
+
+    async def _archive_table(self, session: AsyncSession, table: Table) -> Table:
+        """Archive copy of a table in the archive schema (created if missing)"""
+        quote = session.bind.dialect.identifier_preparer.quote
+        schema = quote(self.archive_schema)
+        await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        # Columns only: archived rows are not indexed or constrained
+        await session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {schema}.{quote(table.name)} "
+                f"(LIKE {quote(table.name)})"
+            )
+        )
+        return Table(
+            table.name,
+            MetaData(),
+            *(Column(column.name, column.type) for column in table.columns),
+            schema=self.archive_schema,
+        )
+
+    async def _supports_archive(self) -> bool:
+        """Whether the database can archive into another schema (PostgreSQL)"""
+        async with self.session_maker() as session:
+            return session.bind.dialect.name == "postgresql"
@@ -0,0 +1,188 @@
+"""
+Adaptive aggregation scheduling (WORKER_SCHEDULE_MODE=adaptive)
+
+Instead of a fixed cron/interval, the worker runs once on start, then picks
+the delay before the next run from what it just observed:
+
+- Backlog: with `pending` votes left after a run, the delay is
+  max_seconds * target / (target + pending), target = one vote chunk. One
+  chunk waiting halves the delay; a large backlog goes to min_seconds.
+- Idle: with nothing pending the delay doubles, up to max_seconds.
+- Run duration: the delay is never shorter than the last run took, so the
+  worker spends at most half its time aggregating while catching up.
+
+Runs never overlap: the loop is sequential and skips a due run while another
+aggregation (notification-triggered) holds the aggregation lock, since that
+run drains the same backlog. Skipped runs count as coalesced, runs that
+started one or more intervals after they were due (previous due time +
+interval, so an overrunning run counts) as missed; both are logged and exposed
+on /metrics (SchedulerStats). Rating history keeps its fixed cadence: a run
+is "scheduled" (snapshots history) once per snapshot interval, "adaptive"
+otherwise.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+
+logger = logging.getLogger("llmbattler_worker.scheduling")
+
+# Aggregation scheduling modes (settings.worker_schedule_mode)
+SCHEDULE_MODES = ("fixed", "adaptive")
+
+
+@dataclass
+class SchedulerStats:
+    """Aggregation scheduling counters (since process start)"""
+
+    runs_missed: int = 0  # Due runs that started an interval or more late
+    runs_coalesced: int = 0  # Due runs folded into a run already in progress
+    next_interval_seconds: Optional[float] = None  # Adaptive mode: delay before the next run
+
+
+def next_interval(
+    previous: float,
+    pending: int,
+    duration: float,
+    min_seconds: float,
+    max_seconds: float,
+    backlog_target: int,
+) -> float:
+    """
+    Delay before the next aggregation run
+
+    Args:
+        previous: Previous delay in seconds
+        pending: Votes left pending after the last run
+        duration: Duration of the last run in seconds
+        min_seconds: Shortest delay
+        max_seconds: Longest delay
+        backlog_target: Backlog that halves the delay (votes)
+
+    Returns:
+        float: Delay in seconds, within [min_seconds, max_seconds]
+    """
+    if pending <= 0:
+        interval = max(previous, min_seconds) * 2
+    else:
+        interval = max_seconds * backlog_target / (backlog_target + pending)
+    return min(max_seconds, max(min_seconds, duration, interval))
+
+
+class AdaptiveAggregationLoop:
+    """Run aggregation at a backlog-driven pace until stopped"""
+
+    def __init__(
+        self,
+        run: Callable[[str], Awaitable[Any]],
+        backlog: Callable[[], Awaitable[int]],
+        lock: asyncio.Lock,
+        min_seconds: float,
+        max_seconds: float,
+        backlog_target: int,
+        snapshot_seconds: float,
+        stats: Optional[SchedulerStats] = None,
+    ):
+        """
+        Initialize loop
+
+        Args:
+            run: Aggregation coroutine function, called with triggered_by
+                 ("scheduled" or "adaptive"); must take `lock` itself
+            backlog: Coroutine function returning the pending vote count
+            lock: Aggregation lock shared with notification-triggered runs
+            min_seconds: Shortest delay between runs
+            max_seconds: Longest delay between runs
+            backlog_target: Backlog that halves the delay (votes)
+            snapshot_seconds: Rating history cadence
+            stats: Counters to update (default: a new SchedulerStats)
+        """
+        self.run = run
+        self.backlog = backlog
+        self.lock = lock
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.backlog_target = backlog_target
+        self.snapshot_seconds = snapshot_seconds
+        self.stats = stats or SchedulerStats()
+        self.interval = min_seconds
+        self._last_snapshot: Optional[float] = None
+
+    async def run_forever(self, stop: asyncio.Event) -> None:
+        """
+        Run immediately, then at adaptive intervals until `stop` is set
+
+        A run in progress when `stop` is set is finished first.
+
+        Args:
+            stop: Shutdown event
+        """
+        due = time.monotonic()
+        while not stop.is_set():
+            delay = due - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+
+            started = time.monotonic()
+            # Lateness against the schedule (previous due + interval): runs or
+            # backlog queries that overran the interval show up here
+            missed = int((started - due) // self.interval) if started > due else 0
+            if missed > 0:
+                self.stats.runs_missed += missed
+                logger.warning(f"Aggregation started late: {missed} run(s) missed")
+                # Rebase on the actual start instead of bursting to catch up
+                due = started
+
+            await self.run_once(started)
+            duration = time.monotonic() - started
+
+            try:
+                pending = await self.backlog()
+            except Exception as e:
+                logger.warning(f"Backlog query failed, keeping interval: {e}")
+            else:
+                self.interval = next_interval(
+                    self.interval,
+                    pending,
+                    duration,
+                    self.min_seconds,
+                    self.max_seconds,
+                    self.backlog_target,
+                )
+                logger.debug(f"Backlog {pending}, next run in {self.interval:.0f}s")
+            self.stats.next_interval_seconds = self.interval
+            due += self.interval
+
+    async def run_once(self, started: float) -> None:
+        """
+        Run one aggregation, or coalesce into the run in progress
+
+        Never raises: errors are logged and the loop continues.
+
+        Args:
+            started: Monotonic start time of this run
+        """
+        snapshot_due = (
+            self._last_snapshot is None or started - self._last_snapshot >= self.snapshot_seconds
+        )
+
+        if self.lock.locked() and not snapshot_due:
+            self.stats.runs_coalesced += 1
+            logger.info("Aggregation already running, coalescing due run")
+            # Wait for it, so the next interval reflects the backlog it leaves
+            async with self.lock:
+                return
+
+        if snapshot_due:
+            self._last_snapshot = started
+        try:
+            await self.run("scheduled" if snapshot_due else "adaptive")
+        except Exception as e:
+            logger.error(f"Adaptive aggregation failed: {e}", exc_info=True)
@@ -0,0 +1,87 @@
+"""
+Tests for bootstrap confidence intervals
+"""
+
+import numpy as np
+
+from llmbattler_worker.aggregators.bootstrap import (
+    bootstrap_ci,
+    build_outcome_cells,
+    wins_from_cells,
+)
+from llmbattler_worker.aggregators.bradley_terry import build_win_matrix
+
+
+def _pair(a, b, a_wins=0, b_wins=0, ties=0, both_bad=0):
+    """Pairwise stats row as loaded by the aggregator"""
+    return {
+        "model_a_id": a,
+        "model_b_id": b,
+        "a_win_count": a_wins,
+        "b_win_count": b_wins,
+        "tie_count": ties,
+        "both_bad_count": both_bad,
+    }
+
+
+PAIRS = [
+    _pair("a", "b", a_wins=30, b_wins=10, ties=5, both_bad=5),
+    _pair("b", "c", a_wins=20, b_wins=20),
+    _pair("a", "c", a_wins=4, b_wins=1),
+]
+MODEL_IDS = ["a", "b", "c"]
+
+
+def test_cells_rebuild_observed_win_matrix():
+    """Test outcome cells with observed counts give the same matrix as build_win_matrix"""
+    # Arrange
+    cells = build_outcome_cells(MODEL_IDS, PAIRS)
+
+    # Act
+    wins = wins_from_cells(3, cells, cells[3])
+
+    # Assert
+    np.testing.assert_array_equal(wins, build_win_matrix(MODEL_IDS, PAIRS))
+
+
+def test_wins_from_cells_batched():
+    """Test a stack of count vectors gives a stack of win matrices"""
+    # Arrange
+    cells = build_outcome_cells(MODEL_IDS, PAIRS)
+    counts = np.stack([cells[3], 2 * cells[3]])
+
+    # Act
+    wins = wins_from_cells(3, cells, counts)
+
+    # Assert
+    assert wins.shape == (2, 3, 3)
+    np.testing.assert_array_equal(wins[1], 2 * wins[0])
+
+
+def test_bootstrap_ci_is_reproducible():
+    """Test fixed seed gives identical intervals"""
+    # Act
+    first = bootstrap_ci(MODEL_IDS, PAIRS, replicates=40, seed=7, processes=1)
+    second = bootstrap_ci(MODEL_IDS, PAIRS, replicates=40, seed=7, processes=1)
+
+    # Assert
+    np.testing.assert_array_equal(first, second)
+
+
+def test_bootstrap_ci_reflects_opponents():
+    """Test a model with few games gets a wider interval than well-measured models"""
+    # Act
+    ci = bootstrap_ci(MODEL_IDS, PAIRS, replicates=100, seed=7, processes=1)
+
+    # Assert: all positive; "c" (45 games) is less certain than "b" (90 games)
+    assert np.all(ci > 0)
+    assert ci[2] > ci[1]
+
+
+def test_bootstrap_ci_no_data():
+    """Test no head-to-head counts gives zero-width result without fitting"""
+    # Act
+    ci = bootstrap_ci(MODEL_IDS, [], replicates=100, seed=7, processes=1)
+
+    # Assert
+    np.testing.assert_array_equal(ci, np.zeros(3))
@@ -0,0 +1,116 @@
+"""
+Tests for Bradley-Terry rating engine
+"""
+
+import numpy as np
+import pytest
+
+from llmbattler_worker.aggregators.bradley_terry import (
+    build_win_matrix,
+    fit_bradley_terry,
+    from_elo_scale,
+    to_elo_scale,
+)
+
+
+def _pair(a, b, a_wins=0, b_wins=0, ties=0, both_bad=0):
+    """Pairwise stats row as loaded by the aggregator"""
+    return {
+        "model_a_id": a,
+        "model_b_id": b,
+        "a_win_count": a_wins,
+        "b_win_count": b_wins,
+        "tie_count": ties,
+        "both_bad_count": both_bad,
+    }
+
+
+class TestBuildWinMatrix:
+    """Test win matrix construction from pairwise counts"""
+
+    def test_wins_and_draws(self):
+        """Test wins go to the winner and ties/both_bad are split"""
+        # Act
+        pairs = [_pair("a", "b", a_wins=3, b_wins=1, ties=2, both_bad=2)]
+        wins = build_win_matrix(["a", "b"], pairs)
+
+        # Assert
+        assert wins[0, 1] == 5.0  # 3 wins + 0.5 * 4 draws
+        assert wins[1, 0] == 3.0  # 1 win + 0.5 * 4 draws
+
+    def test_unknown_models_ignored(self):
+        """Test pairs with models outside model_ids are skipped"""
+        # Act
+        wins = build_win_matrix(["a", "b"], [_pair("a", "z", a_wins=10)])
+
+        # Assert
+        assert wins.sum() == 0
+
+
+class TestFitBradleyTerry:
+    """Test maximum-likelihood fit"""
+
+    def test_recovers_true_strengths(self):
+        """Test fit on simulated battles recovers the generating strengths"""
+        # Arrange: 20 models, 200k battles
+        rng = np.random.default_rng(0)
+        true = rng.normal(0, 1, 20)
+        a = rng.integers(0, 20, 200_000)
+        b = rng.integers(0, 20, 200_000)
+        keep = a != b
+        a, b = a[keep], b[keep]
+        a_won = rng.random(len(a)) < 1 / (1 + np.exp(true[b] - true[a]))
+        wins = np.zeros((20, 20))
+        np.add.at(wins, (a[a_won], b[a_won]), 1)
+        np.add.at(wins, (b[~a_won], a[~a_won]), 1)
+
+        # Act
+        fitted = fit_bradley_terry(wins)
+
+        # Assert
+        np.testing.assert_allclose(fitted, true - true.mean(), atol=0.1)
+
+    def test_equal_models_rated_equally(self):
+        """Test symmetric results give identical ratings"""
+        # Arrange
+        wins = np.array([[0.0, 10.0], [10.0, 0.0]])
+
+        # Act
+        ratings = to_elo_scale(fit_bradley_terry(wins))
+
+        # Assert
+        np.testing.assert_allclose(ratings, [1500.0, 1500.0])
+
+    def test_undefeated_model_stays_finite(self):
+        """Test prior keeps ratings finite when a model never lost"""
+        # Arrange
+        wins = np.array([[0.0, 50.0], [0.0, 0.0]])
+
+        # Act
+        ratings = to_elo_scale(fit_bradley_terry(wins))
+
+        # Assert
+        assert np.all(np.isfinite(ratings))
+        assert ratings[0] > ratings[1]
+
+    def test_warm_start_converges_to_same_solution(self):
+        """Test warm start from a previous solution does not change the result"""
+        # Arrange
+        wins = np.array([[0.0, 7.0, 3.0], [2.0, 0.0, 5.0], [4.0, 1.0, 0.0]])
+        cold = fit_bradley_terry(wins)
+
+        # Act
+        warm = fit_bradley_terry(wins, initial=from_elo_scale(np.round(to_elo_scale(cold))))
+
+        # Assert
+        np.testing.assert_allclose(warm, cold, atol=1e-9)
+
+    def test_empty(self):
+        """Test fit with no models"""
+        assert fit_bradley_terry(np.zeros((0, 0))).shape == (0,)
+
+
+@pytest.mark.parametrize("elo", [1200.0, 1500.0, 1830.0])
+def test_elo_scale_round_trip(elo):
+    """Test Elo scale mapping is invertible"""
+    assert to_elo_scale(from_elo_scale([elo]))[0] == pytest.approx(elo)
@@ -60,3 +60,177 @@ class TestDatabaseConnection:
             result = await session.execute(text("SELECT 1"))
             assert result.scalar() == 1
             break
+
+
+class TestLazyEngines:
+    """Test engines are created per role on first use"""
+
+    @pytest.mark.asyncio
+    async def test_engine_created_on_first_use_only(self):
+        """Test no engine exists until a role is used, and only that role's"""
+        # Arrange
+        from llmbattler_shared import database
+
+        await database.dispose()
+
+        # Act
+        engine = database.get_engine("worker")
+
+        # Assert
+        assert set(database._engines) == {"worker"}
+        assert database.init("worker") is engine
+        assert database.worker_engine is engine  # Module attribute stays compatible
+
+    @pytest.mark.asyncio
+    async def test_dispose_forgets_engine(self):
+        """Test a disposed role gets a fresh engine on next use"""
+        # Arrange
+        from llmbattler_shared import database
+
+        engine = database.init("worker")
+
+        # Act
+        await database.dispose("worker")
+
+        # Assert
+        assert "worker" not in database._engines
+        assert database.get_engine("worker") is not engine
+
+    def test_unknown_role_rejected(self):
+        """Test an unknown role raises ValueError"""
+        # Arrange
+        from llmbattler_shared import database
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid database role"):
+            database.init("reporting")
+
+    def test_import_creates_no_engine(self):
+        """Test importing the database modules opens no engine"""
+        # Arrange
+        import os
+        import subprocess
+        import sys
+
+        code = (
+            "import os; os.environ['POSTGRES_URI'] = 'sqlite+aiosqlite:///:memory:'\n"
+            "import llmbattler_worker.database, llmbattler_shared.database as d\n"
+            "assert d._engines == {}, d._engines\n"
+        )
+
+        # Act
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env
+        )
+
+        # Assert
+        assert result.returncode == 0, result.stderr
+
+
+class TestPoolInstrumentation:
+    """Test connection pool metrics, warm-up and drain"""
+
+    @pytest.fixture
+    async def pooled_engine(self, tmp_path):
+        """Instrumented engine with pool_size=2, no overflow, short checkout timeout"""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        from llmbattler_shared import pool_metrics
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=pool_metrics.InstrumentedPool,
+            pool_size=2,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        pool_metrics._metrics.pop("test", None)
+        yield engine
+        pool_metrics._metrics.pop("test", None)
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_pool_size_connections(self, pooled_engine):
+        """Test warm-up opens pool_size connections and returns them to the pool"""
+        # Arrange
+        from llmbattler_shared import pool_metrics
+
+        metrics = pool_metrics.instrument(pooled_engine, "test")
+
+        # Act
+        opened = await pool_metrics.warm_up(pooled_engine, 2)
+
+        # Assert
+        pool = pooled_engine.sync_engine.pool
+        assert opened == 2
+        assert metrics.connections_opened == 2
+        assert pool.checkedin() == 2 and pool.checkedout() == 0
+        assert metrics.checkouts == 2
+
+    @pytest.mark.asyncio
+    async def test_checkout_timeout_counted(self, pooled_engine):
+        """Test an exhausted pool counts the timeout and reports saturation"""
+        # Arrange
+        from sqlalchemy import exc
+
+        from llmbattler_shared import pool_metrics
+
+        metrics = pool_metrics.instrument(pooled_engine, "test")
+        first = await pooled_engine.connect()
+        second = await pooled_engine.connect()
+
+        # Act
+        try:
+            with pytest.raises(exc.TimeoutError):
+                await pooled_engine.connect()
+            text = pool_metrics.render()
+        finally:
+            await first.close()
+            await second.close()
+
+        # Assert
+        assert metrics.timeouts == 1
+        assert 'llmbattler_db_pool_checkout_timeouts_total{role="test"} 1' in text
+        assert 'llmbattler_db_pool_checked_out{role="test"} 2' in text
+        assert 'llmbattler_db_pool_checkout_seconds_count{role="test"} 2' in text
+        assert "# TYPE llmbattler_db_pool_checkout_seconds histogram" in text
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_checked_out_connections(self, pooled_engine):
+        """Test drain returns once in-flight connections are back, or gives up"""
+        # Arrange
+        import asyncio
+
+        from llmbattler_shared import pool_metrics
+
+        connection = await pooled_engine.connect()
+        asyncio.get_running_loop().call_later(0.1, asyncio.ensure_future, connection.close())
+
+        # Act
+        timed_out = await pool_metrics.drain(pooled_engine, 0.01)
+        drained = await pool_metrics.drain(pooled_engine, 5.0)
+
+        # Assert
+        assert timed_out is False
+        assert drained is True
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test each checkout lands in one bucket and buckets render cumulatively"""
+        # Arrange
+        from llmbattler_shared.pool_metrics import PoolMetrics
+
+        metrics = PoolMetrics("test")
+
+        # Act
+        metrics.observe_checkout(0.0005, overflow=False)
+        metrics.observe_checkout(0.2, overflow=True)
+        metrics.observe_checkout(60.0, overflow=True)
+        lines = metrics.render()
+
+        # Assert
+        assert 'llmbattler_db_pool_checkout_seconds_bucket{role="test",le="0.001"} 1' in lines
+        assert 'llmbattler_db_pool_checkout_seconds_bucket{role="test",le="0.25"} 2' in lines
+        assert 'llmbattler_db_pool_checkout_seconds_bucket{role="test",le="10.0"} 2' in lines
+        assert 'llmbattler_db_pool_checkout_seconds_bucket{role="test",le="+Inf"} 3' in lines
+        assert metrics.overflow_checkouts == 2
@@ -9,12 +9,12 @@ Tests vote aggregation workflow:
 - Handle errors and update worker_status
 """
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from sqlmodel import select
 
-from llmbattler_shared.models import ModelStats, Vote
+from llmbattler_shared.models import ModelPairwiseStats, ModelSegmentStats, ModelStats, Vote
 
 
 @pytest.mark.asyncio
@@ -399,3 +399,548 @@ class TestELOAggregator:
         assert vote.processing_status == "failed"
         assert vote.error_message is not None
         assert "invalid" in vote.error_message.lower()
+
+    async def test_update_pairwise_stats(self, test_db_session):
+        """Test head-to-head counts are kept in canonical (sorted) pair order"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: Same pair voted from both sides
+        outcomes = [
+            ("model-b", "model-a", "left_better"),  # b beats a
+            ("model-a", "model-b", "left_better"),  # a beats b
+            ("model-a", "model-b", "right_better"),  # b beats a
+            ("model-b", "model-a", "tie"),
+            ("model-a", "model-b", "both_bad"),
+        ]
+        for i, (left, right, outcome) in enumerate(outcomes):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-{i}",
+                    battle_id=f"battle-{i}",
+                    session_id="session-1",
+                    vote=outcome,
+                    left_model_id=left,
+                    right_model_id=right,
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        # Execute
+        aggregator = ELOAggregator(test_db_session)
+        await aggregator.process_pending_votes()
+
+        # Verify: Single canonical row with correct counts
+        result = await test_db_session.execute(select(ModelPairwiseStats))
+        pairs = result.scalars().all()
+        assert len(pairs) == 1
+        pair = pairs[0]
+        assert (pair.model_a_id, pair.model_b_id) == ("model-a", "model-b")
+        assert pair.a_win_count == 1
+        assert pair.b_win_count == 2
+        assert pair.tie_count == 1
+        assert pair.both_bad_count == 1
+
+    async def test_update_segment_stats(self, test_db_session):
+        """Test segment ratings only count battles within the shared segment"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: Two open-source models from different orgs, one proprietary model
+        model_configs = {
+            "llama": {"organization": "Meta", "license": "open-source"},
+            "qwen": {"organization": "Alibaba", "license": "open-source"},
+            "gpt-4": {"organization": "OpenAI", "license": "proprietary"},
+        }
+        for i, (left, right) in enumerate([("llama", "qwen"), ("llama", "gpt-4")]):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-{i}",
+                    battle_id=f"battle-{i}",
+                    session_id="session-1",
+                    vote="left_better",
+                    left_model_id=left,
+                    right_model_id=right,
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        # Execute
+        aggregator = ELOAggregator(test_db_session, model_configs=model_configs)
+        await aggregator.process_pending_votes()
+
+        # Verify: Only the llama vs qwen battle lands in the open-source segment
+        result = await test_db_session.execute(select(ModelSegmentStats))
+        segments = {(s.segment_type, s.segment_value, s.model_id): s for s in result.scalars()}
+        assert set(segments) == {
+            ("license", "open-source", "llama"),
+            ("license", "open-source", "qwen"),
+        }
+        llama = segments[("license", "open-source", "llama")]
+        assert llama.vote_count == 1
+        assert llama.win_count == 1
+        assert llama.elo_score == 1516
+        assert llama.organization == "Meta"
+
+        # Verify: Global stats still count both battles
+        result = await test_db_session.execute(
+            select(ModelStats).where(ModelStats.model_id == "llama")
+        )
+        assert result.scalar_one().vote_count == 2
+
+    async def test_mixed_valid_and_invalid_votes(self, test_db_session):
+        """Test one run writes processed and failed votes, without stats for invalid votes"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: One valid and one invalid vote
+        test_db_session.add(
+            Vote(
+                vote_id="vote-ok",
+                battle_id="battle-ok",
+                session_id="session-1",
+                vote="left_better",
+                left_model_id="gpt-4",
+                right_model_id="claude-3",
+                processing_status="pending",
+            )
+        )
+        test_db_session.add(
+            Vote(
+                vote_id="vote-bad",
+                battle_id="battle-bad",
+                session_id="session-1",
+                vote="invalid_vote_type",
+                left_model_id="ghost-1",
+                right_model_id="ghost-2",
+                processing_status="pending",
+            )
+        )
+        await test_db_session.commit()
+
+        # Execute
+        aggregator = ELOAggregator(test_db_session)
+        votes_processed = await aggregator.process_pending_votes()
+
+        # Verify: Statuses written in bulk
+        assert votes_processed == 1
+        result = await test_db_session.execute(select(Vote).order_by(Vote.vote_id))
+        statuses = {v.vote_id: (v.processing_status, v.error_message) for v in result.scalars()}
+        assert statuses["vote-ok"] == ("processed", None)
+        assert statuses["vote-bad"][0] == "failed"
+        assert "invalid_vote_type" in statuses["vote-bad"][1]
+
+        # Verify: No stats rows for models of the invalid vote
+        result = await test_db_session.execute(select(ModelStats.model_id))
+        assert sorted(result.scalars()) == ["claude-3", "gpt-4"]
+
+    async def test_second_run_continues_from_stored_state(self, test_db_session):
+        """Test preloaded state from a previous run is updated, not duplicated"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup + Execute: Two runs with one vote each
+        for i in range(2):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-{i}",
+                    battle_id=f"battle-{i}",
+                    session_id="session-1",
+                    vote="left_better",
+                    left_model_id="gpt-4",
+                    right_model_id="claude-3",
+                    processing_status="pending",
+                )
+            )
+            await test_db_session.commit()
+            await ELOAggregator(test_db_session).process_pending_votes()
+
+        # Verify: One row per model with cumulative counts
+        result = await test_db_session.execute(select(ModelStats).order_by(ModelStats.model_id))
+        stats = result.scalars().all()
+        assert [(s.model_id, s.vote_count) for s in stats] == [("claude-3", 2), ("gpt-4", 2)]
+        assert stats[1].win_count == 2
+        assert stats[1].elo_score == 1531  # 1500 -> 1516 -> 1531 (rounded each vote)
+
+    async def test_process_votes_in_chunks(self, test_db_session):
+        """Test that a backlog larger than chunk_size is fully consumed in order"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: 5 pending votes, gpt-4 wins all of them
+        for i in range(5):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-{i}",
+                    battle_id=f"battle-{i}",
+                    session_id="session-1",
+                    vote="left_better",
+                    left_model_id="gpt-4",
+                    right_model_id="claude-3",
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        # Execute: Chunks of 2 votes (3 chunks)
+        aggregator = ELOAggregator(test_db_session, chunk_size=2)
+        votes_processed = await aggregator.process_pending_votes()
+
+        # Verify: All votes processed exactly once
+        assert votes_processed == 5
+        result = await test_db_session.execute(
+            select(Vote).where(Vote.processing_status == "processed")
+        )
+        assert len(result.scalars().all()) == 5
+
+        result = await test_db_session.execute(
+            select(ModelStats).where(ModelStats.model_id == "gpt-4")
+        )
+        stats = result.scalar_one()
+        assert stats.vote_count == 5
+        assert stats.win_count == 5
+
+    async def test_failed_chunk_keeps_earlier_chunks_committed(self, test_db_session):
+        """Test that a failure in a later chunk does not roll back committed chunks"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: 4 pending votes (2 chunks of 2)
+        for i in range(4):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-{i}",
+                    battle_id=f"battle-{i}",
+                    session_id="session-1",
+                    vote="left_better",
+                    left_model_id="gpt-4",
+                    right_model_id="claude-3",
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        aggregator = ELOAggregator(test_db_session, chunk_size=2)
+
+        # Simulate database failure while writing back the second chunk
+        write_rating_state = aggregator._write_rating_state
+        calls = 0
+
+        async def failing_write_rating_state():
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise RuntimeError("connection lost")
+            await write_rating_state()
+
+        aggregator._write_rating_state = failing_write_rating_state
+
+        # Execute
+        with pytest.raises(RuntimeError):
+            await aggregator.process_pending_votes()
+        await test_db_session.rollback()
+
+        # Verify: First chunk is durable, second chunk is still pending
+        result = await test_db_session.execute(
+            select(Vote.vote_id, Vote.processing_status).order_by(Vote.vote_id)
+        )
+        assert [tuple(row) for row in result.all()] == [
+            ("vote-0", "processed"),
+            ("vote-1", "processed"),
+            ("vote-2", "pending"),
+            ("vote-3", "pending"),
+        ]
+
+        result = await test_db_session.execute(
+            select(ModelStats).where(ModelStats.model_id == "gpt-4")
+        )
+        assert result.scalar_one().vote_count == 2
+
+    async def test_bradley_terry_engine_is_order_independent(self, test_db_session):
+        """Test Bradley-Terry engine gives the same scores for any vote order"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: Same votes, two orders (online ELO would differ between them)
+        outcomes = ["left_better", "left_better", "right_better", "tie", "left_better"]
+
+        async def run(votes, prefix):
+            for i, outcome in enumerate(votes):
+                test_db_session.add(
+                    Vote(
+                        vote_id=f"{prefix}-{i}",
+                        battle_id=f"{prefix}-battle-{i}",
+                        session_id="session-1",
+                        vote=outcome,
+                        left_model_id=f"{prefix}-gpt-4",
+                        right_model_id=f"{prefix}-claude-3",
+                        processing_status="pending",
+                    )
+                )
+            await test_db_session.commit()
+            aggregator = ELOAggregator(test_db_session, rating_engine="bradley_terry")
+            await aggregator.process_pending_votes()
+
+            result = await test_db_session.execute(
+                select(ModelStats).where(ModelStats.model_id == f"{prefix}-gpt-4")
+            )
+            return result.scalar_one().elo_score
+
+        # Execute
+        forward = await run(outcomes, "fwd")
+        backward = await run(list(reversed(outcomes)), "bwd")
+
+        # Verify: Same score, and gpt-4 (3.5 of 5 wins) rated above average
+        assert forward == backward
+        assert forward > 1500
+
+    async def test_invalid_rating_engine(self, test_db_session):
+        """Test unknown rating engine is rejected"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        with pytest.raises(ValueError, match="Invalid rating engine"):
+            ELOAggregator(test_db_session, rating_engine="glicko")
+
+    async def test_bootstrap_ci_replaces_vote_count_ci(self, test_db_session, monkeypatch):
+        """Test bootstrap CIs are written to model_stats.elo_ci when enabled"""
+        from llmbattler_shared.config import settings
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+        from llmbattler_worker.aggregators.elo_calculator import calculate_ci
+
+        monkeypatch.setattr(settings, "worker_bootstrap_replicates", 50)
+        monkeypatch.setattr(settings, "worker_bootstrap_processes", 1)
+
+        # Setup: 10 votes between two models
+        for i in range(10):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-{i}",
+                    battle_id=f"battle-{i}",
+                    session_id="session-1",
+                    vote="left_better" if i % 3 else "right_better",
+                    left_model_id="gpt-4",
+                    right_model_id="claude-3",
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        # Execute
+        await ELOAggregator(test_db_session).process_pending_votes()
+
+        # Verify: CI is the bootstrap one, not the vote-count formula
+        result = await test_db_session.execute(
+            select(ModelStats).where(ModelStats.model_id == "gpt-4")
+        )
+        stats = result.scalar_one()
+        assert stats.elo_ci > 0
+        assert stats.elo_ci != calculate_ci(10)
+
+    async def test_failed_vote_is_scheduled_for_retry(self, test_db_session):
+        """Test a failing vote gets a retry count and backoff instead of failing for good"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup
+        vote = Vote(
+            vote_id="vote-retry",
+            battle_id="battle-retry",
+            session_id="session-1",
+            vote="invalid_vote_type",
+            left_model_id="gpt-4",
+            right_model_id="claude-3",
+            processing_status="pending",
+        )
+        test_db_session.add(vote)
+        await test_db_session.commit()
+
+        # Execute: Second run comes before the backoff has elapsed
+        before = datetime.now(UTC)
+        await ELOAggregator(test_db_session).process_pending_votes()
+        aggregator = ELOAggregator(test_db_session)
+        await aggregator.process_pending_votes()
+
+        # Verify: One attempt, retry scheduled one base delay later
+        await test_db_session.refresh(vote)
+        assert vote.processing_status == "failed"
+        assert vote.retry_count == 1
+        assert vote.next_attempt_at.replace(tzinfo=UTC) >= before + timedelta(seconds=60)
+        assert aggregator.votes_retried == 0
+
+    async def test_due_retry_is_processed(self, test_db_session):
+        """Test a failed vote whose backoff elapsed is retried and processed"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: Vote that failed once (e.g., transient error), retry due
+        vote = Vote(
+            vote_id="vote-due",
+            battle_id="battle-due",
+            session_id="session-1",
+            vote="left_better",
+            left_model_id="gpt-4",
+            right_model_id="claude-3",
+            processing_status="failed",
+            error_message="connection reset",
+            retry_count=1,
+            next_attempt_at=datetime.now(UTC) - timedelta(seconds=1),
+        )
+        test_db_session.add(vote)
+        await test_db_session.commit()
+
+        # Execute
+        aggregator = ELOAggregator(test_db_session)
+        processed = await aggregator.process_pending_votes()
+
+        # Verify
+        await test_db_session.refresh(vote)
+        assert processed == 1
+        assert aggregator.votes_retried == 1
+        assert vote.processing_status == "processed"
+        assert vote.next_attempt_at is None
+
+    async def test_vote_dead_lettered_after_max_retries(self, test_db_session, monkeypatch):
+        """Test a vote that keeps failing moves to dead_letter"""
+        from llmbattler_shared.config import settings
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        monkeypatch.setattr(settings, "worker_vote_max_retries", 2)
+
+        # Setup: Last allowed retry is due
+        vote = Vote(
+            vote_id="vote-dead",
+            battle_id="battle-dead",
+            session_id="session-1",
+            vote="invalid_vote_type",
+            left_model_id="gpt-4",
+            right_model_id="claude-3",
+            processing_status="failed",
+            retry_count=2,
+            next_attempt_at=datetime.now(UTC) - timedelta(seconds=1),
+        )
+        test_db_session.add(vote)
+        await test_db_session.commit()
+
+        # Execute
+        aggregator = ELOAggregator(test_db_session)
+        await aggregator.process_pending_votes()
+
+        # Verify
+        await test_db_session.refresh(vote)
+        assert vote.processing_status == "dead_letter"
+        assert vote.retry_count == 3
+        assert vote.next_attempt_at is None
+        assert aggregator.votes_dead_lettered == 1
+
+    async def test_fresh_votes_are_processed_before_retries(self, test_db_session):
+        """Test due retries are consumed after all fresh votes"""
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: Older vote awaiting retry, newer fresh votes
+        test_db_session.add(
+            Vote(
+                vote_id="vote-old",
+                battle_id="battle-old",
+                session_id="session-1",
+                vote="tie",
+                left_model_id="gpt-4",
+                right_model_id="claude-3",
+                processing_status="failed",
+                retry_count=1,
+                next_attempt_at=datetime.now(UTC) - timedelta(seconds=1),
+                voted_at=datetime.now(UTC) - timedelta(hours=1),
+            )
+        )
+        for i in range(3):
+            test_db_session.add(
+                Vote(
+                    vote_id=f"vote-new-{i}",
+                    battle_id=f"battle-new-{i}",
+                    session_id="session-1",
+                    vote="left_better",
+                    left_model_id="gpt-4",
+                    right_model_id="claude-3",
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        aggregator = ELOAggregator(test_db_session, chunk_size=2)
+        order = []
+        process_single_vote = aggregator._process_single_vote
+
+        def recording_process_single_vote(vote, now):
+            order.append(vote.vote_id)
+            process_single_vote(vote, now)
+
+        aggregator._process_single_vote = recording_process_single_vote
+
+        # Execute
+        await aggregator.process_pending_votes()
+
+        # Verify
+        assert order == ["vote-new-0", "vote-new-1", "vote-new-2", "vote-old"]
+
+    async def test_vote_status_updates_match_on_voted_at(self, test_db_session):
+        """Test processed and failed status updates bound voted_at (partition pruning)"""
+        from sqlalchemy import event
+
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: One vote that processes, one that fails
+        for vote_id, vote_type in (("vote-ok", "left_better"), ("vote-bad", "invalid")):
+            test_db_session.add(
+                Vote(
+                    vote_id=vote_id,
+                    battle_id=f"battle-{vote_id}",
+                    session_id="session-1",
+                    vote=vote_type,
+                    left_model_id="gpt-4",
+                    right_model_id="claude-3",
+                    processing_status="pending",
+                )
+            )
+        await test_db_session.commit()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = test_db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+
+        # Execute
+        try:
+            processed = await ELOAggregator(test_db_session).process_pending_votes()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # Verify: Both UPDATE votes statements filter on voted_at
+        vote_updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE VOTES")]
+        assert processed == 1
+        assert len(vote_updates) == 2
+        for statement in vote_updates:
+            assert "voted_at" in statement.split("WHERE", 1)[1]
+
+    async def test_postgres_processed_update_bounds_voted_at(self, test_db_session):
+        """Test the PostgreSQL processed update adds a voted_at range to id = ANY(...)"""
+        from sqlalchemy.dialects import postgresql
+
+        from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+
+        # Setup: Capture the statement instead of running it against SQLite
+        aggregator = ELOAggregator(test_db_session)
+        aggregator._dialect_name = lambda: "postgresql"
+        executed = []
+
+        async def capture(stmt, *args, **kwargs):
+            executed.append(stmt)
+
+        aggregator.session = type("Session", (), {"execute": staticmethod(capture)})()
+        first = datetime(2026, 1, 31, 23, 0, tzinfo=UTC)
+        last = datetime(2026, 2, 1, 1, 0, tzinfo=UTC)
+
+        # Execute
+        await aggregator._mark_votes_processed([(1, first), (2, last)])
+
+        # Verify
+        compiled = executed[0].compile(dialect=postgresql.dialect())
+        where = str(compiled).split("WHERE", 1)[1]
+        assert "votes.id = ANY" in where
+        assert "votes.voted_at BETWEEN" in where
+        assert first in compiled.params.values()
+        assert last in compiled.params.values()
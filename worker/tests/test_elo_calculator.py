@@ -150,6 +150,15 @@ class TestVoteToScore:
         assert score_left == 0.25
         assert score_right == 0.25
 
+    def test_get_score_invalid_vote(self):
+        """Test invalid vote type raises ValueError"""
+        import pytest
+
+        from llmbattler_worker.aggregators.elo_calculator import get_score_from_vote
+
+        with pytest.raises(ValueError, match="Invalid vote type"):
+            get_score_from_vote("left_much_better", is_left=True)
+
 
 class TestConfidenceInterval:
     """Test confidence interval calculation using Bradley-Terry model"""
@@ -198,3 +207,137 @@ class TestConfidenceInterval:
 
         # CI should decrease with more votes
         assert ci_10 > ci_100 > ci_1000
+
+
+def _scalar_scan(ratings, left, right, votes):
+    """Reference: apply votes one by one with the scalar functions (aggregator path)"""
+    from llmbattler_worker.aggregators.elo_calculator import calculate_elo, get_score_from_vote
+
+    ratings = list(ratings)
+    for a, b, vote in zip(left, right, votes):
+        new_a = calculate_elo(ratings[a], ratings[b], get_score_from_vote(vote, is_left=True))
+        new_b = calculate_elo(ratings[b], ratings[a], get_score_from_vote(vote, is_left=False))
+        ratings[a], ratings[b] = round(new_a), round(new_b)
+    return ratings
+
+
+def _random_votes(rng, n_models, n_votes):
+    """Random battles (distinct models) with random outcomes"""
+    left = rng.integers(0, n_models, n_votes)
+    right = (left + rng.integers(1, n_models, n_votes)) % n_models
+    votes = rng.choice(["left_better", "right_better", "tie", "both_bad"], n_votes).tolist()
+    return left, right, votes
+
+
+class TestBatchAPI:
+    """Test array counterparts of the scalar ELO functions"""
+
+    def test_encode_votes(self):
+        """Test vote strings map to codes that index VOTE_SCORES"""
+        from llmbattler_worker.aggregators.elo_calculator import (
+            VOTE_SCORES,
+            encode_votes,
+            get_score_from_vote,
+        )
+
+        votes = ["left_better", "right_better", "tie", "both_bad"]
+        codes = encode_votes(votes)
+
+        for vote, code in zip(votes, codes):
+            assert VOTE_SCORES[code, 0] == get_score_from_vote(vote, is_left=True)
+            assert VOTE_SCORES[code, 1] == get_score_from_vote(vote, is_left=False)
+
+    def test_encode_votes_invalid(self):
+        """Test invalid vote type raises ValueError"""
+        import pytest
+
+        from llmbattler_worker.aggregators.elo_calculator import encode_votes
+
+        with pytest.raises(ValueError, match="Invalid vote type: meh"):
+            encode_votes(["tie", "meh"])
+
+    def test_calculate_elo_batch_matches_scalar(self):
+        """Test elementwise update equals calculate_elo for each element"""
+        import numpy as np
+
+        from llmbattler_worker.aggregators.elo_calculator import (
+            calculate_elo,
+            calculate_elo_batch,
+        )
+
+        rng = np.random.default_rng(0)
+        rating_a = rng.normal(1500, 200, 1000)
+        rating_b = rng.normal(1500, 200, 1000)
+        result = rng.choice([0.0, 0.25, 0.5, 1.0], 1000)
+
+        batch = calculate_elo_batch(rating_a, rating_b, result)
+
+        expected = [calculate_elo(a, b, r) for a, b, r in zip(rating_a, rating_b, result)]
+        np.testing.assert_allclose(batch, expected, rtol=0, atol=1e-9)
+
+    def test_elo_scan_matches_scalar_path(self):
+        """Test sequential scan gives exactly the scalar path's ratings"""
+        import numpy as np
+
+        from llmbattler_worker.aggregators.elo_calculator import (
+            INITIAL_ELO,
+            elo_scan,
+            encode_votes,
+        )
+
+        rng = np.random.default_rng(1)
+        left, right, votes = _random_votes(rng, n_models=20, n_votes=5000)
+        ratings = [INITIAL_ELO] * 20
+
+        scanned = elo_scan(np.array(ratings), left, right, encode_votes(votes))
+
+        assert scanned.tolist() == _scalar_scan(ratings, left.tolist(), right.tolist(), votes)
+
+    def test_elo_scan_without_rounding(self):
+        """Test unrounded scan matches chained calculate_elo calls"""
+        import numpy as np
+
+        from llmbattler_worker.aggregators.elo_calculator import calculate_elo, elo_scan
+
+        # 0 vs 1: left wins, then 1 vs 0: tie
+        scanned = elo_scan(np.array([1500.0, 1500.0]), [0, 1], [1, 0], [0, 2], round_ratings=False)
+
+        a, b = calculate_elo(1500, 1500, 1.0), calculate_elo(1500, 1500, 0.0)
+        b, a = calculate_elo(b, a, 0.5), calculate_elo(a, b, 0.5)
+        assert scanned.tolist() == [a, b]
+
+    def test_elo_scan_independent_runs(self):
+        """Test 2-D scan equals scanning each run separately"""
+        import numpy as np
+
+        from llmbattler_worker.aggregators.elo_calculator import elo_scan
+
+        rng = np.random.default_rng(2)
+        n_runs, n_models, n_votes = 8, 10, 500
+        ratings = rng.normal(1500, 100, (n_runs, n_models)).round()
+        left = np.empty((n_runs, n_votes), dtype=int)
+        right = np.empty_like(left)
+        codes = rng.integers(0, 4, (n_runs, n_votes))
+        for run in range(n_runs):
+            left[run], right[run], _ = _random_votes(rng, n_models, n_votes)
+
+        scanned = elo_scan(ratings, left, right, codes)
+
+        for run in range(n_runs):
+            expected = elo_scan(ratings[run], left[run], right[run], codes[run])
+            np.testing.assert_array_equal(scanned[run], expected)
+
+    def test_elo_scan_rejects_bad_input(self):
+        """Test shape mismatches and unknown codes raise ValueError"""
+        import numpy as np
+        import pytest
+
+        from llmbattler_worker.aggregators.elo_calculator import elo_scan
+
+        ratings = np.full(3, 1500.0)
+        with pytest.raises(ValueError):
+            elo_scan(ratings, [0, 1], [1], [0, 0])
+        with pytest.raises(ValueError):
+            elo_scan(ratings, [0], [1], [4])
+        with pytest.raises(ValueError):
+            elo_scan(np.full((2, 3), 1500.0), [0], [1], [0])
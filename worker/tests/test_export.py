@@ -0,0 +1,267 @@
+"""
+Tests for the votes + conversations export
+"""
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from llmbattler_shared.content import store_contents
+from llmbattler_shared.models import Battle, Message, Turn, Vote
+from llmbattler_worker import export
+from llmbattler_worker.export import ExportStateError, VoteExporter, parse_timestamp
+
+
+START = datetime(2026, 7, 1, tzinfo=UTC)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    """File-based SQLite engine (the exporter streams on one connection, looks up on another)"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _seed(engine, count: int, first: int = 0, turns: int = 2) -> None:
+    """Votes on `count` battles (one per session, `turns` turns each), one per day"""
+    battles, turn_rows, messages, votes = [], [], [], []
+    for i in range(first, first + count):
+        session_id, battle_id = f"session_{i}", f"battle_{i}"
+        at = START + timedelta(days=i)
+        battles.append(
+            {
+                "battle_id": battle_id,
+                "session_id": session_id,
+                "left_model_id": "model-a",
+                "right_model_id": "model-b",
+                "seq_in_session": 0,
+                "status": "voted",
+                "created_at": at,
+                "updated_at": at,
+            }
+        )
+        for seq in range(turns):
+            turn_id = f"turn_{i}_{seq}"
+            turn_rows.append(
+                {
+                    "turn_id": turn_id,
+                    "session_id": session_id,
+                    "battle_id": battle_id,
+                    "battle_seq_in_session": 0,
+                    "seq": seq,
+                    "user_input": f"question {i}.{seq}",
+                    "created_at": at,
+                }
+            )
+            for seq_in_turn, side in enumerate(("left", "right")):
+                messages.append(
+                    {
+                        "message_id": f"msg_{turn_id}_{side}",
+                        "session_id": session_id,
+                        "battle_id": battle_id,
+                        "turn_id": turn_id,
+                        "battle_seq_in_session": 0,
+                        "turn_seq": seq,
+                        "seq_in_turn": seq_in_turn,
+                        "side": side,
+                        "content": f"{side} answer {i}.{seq}",
+                        "created_at": at,
+                    }
+                )
+        votes.append(
+            {
+                "vote_id": f"vote_{i}",
+                "battle_id": battle_id,
+                "session_id": session_id,
+                "vote": "left_better",
+                "left_model_id": "model-a",
+                "right_model_id": "model-b",
+                "processing_status": "processed",
+                "voted_at": at,
+            }
+        )
+    async with engine.begin() as conn:
+        await conn.execute(insert(Battle.__table__), battles)
+        await conn.execute(insert(Turn.__table__), turn_rows)
+        await conn.execute(insert(Message.__table__), messages)
+        await conn.execute(insert(Vote.__table__), votes)
+
+
+def _read(directory) -> list:
+    """All records of the JSONL parts, in part order"""
+    records = []
+    for path in sorted(directory.glob("votes-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+@pytest.mark.asyncio
+async def test_export_writes_votes_with_conversations(engine, tmp_path):
+    """Test votes are exported in order with turn-by-turn conversations, split into parts"""
+    # Arrange
+    await _seed(engine, 5)
+    output = tmp_path / "out"
+
+    # Act
+    state = await VoteExporter(engine, output, rows_per_file=2, batch_size=3).run()
+
+    # Assert
+    records = _read(output)
+    assert [record["vote_id"] for record in records] == [f"vote_{i}" for i in range(5)]
+    assert records[0]["conversation"] == [
+        {"user": "question 0.0", "left": "left answer 0.0", "right": "right answer 0.0"},
+        {"user": "question 0.1", "left": "left answer 0.1", "right": "right answer 0.1"},
+    ]
+    assert records[0]["voted_at"] == START.isoformat()
+    assert state.parts == 3 and state.rows == 5
+    assert state.files == ["votes-00000.jsonl.gz", "votes-00001.jsonl.gz", "votes-00002.jsonl.gz"]
+    assert not list(output.glob("*.partial"))
+
+
+@pytest.mark.asyncio
+async def test_export_resolves_offloaded_bodies(engine, tmp_path):
+    """Test conversations stored in content_blobs are exported in full"""
+    # Arrange: move battle 0's first turn out of line, as content_offload does
+    await _seed(engine, 1)
+    async with AsyncSession(engine) as session:
+        prompt_hash, left_hash = await store_contents(session, ["question 0.0", "left answer 0.0"])
+        await session.execute(
+            update(Turn)
+            .where(Turn.turn_id == "turn_0_0")
+            .values(user_input=None, user_input_hash=prompt_hash)
+        )
+        await session.execute(
+            update(Message)
+            .where(Message.message_id == "msg_turn_0_0_left")
+            .values(content=None, content_hash=left_hash)
+        )
+        await session.commit()
+
+    # Act
+    await VoteExporter(engine, tmp_path / "out").run()
+
+    # Assert
+    conversation = _read(tmp_path / "out")[0]["conversation"]
+    assert conversation[0] == {
+        "user": "question 0.0",
+        "left": "left answer 0.0",
+        "right": "right answer 0.0",
+    }
+    assert conversation[1]["user"] == "question 0.1"
+
+
+@pytest.mark.asyncio
+async def test_export_filters_by_time_range(engine, tmp_path):
+    """Test --since is inclusive and --until exclusive"""
+    # Arrange
+    await _seed(engine, 5)
+
+    # Act
+    await VoteExporter(
+        engine,
+        tmp_path / "out",
+        since=START + timedelta(days=1),
+        until=START + timedelta(days=3),
+    ).run()
+
+    # Assert
+    assert [record["vote_id"] for record in _read(tmp_path / "out")] == ["vote_1", "vote_2"]
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_after_interruption(engine, tmp_path, monkeypatch):
+    """Test a failed run keeps completed parts and a re-run exports each vote once"""
+    # Arrange
+    await _seed(engine, 5)
+    output = tmp_path / "out"
+    real_finish = VoteExporter._finish_part
+    calls = []
+
+    def failing_finish(self, part, state, rows, last_key):
+        calls.append(rows)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        real_finish(self, part, state, rows, last_key)
+
+    monkeypatch.setattr(VoteExporter, "_finish_part", failing_finish)
+    with pytest.raises(OSError):
+        await VoteExporter(engine, output, rows_per_file=2, batch_size=1).run()
+    monkeypatch.setattr(VoteExporter, "_finish_part", real_finish)
+
+    # Act
+    state = await VoteExporter(engine, output, rows_per_file=2, batch_size=1).run()
+
+    # Assert
+    assert [record["vote_id"] for record in _read(output)] == [f"vote_{i}" for i in range(5)]
+    assert state.rows == 5
+    assert not list(output.glob("*.partial"))
+
+
+@pytest.mark.asyncio
+async def test_completed_export_continues_with_new_votes(engine, tmp_path):
+    """Test re-running a completed export appends only votes cast since"""
+    # Arrange
+    await _seed(engine, 2)
+    output = tmp_path / "out"
+    await VoteExporter(engine, output).run()
+    await _seed(engine, 2, first=2)
+
+    # Act
+    state = await VoteExporter(engine, output).run()
+
+    # Assert
+    assert [record["vote_id"] for record in _read(output)] == [f"vote_{i}" for i in range(4)]
+    assert state.parts == 2
+
+
+@pytest.mark.asyncio
+async def test_export_with_other_settings_requires_restart(engine, tmp_path):
+    """Test an output directory is not mixed between exports with different filters"""
+    # Arrange
+    await _seed(engine, 3)
+    output = tmp_path / "out"
+    await VoteExporter(engine, output).run()
+    other = VoteExporter(engine, output, since=START + timedelta(days=2))
+
+    # Act & Assert
+    with pytest.raises(ExportStateError):
+        await other.run()
+    state = await other.run(restart=True)
+    assert state.rows == 1
+    assert [record["vote_id"] for record in _read(output)] == ["vote_2"]
+
+
+def test_parse_timestamp_defaults_to_utc():
+    """Test naive filters are read as UTC"""
+    # Act & Assert
+    assert parse_timestamp("2026-07-01") == START
+    assert parse_timestamp(None) is None
+
+
+def test_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    """Test a missing pyarrow is reported with the install hint"""
+    # Arrange
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_pyarrow(name, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="requires pyarrow"):
+        export._ParquetPart(tmp_path / "votes-00000.parquet")
@@ -0,0 +1,208 @@
+"""
+Tests for worker leader election
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from llmbattler_shared.models import Vote, WorkerStatus
+from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+from llmbattler_worker.leader import LeaderElection, LeadershipLostError
+from llmbattler_worker.main import run_leader_aggregation
+
+
+def _make_election(session: AsyncSession, instance_id: str) -> LeaderElection:
+    """Build election on the test session's engine"""
+    engine = session.bind
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return LeaderElection(engine, session_maker, instance_id=instance_id)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_is_always_leader(test_db_session):
+    """Test election is a no-op on SQLite: the single process leads"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+
+    # Act
+    is_leader = await election.check()
+
+    # Assert
+    assert is_leader is True
+    assert election.is_leader is True
+
+
+@pytest.mark.asyncio
+async def test_check_records_leader_in_worker_status(test_db_session):
+    """Test leader id and heartbeat are visible in worker_status"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+
+    # Act
+    await election.check()
+
+    # Assert
+    result = await test_db_session.execute(
+        select(WorkerStatus).where(WorkerStatus.worker_name == "elo_aggregator")
+    )
+    worker_status = result.scalar_one()
+    assert worker_status.leader_id == "worker-a:1"
+    assert worker_status.leader_heartbeat_at is not None
+    assert worker_status.status == "idle"
+
+
+@pytest.mark.asyncio
+async def test_release_drops_leadership(test_db_session):
+    """Test release() demotes the replica"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+    await election.check()
+
+    # Act
+    await election.release()
+
+    # Assert
+    assert election.is_leader is False
+
+
+@pytest.mark.asyncio
+async def test_standby_skips_aggregation(test_db_session, monkeypatch):
+    """Test scheduled job does nothing on a standby replica"""
+    # Arrange: Pending vote and a replica that is not the leader
+    test_db_session.add(
+        Vote(
+            vote_id="vote_standby",
+            battle_id="battle_standby",
+            session_id="session_1",
+            vote="left_better",
+            left_model_id="gpt-4",
+            right_model_id="claude-3",
+            processing_status="pending",
+        )
+    )
+    await test_db_session.commit()
+
+    election = _make_election(test_db_session, "worker-b:1")
+    run_aggregation = AsyncMock()
+    monkeypatch.setattr("llmbattler_worker.main.run_aggregation", run_aggregation)
+
+    # Act
+    await run_leader_aggregation(election)
+
+    # Assert: Aggregation not started, vote still pending
+    run_aggregation.assert_not_awaited()
+    result = await test_db_session.execute(select(Vote).where(Vote.vote_id == "vote_standby"))
+    assert result.scalar_one().processing_status == "pending"
+
+
+@pytest.mark.asyncio
+async def test_leader_runs_aggregation(test_db_session, monkeypatch):
+    """Test scheduled job runs aggregation on the leader"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+    await election.check()
+    run_aggregation = AsyncMock()
+    monkeypatch.setattr("llmbattler_worker.main.run_aggregation", run_aggregation)
+
+    # Act
+    await run_leader_aggregation(election)
+
+    # Assert
+    run_aggregation.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ensure_leader_raises_after_release(test_db_session):
+    """Test the write fence rejects a replica that gave up leadership"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+    await election.check()
+    await election.ensure_leader()  # Leader: passes
+    await election.release()
+
+    # Act / Assert
+    with pytest.raises(LeadershipLostError):
+        await election.ensure_leader()
+
+
+@pytest.mark.asyncio
+async def test_lost_leadership_stops_aggregation_before_next_chunk(test_db_session):
+    """Test a fenced run commits nothing once leadership is lost mid-run"""
+    # Arrange: 4 pending votes (2 chunks of 2)
+    for i in range(4):
+        test_db_session.add(
+            Vote(
+                vote_id=f"vote_fence_{i}",
+                battle_id=f"battle_fence_{i}",
+                session_id="session_1",
+                vote="left_better",
+                left_model_id="gpt-4",
+                right_model_id="claude-3",
+                processing_status="pending",
+            )
+        )
+    await test_db_session.commit()
+
+    election = _make_election(test_db_session, "worker-a:1")
+    await election.check()
+    fence_calls = 0
+
+    async def fence():
+        # Leadership is lost after the first chunk was committed
+        nonlocal fence_calls
+        fence_calls += 1
+        if fence_calls == 2:
+            await election.release()
+        await election.ensure_leader()
+
+    aggregator = ELOAggregator(test_db_session, chunk_size=2, fence=fence)
+
+    # Act
+    with pytest.raises(LeadershipLostError):
+        await aggregator.process_pending_votes()
+    await test_db_session.rollback()
+
+    # Assert: First chunk is durable, second chunk was not written
+    result = await test_db_session.execute(select(Vote.processing_status).order_by(Vote.vote_id))
+    assert result.scalars().all() == ["processed", "processed", "pending", "pending"]
+
+
+@pytest.mark.asyncio
+async def test_leader_skips_aggregation_while_replay_holds_fence(test_db_session, monkeypatch):
+    """Test the leader starts no run while a replay holds the replay fence"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+    await election.check()
+    monkeypatch.setattr(election, "enter_aggregation", AsyncMock(return_value=False))
+    monkeypatch.setattr(election, "exit_aggregation", AsyncMock())
+    run_aggregation = AsyncMock()
+    monkeypatch.setattr("llmbattler_worker.main.run_aggregation", run_aggregation)
+
+    # Act
+    await run_leader_aggregation(election)
+
+    # Assert
+    run_aggregation.assert_not_awaited()
+    election.exit_aggregation.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_leader_releases_fence_after_failed_run(test_db_session, monkeypatch):
+    """Test the replay fence is released even when the aggregation run fails"""
+    # Arrange
+    election = _make_election(test_db_session, "worker-a:1")
+    await election.check()
+    monkeypatch.setattr(election, "exit_aggregation", AsyncMock())
+    run_aggregation = AsyncMock(side_effect=RuntimeError("database down"))
+    monkeypatch.setattr("llmbattler_worker.main.run_aggregation", run_aggregation)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        await run_leader_aggregation(election)
+
+    # Assert
+    election.exit_aggregation.assert_awaited_once()
@@ -7,8 +7,9 @@ from datetime import UTC, datetime
 import pytest
 from sqlmodel import select
 
-from llmbattler_shared.models import Vote, WorkerStatus
-from llmbattler_worker.main import run_aggregation
+from llmbattler_shared.config import settings
+from llmbattler_shared.models import ModelRatingHistory, Vote, WorkerStatus
+from llmbattler_worker.main import _describe_schedule, run_aggregation
 
 
 @pytest.mark.asyncio
@@ -154,3 +155,92 @@ async def test_run_aggregation_failure_updates_status(test_db_session):
     failed_vote = result.scalar_one()
     assert failed_vote.processing_status == "failed"
     assert failed_vote.error_message is not None
+
+
+@pytest.mark.asyncio
+async def test_run_aggregation_records_rating_history(test_db_session):
+    """Test aggregation appends one rating snapshot per model when votes are processed"""
+    # Arrange: Create pending vote
+    vote = Vote(
+        vote_id="vote_history",
+        battle_id="battle_history",
+        session_id="session_1",
+        vote="left_better",
+        left_model_id="gpt-4",
+        right_model_id="claude-3",
+        processing_status="pending",
+    )
+    test_db_session.add(vote)
+    await test_db_session.commit()
+
+    # Act: Run aggregation twice (second run has no pending votes)
+    await run_aggregation(test_db_session)
+    await run_aggregation(test_db_session)
+
+    # Assert: Only the first run wrote snapshots
+    result = await test_db_session.execute(select(ModelRatingHistory))
+    snapshots = result.scalars().all()
+
+    assert sorted(s.model_id for s in snapshots) == ["claude-3", "gpt-4"]
+    assert len({s.recorded_at for s in snapshots}) == 1
+    by_model = {s.model_id: s for s in snapshots}
+    assert by_model["gpt-4"].elo_score > 1500
+    assert by_model["claude-3"].elo_score < 1500
+    assert by_model["gpt-4"].vote_count == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduled_run_snapshots_incremental_changes(test_db_session):
+    """Test incremental runs skip history; the next scheduled run snapshots their changes"""
+    # Arrange: Vote consumed by an incremental (notification-triggered) run
+    vote = Vote(
+        vote_id="vote_incremental",
+        battle_id="battle_incremental",
+        session_id="session_1",
+        vote="left_better",
+        left_model_id="gpt-4",
+        right_model_id="claude-3",
+        processing_status="pending",
+    )
+    test_db_session.add(vote)
+    await test_db_session.commit()
+
+    await run_aggregation(test_db_session, triggered_by="notification")
+    result = await test_db_session.execute(select(ModelRatingHistory))
+    assert result.scalars().all() == []
+
+    # Act: Scheduled run with no pending votes left
+    await run_aggregation(test_db_session)
+
+    # Assert: Snapshot taken once
+    result = await test_db_session.execute(select(ModelRatingHistory))
+    snapshots = result.scalars().all()
+    assert sorted(s.model_id for s in snapshots) == ["claude-3", "gpt-4"]
+
+    await run_aggregation(test_db_session)
+    result = await test_db_session.execute(select(ModelRatingHistory))
+    assert len(result.scalars().all()) == 2
+
+
+def test_describe_schedule_fixed(monkeypatch):
+    """Test the startup log names fixed mode and its interval"""
+    # Arrange
+    monkeypatch.setattr(settings, "worker_schedule_mode", "fixed")
+    monkeypatch.setattr(settings, "worker_interval_minutes", 15)
+
+    # Act & Assert
+    assert _describe_schedule() == "fixed, every 15 minute(s)"
+
+
+def test_describe_schedule_adaptive(monkeypatch):
+    """Test the startup log names adaptive mode with its min/max delay"""
+    # Arrange
+    monkeypatch.setattr(settings, "worker_schedule_mode", "adaptive")
+    monkeypatch.setattr(settings, "worker_adaptive_min_seconds", 10)
+    monkeypatch.setattr(settings, "worker_adaptive_max_seconds", 600)
+
+    # Act
+    description = _describe_schedule()
+
+    # Assert
+    assert description.startswith("adaptive, every 10-600s depending on backlog")
@@ -0,0 +1,159 @@
+"""
+Tests for worker run metrics and the metrics endpoint
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from llmbattler_shared.models import Vote, WorkerRun
+from llmbattler_worker.main import run_aggregation
+from llmbattler_worker.metrics import MetricsServer, get_vote_backlog
+from llmbattler_worker.scheduling import SchedulerStats
+
+
+def _vote(vote_id: str, **kwargs) -> Vote:
+    """Pending vote between gpt-4 and claude-3"""
+    return Vote(
+        vote_id=vote_id,
+        battle_id=f"battle_{vote_id}",
+        session_id="session_1",
+        vote=kwargs.pop("vote", "left_better"),
+        left_model_id="gpt-4",
+        right_model_id="claude-3",
+        processing_status="pending",
+        **kwargs,
+    )
+
+
+async def _get(port: int, path: str) -> tuple[str, str]:
+    """Send GET request, return (status line, body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = (await reader.read()).decode()
+    writer.close()
+    head, body = response.split("\r\n\r\n", 1)
+    return head.split("\r\n")[0], body
+
+
+@pytest.mark.asyncio
+async def test_run_aggregation_records_worker_run(test_db_session):
+    """Test each run appends timings, throughput and backlog to worker_runs"""
+    # Arrange
+    test_db_session.add(_vote("vote_1"))
+    test_db_session.add(_vote("vote_2", vote="invalid_vote_type"))
+    await test_db_session.commit()
+
+    # Act
+    await run_aggregation(test_db_session, triggered_by="notification")
+
+    # Assert
+    run = (await test_db_session.execute(select(WorkerRun))).scalar_one()
+    assert run.worker_name == "elo_aggregator"
+    assert run.triggered_by == "notification"
+    assert run.status == "success"
+    assert run.votes_processed == 1
+    assert run.votes_failed == 1
+    assert run.pending_votes == 0
+    assert run.oldest_pending_age_seconds is None
+    assert run.duration_seconds >= run.load_seconds + run.compute_seconds + run.write_seconds
+    assert run.load_seconds > 0 and run.write_seconds > 0
+    assert run.votes_per_second > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_recorded(test_db_session, monkeypatch):
+    """Test a failing run is recorded with its error"""
+
+    # Arrange
+    async def fail(self):
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr("llmbattler_worker.main.ELOAggregator.process_pending_votes", fail)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        await run_aggregation(test_db_session)
+
+    # Assert
+    run = (await test_db_session.execute(select(WorkerRun))).scalar_one()
+    assert run.status == "failed"
+    assert run.error_message == "database down"
+
+
+@pytest.mark.asyncio
+async def test_vote_backlog_reports_oldest_pending_age(test_db_session):
+    """Test backlog counts pending votes and ages the oldest one"""
+    # Arrange
+    test_db_session.add(_vote("vote_old", voted_at=datetime.now(UTC) - timedelta(minutes=10)))
+    test_db_session.add(_vote("vote_new"))
+    await test_db_session.commit()
+
+    # Act
+    pending, oldest_age = await get_vote_backlog(test_db_session)
+
+    # Assert
+    assert pending == 2
+    assert 600 <= oldest_age < 660
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(test_db_session):
+    """Test /metrics exposes backlog and last run; /health and unknown paths"""
+    # Arrange: One finished run, one vote pending since
+    await run_aggregation(test_db_session)
+    test_db_session.add(_vote("vote_pending"))
+    await test_db_session.commit()
+
+    session_maker = sessionmaker(test_db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    server = MetricsServer(session_maker, election=None, host="127.0.0.1", port=0)
+    await server.start()
+
+    try:
+        # Act
+        metrics_status, metrics = await _get(server.port, "/metrics")
+        health_status, health = await _get(server.port, "/health")
+        missing_status, _ = await _get(server.port, "/nope")
+    finally:
+        await server.stop()
+
+    # Assert
+    assert metrics_status == "HTTP/1.1 200 OK"
+    assert "llmbattler_worker_pending_votes 1" in metrics
+    assert "# TYPE llmbattler_worker_oldest_pending_vote_age_seconds gauge" in metrics
+    assert 'llmbattler_worker_last_run_duration_seconds{phase="write"}' in metrics
+    assert "llmbattler_worker_last_run_success 1" in metrics
+    assert "llmbattler_worker_votes_awaiting_retry 0" in metrics
+    assert "llmbattler_worker_dead_letter_votes 0" in metrics
+    assert health_status == "HTTP/1.1 200 OK" and health == "ok\n"
+    assert missing_status == "HTTP/1.1 404 Not Found"
+
+
+@pytest.mark.asyncio
+async def test_metrics_expose_scheduler_stats(test_db_session):
+    """Test missed/coalesced run counters and the adaptive interval are exposed"""
+    # Arrange
+    session_maker = sessionmaker(test_db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    stats = SchedulerStats(runs_missed=2, runs_coalesced=3, next_interval_seconds=40.0)
+    server = MetricsServer(
+        session_maker, election=None, host="127.0.0.1", port=0, scheduler_stats=stats
+    )
+
+    # Act
+    metrics = await server.render()
+
+    # Assert
+    assert "# TYPE llmbattler_worker_runs_missed_total counter" in metrics
+    assert "llmbattler_worker_runs_missed_total 2" in metrics
+    assert "llmbattler_worker_runs_coalesced_total 3" in metrics
+    assert "llmbattler_worker_next_run_interval_seconds 40.0" in metrics
+    # Every *_total series is declared a counter
+    total_types = [
+        line for line in metrics.splitlines() if line.startswith("# TYPE") and "_total " in line
+    ]
+    assert total_types and all(line.endswith(" counter") for line in total_types)
@@ -0,0 +1,116 @@
+"""
+Tests for the near-real-time aggregation trigger
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from llmbattler_shared.models import Vote
+from llmbattler_worker.notifications import VoteNotificationTrigger
+
+
+def _make_trigger(session: AsyncSession, run: AsyncMock) -> VoteNotificationTrigger:
+    """Build trigger on the test session's engine"""
+    engine = session.bind
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return VoteNotificationTrigger(
+        engine, session_maker, run=run, channel="votes_pending", debounce_seconds=0.01
+    )
+
+
+@pytest.mark.asyncio
+async def test_notifications_are_debounced(test_db_session):
+    """Test a burst of notifications results in a single run"""
+    # Arrange
+    run = AsyncMock()
+    trigger = _make_trigger(test_db_session, run)
+
+    # Act
+    for i in range(10):
+        trigger._on_notification(None, 0, "votes_pending", f"vote_{i}")
+    await asyncio.sleep(0.1)
+
+    # Assert
+    run.assert_awaited_once()
+    await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_notification_during_run_triggers_follow_up(test_db_session):
+    """Test a vote arriving mid-run is picked up by one more run"""
+    # Arrange: First run receives a notification while running
+    calls = []
+
+    async def run():
+        if not calls:
+            trigger.request_run()
+            trigger.request_run()
+        calls.append(1)
+
+    trigger = _make_trigger(test_db_session, run)
+
+    # Act
+    trigger.request_run()
+    await asyncio.sleep(0.1)
+
+    # Assert
+    assert len(calls) == 2
+    await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_run_keeps_trigger_alive(test_db_session):
+    """Test an aggregation error does not stop later runs"""
+    # Arrange
+    run = AsyncMock(side_effect=[RuntimeError("database down"), None])
+    trigger = _make_trigger(test_db_session, run)
+
+    # Act
+    trigger.request_run()
+    await asyncio.sleep(0.05)
+    trigger.request_run()
+    await asyncio.sleep(0.05)
+
+    # Assert
+    assert run.await_count == 2
+    await trigger.stop()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_poll_runs_when_votes_pending(test_db_session):
+    """Test polling fallback: run only if a vote is pending"""
+    # Arrange
+    run = AsyncMock()
+    trigger = _make_trigger(test_db_session, run)
+
+    # Act: Nothing pending
+    await trigger.start()
+    await asyncio.sleep(0.05)
+
+    # Assert
+    assert trigger.is_listening is False
+    run.assert_not_awaited()
+
+    # Act: Vote arrives, next poll picks it up
+    test_db_session.add(
+        Vote(
+            vote_id="vote_poll",
+            battle_id="battle_poll",
+            session_id="session_1",
+            vote="tie",
+            left_model_id="gpt-4",
+            right_model_id="claude-3",
+            processing_status="pending",
+        )
+    )
+    await test_db_session.commit()
+    await trigger.poll()
+    await asyncio.sleep(0.05)
+
+    # Assert
+    run.assert_awaited_once()
+    await trigger.stop()
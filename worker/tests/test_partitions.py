@@ -0,0 +1,124 @@
+"""
+Tests for votes partition maintenance
+
+Partitioning itself needs PostgreSQL; these tests cover the month arithmetic
+and partition selection, and the no-op on SQLite.
+"""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+
+from llmbattler_shared.models import Vote
+from llmbattler_worker.partitions import (
+    VotePartitionManager,
+    add_months,
+    expired_partitions,
+    missing_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_month_start_uses_utc():
+    """Test month boundaries are taken in UTC"""
+    # Arrange: 2026-11-01 00:30 at UTC+2 is still October in UTC
+    local = datetime(2026, 11, 1, 0, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    # Act & Assert
+    assert month_start(local) == datetime(2026, 10, 1, tzinfo=UTC)
+    assert month_start(datetime(2026, 10, 19, 12, 0)) == datetime(2026, 10, 1, tzinfo=UTC)
+
+
+def test_add_months_crosses_years():
+    """Test month shifts wrap around year boundaries in both directions"""
+    # Arrange
+    october = datetime(2026, 10, 1, tzinfo=UTC)
+
+    # Act & Assert
+    assert add_months(october, 3) == datetime(2027, 1, 1, tzinfo=UTC)
+    assert add_months(october, -10) == datetime(2025, 12, 1, tzinfo=UTC)
+    assert add_months(october, 0) == october
+
+
+def test_partition_name_round_trip():
+    """Test partition names encode their month and parse back"""
+    # Arrange
+    month = datetime(2026, 3, 1, tzinfo=UTC)
+
+    # Act
+    name = partition_name(month)
+
+    # Assert
+    assert name == "votes_p2026_03"
+    assert partition_month(name) == month
+    assert partition_month("votes_default") is None
+    assert partition_month("votes_p2026_3") is None
+
+
+def test_missing_partitions_covers_current_and_upcoming_months():
+    """Test only months without a partition are created"""
+    # Arrange
+    now = datetime(2026, 11, 20, tzinfo=UTC)
+    existing = ["votes_default", "votes_p2026_10", "votes_p2026_11", "votes_p2026_12"]
+
+    # Act
+    missing = missing_partitions(existing, now, months_ahead=3)
+
+    # Assert
+    assert [partition_name(month) for month in missing] == ["votes_p2027_01", "votes_p2027_02"]
+
+
+def test_expired_partitions_keeps_retention_window():
+    """Test partitions older than the retention window are selected, oldest first"""
+    # Arrange
+    now = datetime(2026, 10, 19, tzinfo=UTC)
+    existing = [
+        "votes_p2026_10",
+        "votes_p2025_09",
+        "votes_default",
+        "votes_p2025_08",
+        "votes_p2025_10",
+    ]
+
+    # Act
+    expired = expired_partitions(existing, now, retention_months=12)
+
+    # Assert: October 2025 onwards is kept (12 full months before October 2026)
+    assert expired == ["votes_p2025_08", "votes_p2025_09"]
+    assert expired_partitions(existing, now, retention_months=0) == []
+
+
+@pytest.mark.asyncio
+async def test_partition_manager_is_noop_on_sqlite(test_db_session):
+    """Test maintenance leaves a non-partitioned votes table untouched"""
+    # Arrange
+    test_db_session.add(
+        Vote(
+            vote_id="vote_1",
+            battle_id="battle_1",
+            session_id="session_1",
+            vote="left_better",
+            left_model_id="gpt-4",
+            right_model_id="claude-3",
+            voted_at=datetime(2020, 1, 1, tzinfo=UTC),
+        )
+    )
+    await test_db_session.commit()
+    session_maker = sessionmaker(test_db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    manager = VotePartitionManager(
+        session_maker, months_ahead=3, retention_months=1, archive_schema="archive"
+    )
+
+    # Act
+    created, archived = await manager.run()
+
+    # Assert
+    assert created == []
+    assert archived == []
+    result = await test_db_session.execute(select(Vote))
+    assert len(result.scalars().all()) == 1
@@ -0,0 +1,221 @@
+"""
+Tests for full rating recompute (replay mode)
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from llmbattler_shared.models import (
+    ModelPairwiseStats,
+    ModelSegmentStats,
+    ModelStats,
+    RatingReplay,
+    Vote,
+)
+from llmbattler_worker.aggregators.elo_aggregator import ELOAggregator
+from llmbattler_worker.replay import RatingReplayer
+
+
+MODEL_CONFIGS = {
+    "gpt-4": {"organization": "OpenAI", "license": "proprietary"},
+    "claude-3": {"organization": "Anthropic", "license": "proprietary"},
+    "llama-3": {"organization": "Meta", "license": "open-source"},
+}
+
+OUTCOMES = ["left_better", "right_better", "tie", "both_bad", "left_better", "left_better"]
+PAIRS = [("gpt-4", "claude-3"), ("claude-3", "llama-3"), ("llama-3", "gpt-4")]
+
+
+async def _add_votes(session, prefix, count):
+    """Add pending votes cycling through outcomes and model pairs"""
+    for i in range(count):
+        left, right = PAIRS[i % len(PAIRS)]
+        session.add(
+            Vote(
+                vote_id=f"{prefix}-{i}",
+                battle_id=f"{prefix}-battle-{i}",
+                session_id="session-1",
+                vote=OUTCOMES[i % len(OUTCOMES)],
+                left_model_id=left,
+                right_model_id=right,
+                processing_status="pending",
+            )
+        )
+    await session.commit()
+
+
+async def _snapshot(session):
+    """All stats rows as comparable tuples"""
+    model_stats = await session.execute(select(ModelStats).order_by(ModelStats.model_id))
+    segment_stats = await session.execute(
+        select(ModelSegmentStats).order_by(
+            ModelSegmentStats.segment_type,
+            ModelSegmentStats.segment_value,
+            ModelSegmentStats.model_id,
+        )
+    )
+    pairwise_stats = await session.execute(
+        select(ModelPairwiseStats).order_by(
+            ModelPairwiseStats.model_a_id, ModelPairwiseStats.model_b_id
+        )
+    )
+    return (
+        [
+            (s.model_id, s.elo_score, s.vote_count, s.win_count, s.loss_count, s.tie_count)
+            for s in model_stats.scalars()
+        ],
+        [
+            (s.segment_type, s.segment_value, s.model_id, s.elo_score, s.vote_count)
+            for s in segment_stats.scalars()
+        ],
+        [
+            (p.model_a_id, p.model_b_id, p.a_win_count, p.b_win_count, p.tie_count)
+            for p in pairwise_stats.scalars()
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_rebuilds_stats_from_votes(test_db_session):
+    """Test replay reproduces incremental results after stats were corrupted"""
+    # Arrange: Process votes incrementally, remember result, then corrupt stats
+    await _add_votes(test_db_session, "vote", 12)
+    await ELOAggregator(test_db_session, model_configs=MODEL_CONFIGS).process_pending_votes()
+    expected = await _snapshot(test_db_session)
+
+    result = await test_db_session.execute(select(ModelStats))
+    for stats in result.scalars():
+        stats.elo_score = 9999
+        stats.vote_count = 0
+    await test_db_session.commit()
+
+    # Act
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=5)
+    votes_replayed = await replayer.run()
+
+    # Assert
+    assert votes_replayed == 12
+    assert await _snapshot(test_db_session) == expected
+
+    result = await test_db_session.execute(select(RatingReplay))
+    replay = result.scalar_one()
+    assert replay.status == "completed"
+    assert replay.votes_replayed == 12
+
+
+@pytest.mark.asyncio
+async def test_replay_resumes_from_checkpoint(test_db_session):
+    """Test an interrupted replay resumes after its last checkpoint"""
+    # Arrange
+    await _add_votes(test_db_session, "vote", 12)
+    await ELOAggregator(test_db_session, model_configs=MODEL_CONFIGS).process_pending_votes()
+    expected = await _snapshot(test_db_session)
+
+    # Interrupt the first replay while writing its second chunk
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=5)
+    write_rating_state = replayer._write_rating_state
+    calls = 0
+
+    async def failing_write_rating_state():
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("worker killed")
+        await write_rating_state()
+
+    replayer._write_rating_state = failing_write_rating_state
+    with pytest.raises(RuntimeError):
+        await replayer.run()
+    await test_db_session.rollback()
+
+    result = await test_db_session.execute(select(RatingReplay))
+    assert result.scalar_one().votes_replayed == 5  # First chunk checkpointed
+
+    # Act: Resume with a fresh replayer
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=5)
+    votes_replayed = await replayer.run()
+
+    # Assert: Same result as an uninterrupted run
+    assert votes_replayed == 12
+    assert await _snapshot(test_db_session) == expected
+
+
+@pytest.mark.asyncio
+async def test_replay_catches_up_votes_processed_after_cutoff(test_db_session):
+    """Test votes processed by live workers during the replay are included"""
+    # Arrange: Votes processed before the replay starts
+    await _add_votes(test_db_session, "old", 6)
+    await ELOAggregator(test_db_session, model_configs=MODEL_CONFIGS).process_pending_votes()
+
+    # Replay starts (cutoff recorded), then live worker processes more votes
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=4)
+    await replayer._create_shadow_tables()
+    await replayer._start_or_resume(restart=False)
+
+    await _add_votes(test_db_session, "new", 3)
+    await ELOAggregator(test_db_session, model_configs=MODEL_CONFIGS).process_pending_votes()
+    expected = await _snapshot(test_db_session)
+
+    # Act: Replay resumes the started run
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=4)
+    votes_replayed = await replayer.run()
+
+    # Assert
+    assert votes_replayed == 9
+    assert await _snapshot(test_db_session) == expected
+
+
+@pytest.mark.asyncio
+async def test_replay_applies_late_processed_votes_in_voted_at_order(test_db_session):
+    """Test a vote processed after the replay started is applied in voted_at order"""
+    # Arrange: A retry-delayed vote sits between two processed ones
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    for i, (vote_id, status) in enumerate(
+        [("vote-0", "pending"), ("vote-retry", "failed"), ("vote-2", "pending")]
+    ):
+        left, right = PAIRS[i]
+        test_db_session.add(
+            Vote(
+                vote_id=vote_id,
+                battle_id=f"battle-{vote_id}",
+                session_id="session-1",
+                vote="left_better",
+                left_model_id=left,
+                right_model_id=right,
+                processing_status=status,
+                retry_count=1 if status == "failed" else 0,
+                next_attempt_at=datetime.now(UTC) + timedelta(hours=1)
+                if status == "failed"
+                else None,
+                voted_at=start + timedelta(minutes=i),
+            )
+        )
+    await test_db_session.commit()
+    await ELOAggregator(test_db_session, model_configs=MODEL_CONFIGS).process_pending_votes()
+
+    # Replay starts, then the live worker processes the retry
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=1)
+    await replayer._create_shadow_tables()
+    replay = await replayer._start_or_resume(restart=False)
+    assert replay.cutoff_at.replace(tzinfo=UTC) == start + timedelta(minutes=1)
+
+    retry = (
+        await test_db_session.execute(select(Vote).where(Vote.vote_id == "vote-retry"))
+    ).scalar_one()
+    retry.next_attempt_at = datetime.now(UTC) - timedelta(seconds=1)
+    await test_db_session.commit()
+    await ELOAggregator(test_db_session, model_configs=MODEL_CONFIGS).process_pending_votes()
+
+    # Act: Finish the started replay, then replay again from scratch
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=1)
+    votes_replayed = await replayer.run()
+    resumed = await _snapshot(test_db_session)
+
+    replayer = RatingReplayer(test_db_session, model_configs=MODEL_CONFIGS, chunk_size=1)
+    await replayer.run(restart=True)
+
+    # Assert: Same ratings as a replay that saw every vote up front
+    assert votes_replayed == 3
+    assert resumed == await _snapshot(test_db_session)
@@ -0,0 +1,299 @@
+"""
+Tests for conversation retention (abandoned battles, unvoted sessions)
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from llmbattler_shared.content import store_contents
+from llmbattler_shared.models import Battle, ContentBlob, Message, Session, Turn, Vote
+from llmbattler_worker.retention import ConversationRetention
+
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    """Session maker on a file-based SQLite database"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'retention.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _add_session(maker, session_id: str, last_active_at: datetime, battles) -> None:
+    """
+    Session with battles of one turn (two messages) each
+
+    Args:
+        battles: (status, updated_at) per battle; "voted" battles get a vote
+    """
+    async with maker() as db:
+        await db.execute(
+            insert(Session.__table__),
+            [
+                {
+                    "session_id": session_id,
+                    "title": "title",
+                    "created_at": last_active_at,
+                    "last_active_at": last_active_at,
+                }
+            ],
+        )
+        for seq, (status, updated_at) in enumerate(battles):
+            battle_id = f"{session_id}_battle_{seq}"
+            turn_id = f"{battle_id}_turn"
+            await db.execute(
+                insert(Battle.__table__),
+                [
+                    {
+                        "battle_id": battle_id,
+                        "session_id": session_id,
+                        "left_model_id": "model-a",
+                        "right_model_id": "model-b",
+                        "seq_in_session": seq,
+                        "status": status,
+                        "created_at": updated_at,
+                        "updated_at": updated_at,
+                    }
+                ],
+            )
+            await db.execute(
+                insert(Turn.__table__),
+                [
+                    {
+                        "turn_id": turn_id,
+                        "session_id": session_id,
+                        "battle_id": battle_id,
+                        "battle_seq_in_session": seq,
+                        "seq": 0,
+                        "user_input": "hello",
+                        "created_at": updated_at,
+                    }
+                ],
+            )
+            await db.execute(
+                insert(Message.__table__),
+                [
+                    {
+                        "message_id": f"{turn_id}_{side}",
+                        "session_id": session_id,
+                        "battle_id": battle_id,
+                        "turn_id": turn_id,
+                        "battle_seq_in_session": seq,
+                        "turn_seq": 0,
+                        "seq_in_turn": seq_in_turn,
+                        "side": side,
+                        "content": "hi",
+                        "created_at": updated_at,
+                    }
+                    for seq_in_turn, side in enumerate(("left", "right"))
+                ],
+            )
+            if status == "voted":
+                await db.execute(
+                    insert(Vote.__table__),
+                    [
+                        {
+                            "vote_id": f"{battle_id}_vote",
+                            "battle_id": battle_id,
+                            "session_id": session_id,
+                            "vote": "tie",
+                            "left_model_id": "model-a",
+                            "right_model_id": "model-b",
+                            "processing_status": "processed",
+                            "voted_at": updated_at,
+                        }
+                    ],
+                )
+        await db.commit()
+
+
+def _retention(session_maker, **settings) -> ConversationRetention:
+    """Retention job with everything disabled except the given settings"""
+    options = {
+        "abandon_hours": 0,
+        "abandoned_retention_days": 0,
+        "unvoted_session_retention_days": 0,
+    }
+    options.update(settings)
+    return ConversationRetention(session_maker, **options)
+
+
+async def _count(maker, column, **filters) -> int:
+    """Rows of column's table matching equality filters"""
+    async with maker() as db:
+        stmt = select(func.count()).select_from(column.table)
+        for name, value in filters.items():
+            stmt = stmt.where(column.table.c[name] == value)
+        return (await db.execute(stmt)).scalar_one()
+
+
+async def _statuses(maker, session_id: str) -> list:
+    """Battle statuses of a session in order"""
+    async with maker() as db:
+        result = await db.execute(
+            select(Battle.status)
+            .where(Battle.session_id == session_id)
+            .order_by(Battle.seq_in_session)
+        )
+        return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_idle_ongoing_battles_are_abandoned(session_maker):
+    """Test only ongoing battles idle past the threshold are marked abandoned"""
+    # Arrange
+    await _add_session(
+        session_maker,
+        "session_a",
+        NOW,
+        [
+            ("ongoing", NOW - timedelta(hours=30)),
+            ("ongoing", NOW - timedelta(hours=2)),
+            ("voted", NOW - timedelta(hours=30)),
+        ],
+    )
+    retention = _retention(session_maker, abandon_hours=24)
+
+    # Act
+    result = await retention.run(now=NOW)
+
+    # Assert
+    assert result.abandoned_battles == 1
+    assert await _statuses(session_maker, "session_a") == ["abandoned", "ongoing", "voted"]
+    assert await _count(session_maker, Message.id) == 6  # Nothing purged
+
+
+@pytest.mark.asyncio
+async def test_abandon_works_in_batches(session_maker):
+    """Test more idle battles than one batch are all marked"""
+    # Arrange
+    await _add_session(session_maker, "session_a", NOW, [("ongoing", NOW - timedelta(days=2))] * 5)
+    retention = _retention(session_maker, abandon_hours=24, batch_size=2)
+
+    # Act
+    result = await retention.run(now=NOW)
+
+    # Assert
+    assert result.abandoned_battles == 5
+    assert await _statuses(session_maker, "session_a") == ["abandoned"] * 5
+
+
+@pytest.mark.asyncio
+async def test_expired_abandoned_battles_are_purged(session_maker):
+    """Test expired abandoned battles lose their rows; voted and recent ones stay"""
+    # Arrange
+    await _add_session(
+        session_maker,
+        "session_a",
+        NOW,
+        [
+            ("abandoned", NOW - timedelta(days=10)),
+            ("voted", NOW - timedelta(days=10)),
+            ("abandoned", NOW - timedelta(days=1)),
+        ],
+    )
+    retention = _retention(
+        session_maker, abandon_hours=24, abandoned_retention_days=7, batch_size=1
+    )
+
+    # Act
+    result = await retention.run(now=NOW)
+
+    # Assert
+    assert result.purged_battles == 1
+    assert await _statuses(session_maker, "session_a") == ["voted", "abandoned"]
+    assert await _count(session_maker, Turn.id, battle_id="session_a_battle_0") == 0
+    assert await _count(session_maker, Message.id, battle_id="session_a_battle_0") == 0
+    assert await _count(session_maker, Message.id) == 4
+    assert await _count(session_maker, Session.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_old_unvoted_sessions_are_purged(session_maker):
+    """Test inactive sessions without votes are removed entirely"""
+    # Arrange
+    old = NOW - timedelta(days=100)
+    await _add_session(session_maker, "session_old", old, [("abandoned", old)] * 2)
+    await _add_session(session_maker, "session_voted", old, [("voted", old)])
+    await _add_session(session_maker, "session_recent", NOW, [("ongoing", NOW)])
+    retention = _retention(session_maker, unvoted_session_retention_days=90)
+
+    # Act
+    result = await retention.run(now=NOW)
+
+    # Assert
+    assert result.purged_sessions == 1
+    assert await _count(session_maker, Session.id, session_id="session_old") == 0
+    assert await _count(session_maker, Battle.id, session_id="session_old") == 0
+    assert await _count(session_maker, Turn.id, session_id="session_old") == 0
+    assert await _count(session_maker, Message.id, session_id="session_old") == 0
+    assert await _count(session_maker, Session.id) == 2
+    assert await _count(session_maker, Message.id) == 4
+
+
+@pytest.mark.asyncio
+async def test_archive_schema_skips_purge_on_sqlite(session_maker):
+    """Test archiving is not attempted without PostgreSQL (nothing is deleted)"""
+    # Arrange
+    await _add_session(session_maker, "session_a", NOW, [("abandoned", NOW - timedelta(days=10))])
+    retention = _retention(session_maker, abandoned_retention_days=7, archive_schema="archive")
+
+    # Act
+    result = await retention.run(now=NOW)
+
+    # Assert
+    assert result.purged_battles == 0
+    assert await _count(session_maker, Message.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_orphan_blobs_are_swept(session_maker):
+    """Test old blobs no turn or message references are removed; referenced and recent stay"""
+    # Arrange: Bodies of a purged battle, a live turn/message and a just-stored blob
+    await _add_session(session_maker, "session_a", NOW, [("abandoned", NOW - timedelta(days=10))])
+    await _add_session(session_maker, "session_b", NOW, [("voted", NOW - timedelta(days=10))])
+    async with session_maker() as db:
+        prompt, answer, purged, fresh = await store_contents(
+            db, ["live prompt", "live answer", "purged answer", "in-flight answer"]
+        )
+        await db.execute(
+            update(Turn).where(Turn.session_id == "session_b").values(user_input_hash=prompt)
+        )
+        await db.execute(
+            update(Message).where(Message.session_id == "session_b").values(content_hash=answer)
+        )
+        await db.execute(
+            update(Message).where(Message.session_id == "session_a").values(content_hash=purged)
+        )
+        await db.execute(
+            update(ContentBlob)
+            .where(ContentBlob.content_hash != fresh)
+            .values(created_at=NOW - timedelta(days=10))
+        )
+        await db.execute(
+            update(ContentBlob)
+            .where(ContentBlob.content_hash == fresh)
+            .values(created_at=NOW - timedelta(hours=1))
+        )
+        await db.commit()
+    retention = _retention(session_maker, abandoned_retention_days=7, batch_size=1)
+
+    # Act
+    result = await retention.run(now=NOW)
+
+    # Assert: Only the purged battle's body is gone
+    assert result.purged_battles == 1
+    assert result.purged_blobs == 1
+    async with session_maker() as db:
+        remaining = set((await db.execute(select(ContentBlob.content_hash))).scalars().all())
+    assert remaining == {prompt, answer, fresh}
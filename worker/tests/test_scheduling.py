@@ -0,0 +1,160 @@
+"""
+Tests for adaptive aggregation scheduling
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from llmbattler_worker.scheduling import AdaptiveAggregationLoop, SchedulerStats, next_interval
+
+
+def test_next_interval_shrinks_with_backlog():
+    """Test a growing backlog shortens the delay down to the minimum"""
+    # Act
+    one_chunk = next_interval(10, 1000, 1, min_seconds=10, max_seconds=600, backlog_target=1000)
+    large = next_interval(10, 1_000_000, 1, min_seconds=10, max_seconds=600, backlog_target=1000)
+
+    # Assert
+    assert one_chunk == 300
+    assert large == 10
+
+
+def test_next_interval_backs_off_when_idle():
+    """Test an empty backlog doubles the delay up to the maximum"""
+    # Act & Assert
+    assert next_interval(10, 0, 1, min_seconds=10, max_seconds=600, backlog_target=1000) == 20
+    assert next_interval(400, 0, 1, min_seconds=10, max_seconds=600, backlog_target=1000) == 600
+
+
+def test_next_interval_never_shorter_than_last_run():
+    """Test a slow run stretches the delay (at most half the time aggregating)"""
+    # Act
+    interval = next_interval(
+        10, 1_000_000, 45, min_seconds=10, max_seconds=600, backlog_target=1000
+    )
+
+    # Assert
+    assert interval == 45
+
+
+def _loop(run, backlog, lock=None, **kwargs) -> AdaptiveAggregationLoop:
+    """Loop with sub-second delays"""
+    options = dict(min_seconds=0.01, max_seconds=0.05, backlog_target=10, snapshot_seconds=3600)
+    options.update(kwargs)
+    return AdaptiveAggregationLoop(run=run, backlog=backlog, lock=lock or asyncio.Lock(), **options)
+
+
+@pytest.mark.asyncio
+async def test_loop_runs_immediately_then_snapshots_once_per_interval():
+    """Test the first run starts on start (with a history snapshot), later ones are adaptive"""
+    # Arrange
+    stop = asyncio.Event()
+    calls = []
+
+    async def run(triggered_by):
+        calls.append(triggered_by)
+        if len(calls) == 3:
+            stop.set()
+
+    async def backlog():
+        return 5
+
+    loop = _loop(run, backlog)
+
+    # Act
+    await asyncio.wait_for(loop.run_forever(stop), 2)
+
+    # Assert
+    assert calls == ["scheduled", "adaptive", "adaptive"]
+    assert loop.stats.next_interval_seconds == pytest.approx(0.05 * 10 / 15)
+
+
+@pytest.mark.asyncio
+async def test_loop_never_overlaps_and_coalesces_busy_runs():
+    """Test a due run is coalesced while another aggregation holds the lock"""
+    # Arrange
+    stop = asyncio.Event()
+    lock = asyncio.Lock()
+    calls = []
+
+    async def run(triggered_by):
+        async with lock:
+            calls.append(triggered_by)
+
+    async def backlog():
+        return 0
+
+    stats = SchedulerStats()
+    loop = _loop(run, backlog, lock=lock, stats=stats)
+    await loop.run_once(0.0)  # Initial run takes the history snapshot
+
+    # Act: A notification-triggered run holds the lock when the next run is due
+    await lock.acquire()
+    coalesced = asyncio.create_task(loop.run_once(1.0))
+    await asyncio.sleep(0.01)
+    finished_while_locked = coalesced.done()
+    lock.release()
+    await coalesced
+
+    # Assert: Waited for the running aggregation instead of starting another
+    assert not finished_while_locked
+    assert calls == ["scheduled"]
+    assert stats.runs_coalesced == 1
+    stop.set()
+
+
+@pytest.mark.asyncio
+async def test_loop_counts_missed_runs_and_survives_failures():
+    """Test late runs are counted as missed and a failing run does not stop the loop"""
+    # Arrange
+    stop = asyncio.Event()
+    calls = []
+
+    async def run(triggered_by):
+        calls.append(triggered_by)
+        if len(calls) == 1:
+            # Block the event loop past several 0.01s intervals while the loop waits
+            asyncio.get_running_loop().call_later(0.001, time.sleep, 0.05)
+            raise RuntimeError("boom")
+        stop.set()
+
+    async def backlog():
+        return 1000  # Minimum delay (0.01s)
+
+    loop = _loop(run, backlog)
+
+    # Act
+    await asyncio.wait_for(loop.run_forever(stop), 2)
+
+    # Assert
+    assert calls == ["scheduled", "adaptive"]
+    assert loop.stats.runs_missed >= 3
+
+
+@pytest.mark.asyncio
+async def test_loop_counts_runs_overrunning_the_interval_as_missed():
+    """Test a run taking longer than the longest interval counts the runs it displaced"""
+    # Arrange
+    stop = asyncio.Event()
+    calls = []
+
+    async def run(triggered_by):
+        calls.append(triggered_by)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)  # Five 0.02s intervals
+        else:
+            stop.set()
+
+    async def backlog():
+        return 1000
+
+    loop = _loop(run, backlog, max_seconds=0.02)
+
+    # Act
+    await asyncio.wait_for(loop.run_forever(stop), 2)
+
+    # Assert: Next run was due 0.02s after the first one started
+    assert calls == ["scheduled", "adaptive"]
+    assert loop.stats.runs_missed >= 3